@@ -1,2 +1,29 @@
-from .forward_frame_16bit import DeviceType
+from .cache import DecodeCache
 from .decode import Decode
+from .fields import MNEMONICS, AddressKind, InstanceKind
+from .forward_frame_16bit import DeviceType
+from .registry import REGISTRY, CommandSpace, DeviceClass
+from .result import DecodeResult
+
+__all__ = [
+    "MNEMONICS",
+    "REGISTRY",
+    "AddressKind",
+    "CommandSpace",
+    "Decode",
+    "DecodeCache",
+    "DecodeResult",
+    "DeviceClass",
+    "DeviceType",
+    "InstanceKind",
+    "decode_batch",
+]
+
+
+def __getattr__(name):
+    # numpy is only needed for batch decoding
+    if name == "decode_batch":
+        from .batch import decode_batch
+
+        return decode_batch
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
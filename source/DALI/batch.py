@@ -0,0 +1,309 @@
+from typing import NamedTuple
+
+import numpy as np
+
+from .fields import (
+    DEVICE_ADDRESS,
+    EDALI_SPECIAL_NAMES,
+    GEAR_ADDRESS,
+    INSTANCE_ADDRESS,
+    MNEMONICS,
+    AddressKind,
+    InstanceKind,
+    device_mnemonics,
+    device_special_mnemonics,
+    edali_mnemonics,
+    firmware_mnemonics,
+    gear_mnemonics,
+    instance_mnemonics,
+)
+from .forward_frame_16bit import DeviceType, ForwardFrame16Bit
+
+
+class BatchResult(NamedTuple):
+    address_kind: np.ndarray
+    address: np.ndarray
+    instance_kind: np.ndarray
+    instance: np.ndarray
+    opcode: np.ndarray
+    mnemonic: np.ndarray
+    # shared string table, mnemonic ids index into this list
+    mnemonics: list
+
+
+_tables = {}
+
+
+def _table(name, build):
+    # lookup tables are built on first use and shared by all batches
+    table = _tables.get(name)
+    if table is None:
+        table = build()
+        _tables[name] = table
+    return table
+
+
+def _build_gear_table():
+    return np.array(
+        [
+            gear_mnemonics(device_type)
+            for device_type in ForwardFrame16Bit.SUPPORTED_DEVICE_TYPES
+        ],
+        np.int32,
+    )
+
+
+def _build_device_type_index():
+    index = np.zeros(0x100, np.intp)
+    for position, device_type in enumerate(ForwardFrame16Bit.SUPPORTED_DEVICE_TYPES):
+        index[device_type] = position
+    return index
+
+
+def _build_address_table(addresses):
+    kind = np.array([kind for kind, _ in addresses], np.uint8)
+    value = np.array([value for _, value in addresses], np.uint8)
+    return kind, value
+
+
+def previous_frame_device_types(lengths, data):
+    # the device type enabled by the preceding ENABLE DEVICE TYPE command
+    device_types = np.full(len(lengths), DeviceType.NONE, np.uint8)
+    enable = (lengths[:-1] == 16) & (((data[:-1] >> 8) & 0xFF) == 0xC1)
+    device_types[1:][enable] = data[:-1][enable] & 0xFF
+    return device_types
+
+
+def _decode_8bit(data, result):
+    result["opcode"][:] = data & 0xFF
+    result["mnemonic"][:] = MNEMONICS.id("DATA")
+
+
+def _decode_16bit(data, device_types, result):
+    gear_table = _table("gear", _build_gear_table)
+    device_type_index = _table("device_type_index", _build_device_type_index)
+    address_kind, address_value = _table(
+        "gear_address", lambda: _build_address_table(GEAR_ADDRESS)
+    )
+    address_byte = (data >> 8) & 0xFF
+    result["address_kind"][:] = address_kind[address_byte]
+    result["address"][:] = address_value[address_byte]
+    result["opcode"][:] = data & 0xFF
+    result["mnemonic"][:] = gear_table[device_type_index[device_types], data & 0xFFFF]
+
+
+def _decode_24bit(data, result):
+    device_kind, device_value = _table(
+        "device_address", lambda: _build_address_table(DEVICE_ADDRESS)
+    )
+    instance_kind, instance_value = _table(
+        "instance_address", lambda: _build_address_table(INSTANCE_ADDRESS)
+    )
+    device_table = _table("device", lambda: np.array(device_mnemonics(), np.int32))
+    instance_table = _table(
+        "instance", lambda: np.array(instance_mnemonics(), np.int32)
+    )
+    special_table = _table(
+        "device_special",
+        lambda: np.array(device_special_mnemonics(), np.int32).reshape(0x100, 0x100),
+    )
+
+    address_byte = (data >> 16) & 0xFF
+    instance_byte = (data >> 8) & 0xFF
+    opcode_byte = data & 0xFF
+
+    # commands
+    kind = device_kind[address_byte]
+    instance = instance_kind[instance_byte]
+    special = kind == AddressKind.SPECIAL
+    mnemonic = np.where(
+        instance == InstanceKind.DEVICE,
+        device_table[opcode_byte],
+        instance_table[opcode_byte],
+    )
+    mnemonic = np.where(special, special_table[address_byte, instance_byte], mnemonic)
+    mnemonic[kind == AddressKind.RESERVED] = MNEMONICS.id("RESERVED")
+    result["address_kind"][:] = kind
+    result["address"][:] = device_value[address_byte]
+    result["instance_kind"][:] = np.where(special, InstanceKind.NONE, instance)
+    result["instance"][:] = np.where(
+        special, instance_byte, instance_value[instance_byte]
+    )
+    result["opcode"][:] = opcode_byte
+    result["mnemonic"][:] = mnemonic
+
+    # IEC 62386-103:2022 Table 3 - event message frame encoding
+    event = ((data >> 16) & 0x01) == 0
+    bit_23 = (data >> 23) & 0x01
+    bit_22 = (data >> 22) & 0x01
+    bit_15 = (data >> 15) & 0x01
+    event_kind = np.select(
+        [bit_23 == 0, bit_22 == 0, bit_15 == 0],
+        [
+            AddressKind.DEVICE,
+            np.where(bit_15, AddressKind.INSTANCE_TYPE, AddressKind.DEVICE_GROUP),
+            AddressKind.INSTANCE_GROUP,
+        ],
+        AddressKind.RESERVED,
+    )
+    event_address = np.where(bit_23 == 0, (data >> 17) & 0x3F, (data >> 17) & 0x1F)
+    event_instance = (data >> 10) & 0x1F
+    reserved_event = event_kind == AddressKind.RESERVED
+    event_address[reserved_event] = 0
+    event_instance[reserved_event] = 0
+    event_instance_kind = np.where(
+        event_kind == AddressKind.RESERVED,
+        InstanceKind.NONE,
+        np.where(
+            bit_15 & (event_kind != AddressKind.INSTANCE_GROUP),
+            InstanceKind.NUMBER,
+            InstanceKind.TYPE,
+        ),
+    )
+    event_mnemonic = np.where(
+        event_kind == AddressKind.RESERVED,
+        MNEMONICS.id("RESERVED EVENT"),
+        MNEMONICS.id("EVENT DATA"),
+    )
+    result["address_kind"][event] = event_kind[event]
+    result["address"][event] = event_address[event]
+    result["instance_kind"][event] = event_instance_kind[event]
+    result["instance"][event] = event_instance[event]
+    result["opcode"][event] = (data & 0x3FF)[event]
+    result["mnemonic"][event] = event_mnemonic[event]
+
+    # see iec 62386-103 7.2.2.1
+    power = ((data >> 13) & 0x7FF) == 0x7F7
+    power_kind = np.where(
+        (data >> 6) & 0x01,
+        AddressKind.DEVICE,
+        np.where((data >> 12) & 0x01, AddressKind.DEVICE_GROUP, AddressKind.NONE),
+    )
+    power_address = np.where((data >> 6) & 0x01, data & 0x3F, (data >> 7) & 0x1F)
+    power_address[power_kind == AddressKind.NONE] = 0
+    result["address_kind"][power] = power_kind[power]
+    result["address"][power] = power_address[power]
+    result["instance_kind"][power] = InstanceKind.NONE
+    result["instance"][power] = 0
+    result["opcode"][power] = 0
+    result["mnemonic"][power] = MNEMONICS.id("POWER CYCLE EVENT")
+
+
+def _decode_25bit(data, result):
+    edali_table = _table(
+        "edali", lambda: np.array(edali_mnemonics(), np.int32).reshape(0x10, 0x100)
+    )
+    class_byte = (data >> 17) & 0x0F
+    address_byte = (data >> 9) & 0xFF
+    opcode_byte = data & 0xFF
+
+    kind = np.select(
+        [address_byte == 0xFF, address_byte == 0xFD, (address_byte & 0x80) != 0],
+        [
+            AddressKind.ENHANCED_BROADCAST,
+            AddressKind.ENHANCED_BROADCAST_UNADDR,
+            AddressKind.ENHANCED_GROUP,
+        ],
+        AddressKind.ENHANCED,
+    )
+    address = (address_byte >> 1) & 0x3F
+    mnemonic = edali_table[class_byte, opcode_byte]
+    for special_byte, name in EDALI_SPECIAL_NAMES.items():
+        special = address_byte == special_byte
+        kind[special] = AddressKind.NONE
+        mnemonic[special] = MNEMONICS.id(name)
+    # ENHANCED INITIALISE addresses a single device with the opcode byte
+    initialise = (address_byte == 0xA5) & (opcode_byte != 0x00) & (opcode_byte != 0xFF)
+    kind[initialise] = AddressKind.ENHANCED
+    address = np.where(initialise, (opcode_byte >> 1) & 0x3F, address)
+    address[kind == AddressKind.NONE] = 0
+    address[kind == AddressKind.ENHANCED_BROADCAST] = 0
+    address[kind == AddressKind.ENHANCED_BROADCAST_UNADDR] = 0
+
+    result["address_kind"][:] = kind
+    result["address"][:] = address
+    result["instance_kind"][:] = InstanceKind.CLASS
+    result["instance"][:] = class_byte
+    result["opcode"][:] = opcode_byte
+    result["mnemonic"][:] = mnemonic
+
+
+def _decode_32bit(data, result):
+    firmware_table = _table(
+        "firmware", lambda: np.array(firmware_mnemonics(), np.int32)
+    )
+    address_byte = (data >> 24) & 0xFF
+    address = (data >> 25) & 0x7F
+    device_space = ((data >> 24) & 0x01) != 0
+    kind = np.select(
+        [address == 0x7F, address == 0x7E, (address >> 6) == 0],
+        [
+            np.where(
+                device_space, AddressKind.DEVICE_BROADCAST, AddressKind.GEAR_BROADCAST
+            ),
+            np.where(
+                device_space,
+                AddressKind.DEVICE_BROADCAST_UNADDR,
+                AddressKind.GEAR_BROADCAST_UNADDR,
+            ),
+            np.where(device_space, AddressKind.DEVICE, AddressKind.GEAR),
+        ],
+        AddressKind.NONE,
+    )
+    # see iec 62386-105 11.2 table 6 - standard commands
+    firmware = (kind != AddressKind.NONE) & (((data >> 16) & 0xFF) == 0xFB)
+    kind[~firmware] = AddressKind.NONE
+    mnemonic = np.where(
+        firmware, firmware_table[(data >> 8) & 0xFF], MNEMONICS.id("---")
+    )
+    opcode = np.where(firmware, (data >> 8) & 0xFF, 0)
+    # see iec 62386-105 11.2 table 7 - data transfer commands
+    for block_byte, name in ((0xCB, "BEGIN BLOCK"), (0xBD, "TRANSFER BLOCK DATA")):
+        block = address_byte == block_byte
+        kind[block] = AddressKind.NONE
+        mnemonic[block] = MNEMONICS.id(name)
+        opcode[block] = (data & 0xFFFFFF)[block]
+
+    result["address_kind"][:] = kind
+    result["address"][:] = np.where(
+        (kind == AddressKind.DEVICE) | (kind == AddressKind.GEAR), address & 0x3F, 0
+    )
+    result["opcode"][:] = opcode
+    result["mnemonic"][:] = mnemonic
+
+
+def decode_batch(lengths, data, device_types=None):
+    lengths = np.asarray(lengths)
+    data = np.asarray(data, dtype=np.uint32)
+    if device_types is None:
+        device_types = previous_frame_device_types(lengths, data)
+    else:
+        device_types = np.asarray(device_types, dtype=np.uint8)
+
+    count = len(lengths)
+    columns = {
+        "address_kind": np.zeros(count, np.uint8),
+        "address": np.zeros(count, np.uint8),
+        "instance_kind": np.zeros(count, np.uint8),
+        "instance": np.zeros(count, np.uint8),
+        "opcode": np.zeros(count, np.uint32),
+        "mnemonic": np.full(count, MNEMONICS.id("--- UNDEFINED FRAMELENGTH"), np.int32),
+    }
+    for length in (8, 16, 24, 25, 32):
+        selected = np.flatnonzero(lengths == length)
+        if len(selected) == 0:
+            continue
+        result = {name: column[selected] for name, column in columns.items()}
+        if length == 8:
+            _decode_8bit(data[selected], result)
+        elif length == 16:
+            _decode_16bit(data[selected], device_types[selected], result)
+        elif length == 24:
+            _decode_24bit(data[selected], result)
+        elif length == 25:
+            _decode_25bit(data[selected], result)
+        else:
+            _decode_32bit(data[selected], result)
+        for name, column in columns.items():
+            column[selected] = result[name]
+    return BatchResult(mnemonics=MNEMONICS.names, **columns)
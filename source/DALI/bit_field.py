@@ -0,0 +1,16 @@
+from typing import NamedTuple
+
+
+class BitField(NamedTuple):
+    shift: int
+    mask: int
+
+    # bits are numbered as in the IEC docs, bit 0 is the last bit on the bus
+    @classmethod
+    def iec(cls, high, low=None):
+        if low is None:
+            low = high
+        return cls(shift=low, mask=(1 << (high - low + 1)) - 1)
+
+    def get(self, frame):
+        return (frame >> self.shift) & self.mask
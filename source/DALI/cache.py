@@ -0,0 +1,60 @@
+from collections import OrderedDict
+
+from .decode import Decode
+from .forward_frame_16bit import DeviceType
+
+
+class DecodeCache:
+    DEFAULT_CAPACITY = 4096
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        if capacity < 1:
+            raise ValueError(f"cache capacity must be positive, not {capacity}")
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def decode(self, length, data, device_type=DeviceType.NONE):
+        # returns (data string, command string, next device type)
+        if length != 16:
+            # only 16 bit frames depend on the enabled device type
+            device_type = DeviceType.NONE
+        key = (length, data, device_type)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return entry
+        self.misses += 1
+        dali_command = Decode(length, data, device_type)
+        entry = (
+            str(dali_command),
+            dali_command.cmd(),
+            dali_command.get_next_device_type(),
+        )
+        self.entries[key] = entry
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        return entry
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        if lookups == 0:
+            return 0.0
+        return self.hits / lookups
+
+    def clear(self):
+        self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __str__(self):
+        return (
+            f"decode cache: {len(self.entries)}/{self.capacity} entries, "
+            f"{self.hits} hits, {self.misses} misses, {self.evictions} evictions, "
+            f"hit rate {self.hit_rate():.1%}"
+        )
@@ -1,12 +1,9 @@
-from .backframe_8bit import Backframe8Bit
-from .forward_frame_16bit import ForwardFrame16Bit, DeviceType
-from .forward_frame_24bit import ForwardFrame24Bit
-from .forward_frame_25bit import ForwardFrame25Bit
-from .forward_frame_32bit import ForwardFrame32Bit
+from .forward_frame_16bit import DeviceType
+from .result import ADDRESS_WIDTH, classify, render, render_parts
 
 
 class Decode:
-    ADDRESS_WIDTH = 14
+    ADDRESS_WIDTH = ADDRESS_WIDTH
     DATA_WIDTH = 8
 
     def __init__(self, length, data, device_type=DeviceType.NONE):
@@ -41,19 +38,11 @@ class Decode:
             return f"{self.data:08X}".rjust(self.DATA_WIDTH)
 
     def cmd(self):
-        if self.length == 8:
-            command = Backframe8Bit(self.data, self.ADDRESS_WIDTH)
-        elif self.length == 16:
-            command = ForwardFrame16Bit(self.data, self.active, self.ADDRESS_WIDTH)
-        elif self.length == 24:
-            command = ForwardFrame24Bit(self.data, self.ADDRESS_WIDTH)
-        elif self.length == 25:
-            command = ForwardFrame25Bit(self.data, self.ADDRESS_WIDTH)
-        elif self.length == 32:
-            command = ForwardFrame32Bit(self.data, self.ADDRESS_WIDTH)
-        else:
-            return (
-                " " * self.ADDRESS_WIDTH
-                + f"--- UNDEFINED FRAMELENGTH {self.length} BITS"
-            )
-        return command.address_string + command.command_string
+        return render(self.length, self.data, self.active, self.ADDRESS_WIDTH)
+
+    def parts(self):
+        # address and command of cmd() as separate strings
+        return render_parts(self.length, self.data, self.active, self.ADDRESS_WIDTH)
+
+    def fields(self):
+        return classify(self.length, self.data, self.active)
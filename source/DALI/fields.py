@@ -0,0 +1,279 @@
+from .forward_frame_16bit import DeviceType, ForwardFrame16Bit
+from .forward_frame_24bit import ForwardFrame24Bit
+from .registry import REGISTRY, CommandSpace
+
+
+class AddressKind:
+    NONE = 0
+    GEAR = 1
+    GEAR_GROUP = 2
+    GEAR_BROADCAST = 3
+    GEAR_BROADCAST_UNADDR = 4
+    DEVICE = 5
+    DEVICE_GROUP = 6
+    DEVICE_BROADCAST = 7
+    DEVICE_BROADCAST_UNADDR = 8
+    SPECIAL = 9
+    RESERVED = 10
+    ENHANCED = 11
+    ENHANCED_GROUP = 12
+    ENHANCED_BROADCAST = 13
+    ENHANCED_BROADCAST_UNADDR = 14
+    INSTANCE_TYPE = 15
+    INSTANCE_GROUP = 16
+
+
+class InstanceKind:
+    # values 1 to 11 match forward_frame_24bit.InstanceAddressType
+    NONE = 0
+    NUMBER = 1
+    GROUP = 2
+    TYPE = 3
+    FEATURE_ON_NUMBER = 4
+    FEATURE_ON_GROUP = 5
+    FEATURE_ON_TYPE = 6
+    FEATURE_BROADCAST = 7
+    FEATURE_ON_INSTANCE_BROADCAST = 8
+    BROADCAST = 9
+    FEATURE_ON_DEVICE = 10
+    DEVICE = 11
+    RESERVED = 12
+    CLASS = 13
+
+
+class MnemonicTable:
+    def __init__(self):
+        self.names = []
+        self.ids = {}
+
+    def id(self, name):
+        mnemonic_id = self.ids.get(name)
+        if mnemonic_id is None:
+            mnemonic_id = len(self.names)
+            self.names.append(name)
+            self.ids[name] = mnemonic_id
+        return mnemonic_id
+
+    def name(self, mnemonic_id):
+        return self.names[mnemonic_id]
+
+    def __len__(self):
+        return len(self.names)
+
+
+# shared by all decoders, ids are stable for the lifetime of the process
+MNEMONICS = MnemonicTable()
+
+# commands carrying a parameter in the frame are named without the parameter
+
+# iec 62386-102 11.2 - special commands by address byte
+GEAR_SPECIAL_NAMES = {
+    0xA3: "DTR0",
+    0xA5: "INITIALISE",
+    0xB1: "SEARCHADDRH",
+    0xB3: "SEARCHADDRM",
+    0xB5: "SEARCHADDRL",
+    0xB7: "PROGRAM SHORT ADDRESS",
+    0xB9: "VERIFY SHORT ADDRESS",
+    0xBD: "PHYSICAL SELECTION (obsolete)",
+    0xC1: "ENABLE DEVICE TYPE",
+    0xC3: "DTR1",
+    0xC5: "DTR2",
+    0xC7: "WRITE MEMORY LOCATION",
+    0xC9: "WRITE MEMORY LOCATION - NO REPLY",
+}
+
+# iec 62386-103 11.2 - special commands with address byte 0xC1 by instance byte
+DEVICE_SPECIAL_NAMES = {
+    0x01: "INITIALISE",
+    0x05: "SEARCHADDRH",
+    0x06: "SEARCHADDRM",
+    0x07: "SEARCHADDRL",
+    0x08: "PROGRAM SHORT ADDRESS",
+    0x09: "VERIFY SHORT ADDRESS",
+    0x20: "WRITE MEMORY LOCATION",
+    0x21: "WRITE MEMORY LOCATION - NO REPLY",
+    0x30: "DTR0",
+    0x31: "DTR1",
+    0x32: "DTR2",
+    0x33: "SEND TESTFRAME",
+}
+
+# iec 62386-103 11.2 - special commands with two data bytes by address byte
+DEVICE_SPECIAL_DATA_NAMES = {
+    0xC5: "DIRECT WRITE MEMORY",
+    0xC7: "DTR1:DTR0",
+    0xC9: "DTR2:DTR1",
+}
+
+EDALI_SPECIAL_NAMES = {
+    0xA1: "QUERY CONTROL TYPE",
+    0xA3: "QUERY CONTROL CLASS",
+    0xA5: "ENHANCED INITIALISE",
+}
+
+PARAMETER_NAMES = {
+    "DATA",
+    "DAPC",
+    "EVENT DATA",
+    "BEGIN BLOCK",
+    "TRANSFER BLOCK DATA",
+    *GEAR_SPECIAL_NAMES.values(),
+    *DEVICE_SPECIAL_NAMES.values(),
+    *DEVICE_SPECIAL_DATA_NAMES.values(),
+    *EDALI_SPECIAL_NAMES.values(),
+}
+PARAMETER_NAMES.discard("PHYSICAL SELECTION (obsolete)")
+
+
+def gear_name(address_byte, opcode_byte, device_type=DeviceType.NONE):
+    if address_byte in range(0xA0, 0xCC):
+        name = GEAR_SPECIAL_NAMES.get(address_byte)
+        if name is None:
+            return ForwardFrame16Bit.special_command(address_byte, opcode_byte)
+        return name
+    if address_byte in range(0xCC, 0xFC):
+        return "RESERVED"
+    if (address_byte & 0x01) == 0x00:
+        return "DAPC"
+    return ForwardFrame16Bit.standard_command(opcode_byte, device_type)
+
+
+def device_special_name(address_byte, instance_byte):
+    if address_byte == 0xC1 and instance_byte in DEVICE_SPECIAL_NAMES:
+        return DEVICE_SPECIAL_NAMES[instance_byte]
+    if address_byte in DEVICE_SPECIAL_DATA_NAMES:
+        return DEVICE_SPECIAL_DATA_NAMES[address_byte]
+    frame = (address_byte << 16) | (instance_byte << 8)
+    return ForwardFrame24Bit(frame).command_string
+
+
+def gear_address(address_byte):
+    if address_byte in range(0x80):
+        return AddressKind.GEAR, address_byte >> 1
+    elif address_byte in range(0x80, 0xA0):
+        return AddressKind.GEAR_GROUP, (address_byte >> 1) & 0x0F
+    elif address_byte in range(0xA0, 0xCC):
+        return AddressKind.SPECIAL, address_byte
+    elif address_byte in range(0xCC, 0xFC):
+        return AddressKind.RESERVED, 0
+    elif address_byte in (0xFC, 0xFD):
+        return AddressKind.GEAR_BROADCAST_UNADDR, 0
+    return AddressKind.GEAR_BROADCAST, 0
+
+
+# IEC 62386-103:2022 Table 1 - command frame encoding
+def device_address(address_byte):
+    if address_byte == 0xFF:
+        return AddressKind.DEVICE_BROADCAST, 0
+    elif address_byte == 0xFD:
+        return AddressKind.DEVICE_BROADCAST_UNADDR, 0
+    elif (address_byte >> 7) == 0:
+        return AddressKind.DEVICE, (address_byte >> 1) & 0x3F
+    elif (address_byte >> 6) == 0b10:
+        return AddressKind.DEVICE_GROUP, (address_byte >> 1) & 0x1F
+    elif (address_byte >> 5) == 0b110:
+        return AddressKind.SPECIAL, address_byte
+    return AddressKind.RESERVED, 0
+
+
+# IEC 62386-103:2022 Table 2 - instance byte in a command frame
+INSTANCE_BYTE_KIND = {
+    0xFE: InstanceKind.DEVICE,
+    0xFC: InstanceKind.FEATURE_ON_DEVICE,
+    0xFF: InstanceKind.BROADCAST,
+    0xFD: InstanceKind.FEATURE_ON_INSTANCE_BROADCAST,
+    0xF9: InstanceKind.FEATURE_BROADCAST,
+}
+INSTANCE_CODE_KIND = {
+    0: InstanceKind.NUMBER,
+    1: InstanceKind.FEATURE_ON_NUMBER,
+    3: InstanceKind.FEATURE_ON_TYPE,
+    4: InstanceKind.GROUP,
+    5: InstanceKind.FEATURE_ON_GROUP,
+    6: InstanceKind.TYPE,
+}
+
+
+def instance_address(instance_byte):
+    if instance_byte in INSTANCE_BYTE_KIND:
+        return INSTANCE_BYTE_KIND[instance_byte], 0
+    if (instance_byte >> 5) in INSTANCE_CODE_KIND:
+        return INSTANCE_CODE_KIND[instance_byte >> 5], instance_byte & 0x1F
+    return InstanceKind.RESERVED, 0
+
+
+# (kind, value) for every address or instance byte
+GEAR_ADDRESS = tuple(gear_address(address_byte) for address_byte in range(0x100))
+DEVICE_ADDRESS = tuple(device_address(address_byte) for address_byte in range(0x100))
+INSTANCE_ADDRESS = tuple(
+    instance_address(instance_byte) for instance_byte in range(0x100)
+)
+
+
+_mnemonic_tables = {}
+
+
+def _mnemonic_table(key, build):
+    # mnemonic id tables are built on first use
+    table = _mnemonic_tables.get(key)
+    if table is None:
+        table = tuple(MNEMONICS.id(name) for name in build())
+        _mnemonic_tables[key] = table
+    return table
+
+
+def gear_mnemonics(device_type=DeviceType.NONE):
+    # indexed by the 16 bit frame
+    if device_type not in ForwardFrame16Bit.SUPPORTED_DEVICE_TYPES:
+        device_type = DeviceType.NONE
+    return _mnemonic_table(
+        ("gear", device_type),
+        lambda: (
+            gear_name(frame >> 8, frame & 0xFF, device_type) for frame in range(0x10000)
+        ),
+    )
+
+
+def device_mnemonics():
+    # indexed by the opcode byte
+    return _mnemonic_table("device", lambda: REGISTRY.table(24, CommandSpace.DEVICE))
+
+
+def instance_mnemonics():
+    # indexed by the opcode byte
+    return _mnemonic_table(
+        "instance", lambda: REGISTRY.table(24, CommandSpace.INSTANCE)
+    )
+
+
+def device_special_mnemonics():
+    # indexed by address byte and instance byte
+    return _mnemonic_table(
+        "device_special",
+        lambda: (
+            device_special_name(frame >> 8, frame & 0xFF)
+            if (frame >> 13) == 0b110
+            else "RESERVED"
+            for frame in range(0x10000)
+        ),
+    )
+
+
+def edali_mnemonics():
+    # indexed by class byte and opcode byte
+    return _mnemonic_table(
+        "edali",
+        lambda: (
+            REGISTRY.get(25, CommandSpace.EDALI, frame >> 8, frame & 0xFF)
+            for frame in range(0x1000)
+        ),
+    )
+
+
+def firmware_mnemonics():
+    # indexed by the opcode byte
+    return _mnemonic_table(
+        "firmware",
+        lambda: REGISTRY.table(32, CommandSpace.FIRMWARE),
+    )
@@ -1,13 +1,40 @@
-from bitstring import BitArray
+from .bit_field import BitField
+from .registry import REGISTRY, CommandSpace
 
 # bit position translation
 #
 #  2222|1111||1111|11  ||    |      IEC docs
 #  3210|9876||5432|1098||7654|3210
 # -----+----++----+----++----+-----
-#  0123|4567||8911|1111||1111|2222  BitArray index
+#  0123|4567||8911|1111||1111|2222  bit index
 #      |    ||  01|2345||6789|0123
 #
+# fields use the IEC bit numbering
+
+ADDRESS_BYTE = BitField.iec(23, 16)
+INSTANCE_BYTE = BitField.iec(15, 8)
+OPCODE_BYTE = BitField.iec(7, 0)
+# IEC 62386-103:2022 Table 1 - command frame encoding
+ADDRESS_BIT_23 = BitField.iec(23)
+ADDRESS_BITS_23_22 = BitField.iec(23, 22)
+ADDRESS_BITS_23_21 = BitField.iec(23, 21)
+SHORT_ADDRESS = BitField.iec(22, 17)
+GROUP_ADDRESS = BitField.iec(21, 17)
+FRAME_TYPE_BIT = BitField.iec(16)
+# IEC 62386-103:2022 Table 2 - instance byte in a command frame
+INSTANCE_CODE = BitField.iec(15, 13)
+INSTANCE_VALUE = BitField.iec(12, 8)
+# IEC 62386-103:2022 Table 3 - event message frame encoding
+EVENT_ADDRESS_BIT_22 = BitField.iec(22)
+EVENT_SCHEME_BIT = BitField.iec(15)
+EVENT_INSTANCE = BitField.iec(14, 10)
+EVENT_DATA = BitField.iec(9, 0)
+# IEC 62386-103:2022 7.2.2.1 - power cycle event
+POWER_EVENT = BitField.iec(23, 13)
+POWER_EVENT_GROUP_BIT = BitField.iec(12)
+POWER_EVENT_GROUP = BitField.iec(11, 7)
+POWER_EVENT_ADDRESS_BIT = BitField.iec(6)
+POWER_EVENT_ADDRESS = BitField.iec(5, 0)
 
 
 class EventType:
@@ -46,132 +73,17 @@ class DeviceAddressType:
 class ForwardFrame24Bit:
     def device_command(self):
         # see iec 62386-103 11.2 table 23 - standard commands
-        code_dictionary = {
-            0x00: "IDENTIFY DEVICE",
-            0x01: "RESET POWER CYCLE SEEN",
-            0x10: "RESET",
-            0x11: "RESET MEMORY BANK (DTR0)",
-            0x14: "SET SHORT ADDRESS (DTR0)",
-            0x15: "ENABLE WRITE MEMORY",
-            0x16: "ENABLE APPLICATION CONTROLLER",
-            0x17: "DISABLE APPLICATION CONTROLLER",
-            0x18: "SET OPERATING MODE (DTR0)",
-            0x19: "ADD TO DEVICE GROUPS 0-15 (DTR2:DTR1)",
-            0x1A: "ADD TO DEVICE GROUPS 16-31 (DTR2:DTR1)",
-            0x1B: "REMOVE FROM DEVICE GROUPS 0-15 (DTR2:DTR1)",
-            0x1C: "REMOVE FROM DEVICE GROUPS 16-31 (DTR2:DTR1)",
-            0x1D: "START QUIESCENT MODE",
-            0x1E: "STOP QUIESCENT MODE",
-            0x1F: "ENABLE POWER CYCLE NOTIFICATION",
-            0x20: "DISABLE POWER CYCLE NOTIFICATION",
-            0x21: "SAVE PERSISTENT VARIABLES (DEPRECATED)",
-            0x30: "QUERY DEVICE STATUS",
-            0x31: "QUERY APPLICATION CONTROLLER ERROR",
-            0x32: "QUERY INPUT DEVICE ERROR",
-            0x33: "QUERY MISSING SHORT ADDRESS",
-            0x34: "QUERY VERSION NUMBER",
-            0x35: "QUERY NUMBER OF INSTANCES",
-            0x36: "QUERY CONTENT DTR0",
-            0x37: "QUERY CONTENT DTR1",
-            0x38: "QUERY CONTENT DTR2",
-            0x39: "QUERY RANDOM ADDRESS (H)",
-            0x3A: "QUERY RANDOM ADDRESS (M)",
-            0x3B: "QUERY RANDOM ADDRESS (L)",
-            0x3C: "READ MEMORY LOCATION (DTR1,DTR0)",
-            0x3D: "QUERY APPLICATION CONTROLLER ENABLED",
-            0x3E: "QUERY OPERATING MODE",
-            0x3F: "QUERY MANUFACTURER SPECIFIC MODE",
-            0x40: "QUERY QUIESCENT MODE",
-            0x41: "QUERY DEVICE GROUPS 0-7",
-            0x42: "QUERY DEVICE GROUPS 8-15",
-            0x43: "QUERY DEVICE GROUPS 16-23",
-            0x44: "QUERY DEVICE GROUPS 24-31",
-            0x45: "QUERY POWER CYCLE NOTIFICATION",
-            0x46: "QUERY DEVICE CAPABILITIES",
-            0x47: "QUERY EXTENDED VERSION NUMBER (DTR0)",
-            0x48: "QUERY RESET STATE",
-            0x49: "QUERY APPLICATION CONTROLLER ALWAYS ACTIVE",
-        }
-        opcode_byte = self.frame_bits[16:].uint
-        return code_dictionary.get(
-            opcode_byte,
-            f"--- CODE 0x{opcode_byte:02X} = {opcode_byte} UNDEFINED CONTROL DEVICE COMMAND",
-        )
+        opcode_byte = OPCODE_BYTE.get(self.frame)
+        return REGISTRY.get(24, CommandSpace.DEVICE, 0, opcode_byte)
 
     def instance_commands(self):
-        code_dictionary = {
-            0x00: "SET SHORT TIMER (DTR0) - TYPE 301",
-            0x01: "SET DOUBLE TIMER (DTR0) - TYPE 301",
-            0x02: "SET REPEAT TIMER (DTR0) - TYPE 301",
-            0x03: "SET STUCK TIMER (DTR0) - TYPE 301",
-            0x0A: "QUERY SHORT TIMER - TYPE 301",
-            0x0B: "QUERY SHORT TIMER MIN - TYPE 301",
-            0x0C: "QUERY DOUBLE TIMER - TYPE 301",
-            0x0D: "QUERY DOUBLE TIMER MIN - TYPE 301",
-            0x0E: "QUERY REPEAT TIMER - TYPE 301",
-            0x0F: "QUERY STUCK TIMER - TYPE 301",
-            0x10: "SET REPORT TIMER (DTR0) - TYPE 302",
-            0x11: "SET DEADTIME TIMER (DTR0) - TYPE 302",
-            0x1D: "QUERY DEADTIME TIMER - TYPE 302",
-            0x1E: "QUERY REPORT TIMER - TYPE 302",
-            0x1F: "QUERY SWITCH - TYPE 302",
-            0x20: "CATCH MOVEMENT - TYPE 303",
-            0x21: "SET HOLD TIMER (DTR0) - TYPE 303",
-            0x22: "SET REPORT TIMER (DTR0)- TYPE 303",
-            0x23: "SET DEADTIME TIMER (DTR0) - TYPE 303",
-            0x24: "CANCEL HOLD TIMER -TYPE 303",
-            0x2C: "QUERY DEADTIME TIMER - TYPE 303",
-            0x2D: "QUERY HOLD TIMER - TYPE 303",
-            0x2E: "QUERY REPORT TIMER - TYPE 303",
-            0x2F: "QUERY CACHING - TYPE 303",
-            0x30: "SET REPORT TIMER (DTR0) - TYPE 304",
-            0x31: "SET HYSTERESIS (DTR0) - TYPE 304",
-            0x32: "SET DEADTIME TIMER (DTR0) - TYPE 304",
-            0x33: "SET HYSTERESIS MIN (DTR0) - TYPE 304",
-            0x3C: "QUERY HYSTERESIS MIN - TYPE 304",
-            0x3D: "QUERY DEADTIME TIMER - TYPE 304",
-            0x3E: "QUERY REPORT TIMER - TYPE 304",
-            0x3F: "QUERY HYSTERESIS - TYPE 304",
-            0x61: "SET EVENT PRIORITY (DTR0)",
-            0x62: "ENABLE INSTANCE",
-            0x63: "DISABLE INSTANCE",
-            0x64: "SET PRIMARY INSTANCE GROUP (DTR0)",
-            0x65: "SET INSTANCE GROUP 1 (DTR0)",
-            0x66: "SET INSTANCE GROUP 2 (DTR0)",
-            0x67: "SET EVENT SCHEME (DTR0)",
-            0x68: "SET EVENT FILTER (DTR2,DTR1,DTR0)",
-            0x69: "SET INSTANCE TYPE (DTR0)",
-            0x6A: "SET INSTANCE CONFIGURATION (DTR0,DTR2:DTR1)",
-            0x80: "QUERY INSTANCE TYPE",
-            0x81: "QUERY RESOLUTION",
-            0x82: "QUERY INSTANCE ERROR",
-            0x83: "QUERY INSTANCE STATUS",
-            0x84: "QUERY EVENT PRIORITY",
-            0x86: "QUERY INSTANCE ENABLED",
-            0x88: "QUERY PRIMARY INSTANCE GROUP",
-            0x89: "QUERY INSTANCE GROUP 1",
-            0x8A: "QUERY INSTANCE GROUP 2",
-            0x8B: "QUERY EVENT SCHEME",
-            0x8C: "QUERY INPUT VALUE",
-            0x8D: "QUERY INPUT VALUE LATCH",
-            0x8E: "QUERY FEATURE TYPE",
-            0x8F: "QUERY NEXT FEATURE TYPE",
-            0x90: "QUERY EVENT FILTER 0-7",
-            0x91: "QUERY EVENT FILTER 8-15",
-            0x92: "QUERY EVENT FILTER 16-23",
-            0x93: "QUERY INSTANCE CONFIGURATION (DTR0)",
-            0x94: "QUERY AVAILABLE INSTANCE TYPES",
-        }
-        opcode_byte = self.frame_bits[16:].uint
-        return code_dictionary.get(
-            opcode_byte,
-            f"--- CODE 0x{opcode_byte:02X} = {opcode_byte} UNDEFINED INSTANCE COMMAND",
-        )
+        opcode_byte = OPCODE_BYTE.get(self.frame)
+        return REGISTRY.get(24, CommandSpace.INSTANCE, 0, opcode_byte)
 
     def device_special_command(self):
-        address_byte = self.frame_bits[:8].uint
-        instance_byte = self.frame_bits[8:16].uint
-        opcode_byte = self.frame_bits[16:].uint
+        address_byte = ADDRESS_BYTE.get(self.frame)
+        instance_byte = INSTANCE_BYTE.get(self.frame)
+        opcode_byte = OPCODE_BYTE.get(self.frame)
         if address_byte == 0xC1:
             if instance_byte == 0x00:
                 return "TERMINATE"
@@ -224,7 +136,7 @@ class ForwardFrame24Bit:
 
     # IEC 62386-103:2022 Table 2 - instance byte in a command frame
     def get_instance_address_type(self):
-        instance_byte = self.frame_bits[8:16].uint
+        instance_byte = INSTANCE_BYTE.get(self.frame)
         if instance_byte == 0xFE:
             return InstanceAddressType.DEVICE
         if instance_byte == 0xFC:
@@ -235,7 +147,7 @@ class ForwardFrame24Bit:
             return InstanceAddressType.FEATURE_ON_INSTANCE_BROADCAST
         if instance_byte == 0xF9:
             return InstanceAddressType.FEATURE_BROADCAST
-        instance_code = self.frame_bits[8:11].uint
+        instance_code = INSTANCE_CODE.get(self.frame)
         if instance_code == 0:
             return InstanceAddressType.INSTANCE_NUMBER
         if instance_code == 1:
@@ -252,64 +164,65 @@ class ForwardFrame24Bit:
 
     # IEC 62386-103:2022 Table 1 - command frame encoding
     def get_device_address_type(self):
-        if self.frame_bits[:8].uint == 0xFF:
+        address_byte = ADDRESS_BYTE.get(self.frame)
+        if address_byte == 0xFF:
             return DeviceAddressType.BROADCAST
-        if self.frame_bits[:8].uint == 0xFD:
+        if address_byte == 0xFD:
             return DeviceAddressType.BROADCAST_UNADDR
-        if not self.frame_bits[0]:
+        if not ADDRESS_BIT_23.get(self.frame):
             return DeviceAddressType.SHORT_ADDRESS
-        if self.frame_bits[:2].uint == 0b10:
+        if ADDRESS_BITS_23_22.get(self.frame) == 0b10:
             return DeviceAddressType.GROUP_ADDRESS
-        if self.frame_bits[:3].uint == 0b110:
+        if ADDRESS_BITS_23_21.get(self.frame) == 0b110:
             return DeviceAddressType.SPECIAL
         return DeviceAddressType.RESERVED
 
     # IEC 62386-103:2022 Table 3 - event message frame encoding
     def get_event_source_type(self):
-        if not self.frame_bits[0]:
-            if self.frame_bits[8]:
+        if not ADDRESS_BIT_23.get(self.frame):
+            if EVENT_SCHEME_BIT.get(self.frame):
                 return EventType.DEVICE_INSTANCE
             else:
                 return EventType.DEVICE
-        if not self.frame_bits[1]:
-            if self.frame_bits[8]:
+        if not EVENT_ADDRESS_BIT_22.get(self.frame):
+            if EVENT_SCHEME_BIT.get(self.frame):
                 return EventType.INSTANCE
             else:
                 return EventType.DEVICE_GROUP
         else:
-            if not self.frame_bits[8]:
+            if not EVENT_SCHEME_BIT.get(self.frame):
                 return EventType.INSTANCE_GROUP
         return EventType.RESERVED
 
     def build_command_address_string(self, address_type, instance_type):
         # todo make address_type instance_type a class_member
         if address_type == DeviceAddressType.SHORT_ADDRESS:
-            short_address = self.frame_bits[1:7].uint
+            short_address = SHORT_ADDRESS.get(self.frame)
             address_string = f"D{short_address:02}"
         elif address_type == DeviceAddressType().GROUP_ADDRESS:
-            group_address = self.frame_bits[2:7].uint
+            group_address = GROUP_ADDRESS.get(self.frame)
             address_string = f"DG{group_address:02}"
         elif address_type == DeviceAddressType.BROADCAST_UNADDR:
             address_string = "BC DEV UN"
         elif address_type == DeviceAddressType.BROADCAST:
             address_string = "BC DEV"
         if instance_type == InstanceAddressType.INSTANCE_NUMBER:
-            number = self.frame_bits[11:16].uint
+            number = INSTANCE_VALUE.get(self.frame)
             address_string += f",I{number:02}"
         elif instance_type == InstanceAddressType.INSTANCE_GROUP:
-            group = self.frame_bits[11:16].uint
+            group = INSTANCE_VALUE.get(self.frame)
             address_string += f",IG{group:02}"
         elif instance_type == InstanceAddressType.INSTANCE_TYPE:
-            type = self.frame_bits[11:16].uint
+            type = INSTANCE_VALUE.get(self.frame)
             address_string += f",T{type:02}"
         elif instance_type == InstanceAddressType.FEATURE_ON_INSTANCE_NUMBER:
-            number = self.frame_bits[11:16].uint
+            number = INSTANCE_VALUE.get(self.frame)
             address_string += f",FI{number:02}"
         elif instance_type == InstanceAddressType.FEATURE_ON_INSTANCE_GROUP:
-            group = self.frame_bits[11:16].uint
+            group = INSTANCE_VALUE.get(self.frame)
             address_string += f",FG{group:02}"
         elif instance_type == InstanceAddressType.FEATURE_ON_INSTANCE_TYPE:
-            type = self.frame_bits[11:16].uint
+            type = INSTANCE_VALUE.get(self.frame)
             address_string += f",FT{type:02}"
         elif instance_type == InstanceAddressType.FEATURE_BROADCAST:
             address_string += "BC FEAT"
@@ -328,53 +241,53 @@ class ForwardFrame24Bit:
 
     def build_event_source_string(self, event_source_type):
         if event_source_type == EventType.DEVICE:
-            short_address = self.frame_bits[1:7].uint
-            instance_type = self.frame_bits[9:14].uint
+            short_address = SHORT_ADDRESS.get(self.frame)
+            instance_type = EVENT_INSTANCE.get(self.frame)
             return f"D{short_address:02},T{instance_type:02}"
         elif event_source_type == EventType.DEVICE_INSTANCE:
-            short_address = self.frame_bits[1:7].uint
-            instance_number = self.frame_bits[9:14].uint
+            short_address = SHORT_ADDRESS.get(self.frame)
+            instance_number = EVENT_INSTANCE.get(self.frame)
             return f"D{short_address:02},I{instance_number:02}"
         elif event_source_type == EventType.DEVICE_GROUP:
-            device_group = self.frame_bits[2:7].uint
-            instance_type = self.frame_bits[9:14].uint
+            device_group = GROUP_ADDRESS.get(self.frame)
+            instance_type = EVENT_INSTANCE.get(self.frame)
             return f"DG{device_group:02},T{instance_type:02}"
         elif event_source_type == EventType.INSTANCE:
-            instance_type = self.frame_bits[2:7].uint
-            instance_number = self.frame_bits[9:14].uint
+            instance_type = GROUP_ADDRESS.get(self.frame)
+            instance_number = EVENT_INSTANCE.get(self.frame)
             return f"T{instance_type:02},I{instance_number:02}"
         elif event_source_type == EventType.INSTANCE_GROUP:
-            device_group = self.frame_bits[2:7].uint
-            instance_type = self.frame_bits[9:14].uint
+            device_group = GROUP_ADDRESS.get(self.frame)
+            instance_type = EVENT_INSTANCE.get(self.frame)
             return f"IG{device_group:02},T{instance_type:02}"
         else:
             return ""
 
     def build_power_event_device(self):
         # see iec 62386-103:2022 9.7.2
-        if self.frame_bits[11]:
-            device_group = self.frame_bits[12:17].uint
+        if POWER_EVENT_GROUP_BIT.get(self.frame):
+            device_group = POWER_EVENT_GROUP.get(self.frame)
             group_result = f"DG{device_group:02} "
         else:
             group_result = ""
-        if self.frame_bits[17]:
-            short_address = self.frame_bits[18:].uint
+        if POWER_EVENT_ADDRESS_BIT.get(self.frame):
+            short_address = POWER_EVENT_ADDRESS.get(self.frame)
             return f"{group_result}D{short_address:02}"
         else:
             return f"{group_result}".rstrip()
 
     def __init__(self, frame, address_field_width=10):
-        self.frame_bits = BitArray(uint=frame, length=24)
+        self.frame = frame
         self.address_string = ""
 
         # see iec 62386-103 7.2.2.1
-        if self.frame_bits[:11].uint == 0x7F7:
+        if POWER_EVENT.get(self.frame) == 0x7F7:
             self.address_string = self.build_power_event_device()
             self.command_string = "POWER CYCLE EVENT"
             self.address_string = self.address_string.ljust(address_field_width)
             return
 
-        if not self.frame_bits[7]:
+        if not FRAME_TYPE_BIT.get(self.frame):
             event_source_type = self.get_event_source_type()
             if event_source_type == EventType.RESERVED:
                 self.command_string = "RESERVED EVENT"
@@ -382,7 +295,10 @@ class ForwardFrame24Bit:
                 self.address_string = self.build_event_source_string(
                     event_source_type
                 ).ljust(address_field_width)
-                self.command_string = f"EVENT DATA 0x{(frame & 0x3FF):03X} = {(frame & 0x3FF)} = {(frame & 0x3FF):012b}b"
+                event_data = EVENT_DATA.get(frame)
+                self.command_string = (
+                    f"EVENT DATA 0x{event_data:03X} = {event_data} = {event_data:012b}b"
+                )
             self.address_string = self.address_string.ljust(address_field_width)
             return
         instance_address_type = self.get_instance_address_type()
@@ -0,0 +1,639 @@
+class DeviceType:
+    NONE = 0
+    LED = 6
+    SWITCH = 7
+    COLOUR = 8
+
+
+class DeviceClass:
+    SENSOR = 4
+    INPUT = 5
+    SEQUENCER = 6
+
+
+class CommandSpace:
+    GEAR = "GEAR"
+    DEVICE = "DEVICE"
+    INSTANCE = "INSTANCE"
+    EDALI = "EDALI"
+    FIRMWARE = "FIRMWARE"
+
+
+# see iec 62386-102:2022 11.2
+GEAR_COMMANDS = {
+    0x00: "OFF",
+    0x01: "UP",
+    0x02: "DOWN",
+    0x03: "STEP UP",
+    0x04: "STEP DOWN",
+    0x05: "RECALL MAX LEVEL",
+    0x06: "RECALL MIN LEVEL",
+    0x07: "STEP DOWN AND OFF",
+    0x08: "ON AND STEP UP",
+    0x09: "ENABLE DAPC SEQUENCE",
+    0x0A: "GO TO LAST ACTIVE LEVEL",
+    0x0B: "CONTINOUS UP",
+    0x0C: "CONTINOUS DOWN",
+    0x10: "GO TO SCENE 0",
+    0x11: "GO TO SCENE 1",
+    0x12: "GO TO SCENE 2",
+    0x13: "GO TO SCENE 3",
+    0x14: "GO TO SCENE 4",
+    0x15: "GO TO SCENE 5",
+    0x16: "GO TO SCENE 6",
+    0x17: "GO TO SCENE 7",
+    0x18: "GO TO SCENE 8",
+    0x19: "GO TO SCENE 9",
+    0x1A: "GO TO SCENE 10",
+    0x1B: "GO TO SCENE 11",
+    0x1C: "GO TO SCENE 12",
+    0x1D: "GO TO SCENE 13",
+    0x1E: "GO TO SCENE 14",
+    0x1F: "GO TO SCENE 15",
+    0x20: "RESET",
+    0x21: "STORE ACTUAL LEVEL IN DTR0",
+    0x22: "SAVE PERSISTENT VARIABLES (DEPRECATED)",
+    0x23: "SET OPERATING MODE (DTR0)",
+    0x24: "RESET MEMORY BANK (DTR0)",
+    0x25: "IDENTIFY DEVICE",
+    0x2A: "SET MAX LEVEL (DTR0)",
+    0x2B: "SET MIN LEVEL (DTR0)",
+    0x2C: "SET SYSTEM FAILURE LEVEL (DTR0)",
+    0x2D: "SET POWER ON LEVEL (DTR0)",
+    0x2E: "SET FADE TIME (DTR0)",
+    0x2F: "SET FADE RATE (DTR0)",
+    0x30: "SET EXTENDED FADE TIME (DTR0)",
+    0x40: "SET SCENE (DTR0) 0",
+    0x41: "SET SCENE (DTR0) 1",
+    0x42: "SET SCENE (DTR0) 2",
+    0x43: "SET SCENE (DTR0) 3",
+    0x44: "SET SCENE (DTR0) 4",
+    0x45: "SET SCENE (DTR0) 5",
+    0x46: "SET SCENE (DTR0) 6",
+    0x47: "SET SCENE (DTR0) 7",
+    0x48: "SET SCENE (DTR0) 8",
+    0x49: "SET SCENE (DTR0) 9",
+    0x4A: "SET SCENE (DTR0) 10",
+    0x4B: "SET SCENE (DTR0) 11",
+    0x4C: "SET SCENE (DTR0) 12",
+    0x4D: "SET SCENE (DTR0) 13",
+    0x4E: "SET SCENE (DTR0) 14",
+    0x4F: "SET SCENE (DTR0) 15",
+    0x50: "REMOVE FROM SCENE 0",
+    0x51: "REMOVE FROM SCENE 1",
+    0x52: "REMOVE FROM SCENE 2",
+    0x53: "REMOVE FROM SCENE 3",
+    0x54: "REMOVE FROM SCENE 4",
+    0x55: "REMOVE FROM SCENE 5",
+    0x56: "REMOVE FROM SCENE 6",
+    0x57: "REMOVE FROM SCENE 7",
+    0x58: "REMOVE FROM SCENE 8",
+    0x59: "REMOVE FROM SCENE 9",
+    0x5A: "REMOVE FROM SCENE 10",
+    0x5B: "REMOVE FROM SCENE 11",
+    0x5C: "REMOVE FROM SCENE 12",
+    0x5D: "REMOVE FROM SCENE 13",
+    0x5E: "REMOVE FROM SCENE 14",
+    0x5F: "REMOVE FROM SCENE 15",
+    0x60: "ADD TO GROUP 0",
+    0x61: "ADD TO GROUP 1",
+    0x62: "ADD TO GROUP 2",
+    0x63: "ADD TO GROUP 3",
+    0x64: "ADD TO GROUP 4",
+    0x65: "ADD TO GROUP 5",
+    0x66: "ADD TO GROUP 6",
+    0x67: "ADD TO GROUP 7",
+    0x68: "ADD TO GROUP 8",
+    0x69: "ADD TO GROUP 9",
+    0x6A: "ADD TO GROUP 10",
+    0x6B: "ADD TO GROUP 11",
+    0x6C: "ADD TO GROUP 12",
+    0x6D: "ADD TO GROUP 13",
+    0x6E: "ADD TO GROUP 14",
+    0x6F: "ADD TO GROUP 15",
+    0x70: "REMOVE FROM GROUP 0",
+    0x71: "REMOVE FROM GROUP 1",
+    0x72: "REMOVE FROM GROUP 2",
+    0x73: "REMOVE FROM GROUP 3",
+    0x74: "REMOVE FROM GROUP 4",
+    0x75: "REMOVE FROM GROUP 5",
+    0x76: "REMOVE FROM GROUP 6",
+    0x77: "REMOVE FROM GROUP 7",
+    0x78: "REMOVE FROM GROUP 8",
+    0x79: "REMOVE FROM GROUP 9",
+    0x7A: "REMOVE FROM GROUP 10",
+    0x7B: "REMOVE FROM GROUP 11",
+    0x7C: "REMOVE FROM GROUP 12",
+    0x7D: "REMOVE FROM GROUP 13",
+    0x7E: "REMOVE FROM GROUP 14",
+    0x7F: "REMOVE FROM GROUP 15",
+    0x80: "SET SHORT ADDRESS (DTR0)",
+    0x81: "ENABLE WRITE MEMORY",
+    0x90: "QUERY STATUS",
+    0x91: "QUERY CONTROL GEAR PRESENT",
+    0x92: "QUERY LAMP FAILURE",
+    0x93: "QUERY LAMP POWER ON",
+    0x94: "QUERY LIMIT ERROR",
+    0x95: "QUERY RESET STATE",
+    0x96: "QUERY MISSING SHORT ADDRESS",
+    0x97: "QUERY VERSION NUMBER",
+    0x98: "QUERY CONTENT DTR0",
+    0x99: "QUERY DEVICE TYPE",
+    0x9A: "QUERY PHYSICAL MINIMUM",
+    0x9B: "QUERY POWER FAILURE",
+    0x9C: "QUERY CONTENT DTR1",
+    0x9D: "QUERY CONTENT DTR2",
+    0x9E: "QUERY OPERATING MODE",
+    0x9F: "QUERY LIGHT SOURCE TYPE",
+    0xA0: "QUERY ACTUAL LEVEL",
+    0xA1: "QUERY MAX LEVEL",
+    0xA2: "QUERY MIN LEVEL",
+    0xA3: "QUERY POWER ON LEVEL",
+    0xA4: "QUERY SYSTEM FAILURE LEVEL",
+    0xA5: "QUERY FADE TIME / FADE RATE",
+    0xA6: "QUERY MANUFACTURER SPECIFIC MODE",
+    0xA7: "QUERY NEXT DEVICE TYPE",
+    0xA8: "QUERY EXTENDED FADE TIME",
+    0xAA: "QUERY CONTROL GEAR FAILURE",
+    0xB0: "QUERY SCENE LEVEL 0",
+    0xB1: "QUERY SCENE LEVEL 1",
+    0xB2: "QUERY SCENE LEVEL 2",
+    0xB3: "QUERY SCENE LEVEL 3",
+    0xB4: "QUERY SCENE LEVEL 4",
+    0xB5: "QUERY SCENE LEVEL 5",
+    0xB6: "QUERY SCENE LEVEL 6",
+    0xB7: "QUERY SCENE LEVEL 7",
+    0xB8: "QUERY SCENE LEVEL 8",
+    0xB9: "QUERY SCENE LEVEL 9",
+    0xBA: "QUERY SCENE LEVEL 10",
+    0xBB: "QUERY SCENE LEVEL 11",
+    0xBC: "QUERY SCENE LEVEL 12",
+    0xBD: "QUERY SCENE LEVEL 13",
+    0xBE: "QUERY SCENE LEVEL 14",
+    0xBF: "QUERY SCENE LEVEL 15",
+    0xC0: "QUERY GROUPS 0-7",
+    0xC1: "QUERY GROUPS 8-15",
+    0xC2: "QUERY RANDOM ADDRESS (H)",
+    0xC3: "QUERY RANDOM ADDRESS (M)",
+    0xC4: "QUERY RANDOM ADDRESS (L)",
+    0xC5: "READ MEMORY LOCATION (DTR1,DTR0)",
+    0xFF: "QUERY EXTENDED VERSION NUMBER",
+}
+
+# DT 8 commands
+# iec 62386 - 209 11.3
+GEAR_COLOUR_COMMANDS = {
+    0xE0: "SET TEMPORARY X-COORDINATE",
+    0xE1: "SET TEMPORARY Y-COORDINATE",
+    0xE2: "ACTIVATE",
+    0xE3: "X-COORDINATE STEP UP",
+    0xE4: "X-COORDINATE STEP DOWN",
+    0xE5: "Y-COORDINATE STEP UP",
+    0xE6: "Y-COORDINATE STEP DOWN",
+    0xE7: "SET TEMPORARY COLOUR TEMPERATURE TC",
+    0xE8: "COLOUR TEMPERATURE TC STEP COOLER",
+    0xE9: "COLOUR TEMPERTAURE TC STEP WARMER",
+    0xEA: "SET TEMPORARY PRIMARY N DIMLEVEL",
+    0xEB: "SET TEMPORARY RGB DIMLEVEL",
+    0xEC: "SET TEMPORARY WAF DIMLEVEL",
+    0xED: "SET TEMPORARY RGBWAF CONTROL",
+    0xEE: "COPY REPORT TO TEMPORARY",
+    0xF0: "STORE TY PRIMARY N",
+    0xF1: "STORE XY-COORDINATE PRIMARY N",
+    0xF2: "STORE COLOUR TEMPERATURE TC LIMIT",
+    0xF3: "STORE GEAR FEATURE/STATUS",
+    0xF5: "ASSIGN COLOUR TO LINKED CHANNEL",
+    0xF6: "START AUTO CALIBRATION",
+    0xF7: "QUERY GEAR FEATURES/STATUS",
+    0xF8: "QUERY COLOUR STATUS",
+    0xF9: "QUERY COLOUR TYPE FEATURES",
+    0xFA: "QUERY COLOUR VALUE",
+    0xFB: "QUERY RGBWAF CONTROL",
+    0xFC: "QUERY ASSIGNED COLOUR",
+    0xFF: "QUERY EXTENDED VERSION NUMBER",
+}
+
+# DT 7 commands
+# iec 62386 - 208 11.3.4.1
+GEAR_SWITCH_COMMANDS = {
+    0xE0: "REFERENCE SYSTEM POWER",
+    0xE1: "STORE DTR AS UP SITCH-ON THRESHOLD",
+    0xE2: "STORE DTR AS UP SITCH-OFF THRESHOLD",
+    0xE3: "STORE DTR AS DOWN SITCH-ON THRESHOLD",
+    0xE4: "STORE DTR AS DOWN SITCH-OFF THRESHOLD",
+    0xE5: "STORE DTR AS ERROR HOLD-OFF TIME",
+    0xF0: "QUERY FEATURES",
+    0xF1: "QUERY SWITCH STATUS",
+    0xF2: "QUERY UP SWITCH-ON THRESHOLD",
+    0xF3: "QUERY UP SWITCH-OFF THRESHOLD",
+    0xF4: "QUERY DOWN SWITCH-ON THRESHOLD",
+    0xF5: "QUERY DOWN SWITCH-OFF THRESHOLD",
+    0xF6: "QUERY ERROR HOLD-OFF TIME",
+    0xF7: "QUERY GEAR TYPE",
+    0xF9: "QUERY REFERENCE RUNNING",
+    0xFA: "QUERY REFERENCE MEASUREMENT FAILED",
+    0xFF: "QUERY EXTENDED VERSION NUMBER",
+}
+
+# DT 6 commands
+# iec 62386 - 207 11.3
+GEAR_LED_COMMANDS = {
+    0xE0: "REFERENCE SYSTEM POWER",
+    0xE3: "SELECT DIMMING CURVE (DTR0)",
+    0xE4: "SET FAST FADE TIME (DTR0)",
+    0xED: "QUERY CONTROL GEAR TYPE",
+    0xEE: "QUERY DIMMING CURVE",
+    0xF0: "QUERY FEATURES",
+    0xF1: "QUERY FAILURE STATUS",
+    0xF4: "QUERY LOAD DECREASE",
+    0xF5: "QUERY LOAD INCREASE",
+    0xF7: "QUERY THERMAL SHUTDOWN",
+    0xF8: "QUERY THERMAL OVERLOAD",
+    0xF9: "QUERY REFERENCE RUNNING",
+    0xFA: "QUERY REFERENCE MEASUREMENT FAILED",
+    0xFD: "QUERY FAST FADE TIME",
+    0xFE: "QUERY MIN FAST FADE TIME",
+    0xFF: "QUERY EXTENDED VERSION NUMBER",
+}
+
+# see iec 62386-103 11.2 table 23 - standard commands
+DEVICE_COMMANDS = {
+    0x00: "IDENTIFY DEVICE",
+    0x01: "RESET POWER CYCLE SEEN",
+    0x10: "RESET",
+    0x11: "RESET MEMORY BANK (DTR0)",
+    0x14: "SET SHORT ADDRESS (DTR0)",
+    0x15: "ENABLE WRITE MEMORY",
+    0x16: "ENABLE APPLICATION CONTROLLER",
+    0x17: "DISABLE APPLICATION CONTROLLER",
+    0x18: "SET OPERATING MODE (DTR0)",
+    0x19: "ADD TO DEVICE GROUPS 0-15 (DTR2:DTR1)",
+    0x1A: "ADD TO DEVICE GROUPS 16-31 (DTR2:DTR1)",
+    0x1B: "REMOVE FROM DEVICE GROUPS 0-15 (DTR2:DTR1)",
+    0x1C: "REMOVE FROM DEVICE GROUPS 16-31 (DTR2:DTR1)",
+    0x1D: "START QUIESCENT MODE",
+    0x1E: "STOP QUIESCENT MODE",
+    0x1F: "ENABLE POWER CYCLE NOTIFICATION",
+    0x20: "DISABLE POWER CYCLE NOTIFICATION",
+    0x21: "SAVE PERSISTENT VARIABLES (DEPRECATED)",
+    0x30: "QUERY DEVICE STATUS",
+    0x31: "QUERY APPLICATION CONTROLLER ERROR",
+    0x32: "QUERY INPUT DEVICE ERROR",
+    0x33: "QUERY MISSING SHORT ADDRESS",
+    0x34: "QUERY VERSION NUMBER",
+    0x35: "QUERY NUMBER OF INSTANCES",
+    0x36: "QUERY CONTENT DTR0",
+    0x37: "QUERY CONTENT DTR1",
+    0x38: "QUERY CONTENT DTR2",
+    0x39: "QUERY RANDOM ADDRESS (H)",
+    0x3A: "QUERY RANDOM ADDRESS (M)",
+    0x3B: "QUERY RANDOM ADDRESS (L)",
+    0x3C: "READ MEMORY LOCATION (DTR1,DTR0)",
+    0x3D: "QUERY APPLICATION CONTROLLER ENABLED",
+    0x3E: "QUERY OPERATING MODE",
+    0x3F: "QUERY MANUFACTURER SPECIFIC MODE",
+    0x40: "QUERY QUIESCENT MODE",
+    0x41: "QUERY DEVICE GROUPS 0-7",
+    0x42: "QUERY DEVICE GROUPS 8-15",
+    0x43: "QUERY DEVICE GROUPS 16-23",
+    0x44: "QUERY DEVICE GROUPS 24-31",
+    0x45: "QUERY POWER CYCLE NOTIFICATION",
+    0x46: "QUERY DEVICE CAPABILITIES",
+    0x47: "QUERY EXTENDED VERSION NUMBER (DTR0)",
+    0x48: "QUERY RESET STATE",
+    0x49: "QUERY APPLICATION CONTROLLER ALWAYS ACTIVE",
+}
+
+# iec 62386-103 instance commands, iec 62386-301 to 304 instance type commands
+INSTANCE_COMMANDS = {
+    0x00: "SET SHORT TIMER (DTR0) - TYPE 301",
+    0x01: "SET DOUBLE TIMER (DTR0) - TYPE 301",
+    0x02: "SET REPEAT TIMER (DTR0) - TYPE 301",
+    0x03: "SET STUCK TIMER (DTR0) - TYPE 301",
+    0x0A: "QUERY SHORT TIMER - TYPE 301",
+    0x0B: "QUERY SHORT TIMER MIN - TYPE 301",
+    0x0C: "QUERY DOUBLE TIMER - TYPE 301",
+    0x0D: "QUERY DOUBLE TIMER MIN - TYPE 301",
+    0x0E: "QUERY REPEAT TIMER - TYPE 301",
+    0x0F: "QUERY STUCK TIMER - TYPE 301",
+    0x10: "SET REPORT TIMER (DTR0) - TYPE 302",
+    0x11: "SET DEADTIME TIMER (DTR0) - TYPE 302",
+    0x1D: "QUERY DEADTIME TIMER - TYPE 302",
+    0x1E: "QUERY REPORT TIMER - TYPE 302",
+    0x1F: "QUERY SWITCH - TYPE 302",
+    0x20: "CATCH MOVEMENT - TYPE 303",
+    0x21: "SET HOLD TIMER (DTR0) - TYPE 303",
+    0x22: "SET REPORT TIMER (DTR0)- TYPE 303",
+    0x23: "SET DEADTIME TIMER (DTR0) - TYPE 303",
+    0x24: "CANCEL HOLD TIMER -TYPE 303",
+    0x2C: "QUERY DEADTIME TIMER - TYPE 303",
+    0x2D: "QUERY HOLD TIMER - TYPE 303",
+    0x2E: "QUERY REPORT TIMER - TYPE 303",
+    0x2F: "QUERY CACHING - TYPE 303",
+    0x30: "SET REPORT TIMER (DTR0) - TYPE 304",
+    0x31: "SET HYSTERESIS (DTR0) - TYPE 304",
+    0x32: "SET DEADTIME TIMER (DTR0) - TYPE 304",
+    0x33: "SET HYSTERESIS MIN (DTR0) - TYPE 304",
+    0x3C: "QUERY HYSTERESIS MIN - TYPE 304",
+    0x3D: "QUERY DEADTIME TIMER - TYPE 304",
+    0x3E: "QUERY REPORT TIMER - TYPE 304",
+    0x3F: "QUERY HYSTERESIS - TYPE 304",
+    0x61: "SET EVENT PRIORITY (DTR0)",
+    0x62: "ENABLE INSTANCE",
+    0x63: "DISABLE INSTANCE",
+    0x64: "SET PRIMARY INSTANCE GROUP (DTR0)",
+    0x65: "SET INSTANCE GROUP 1 (DTR0)",
+    0x66: "SET INSTANCE GROUP 2 (DTR0)",
+    0x67: "SET EVENT SCHEME (DTR0)",
+    0x68: "SET EVENT FILTER (DTR2,DTR1,DTR0)",
+    0x69: "SET INSTANCE TYPE (DTR0)",
+    0x6A: "SET INSTANCE CONFIGURATION (DTR0,DTR2:DTR1)",
+    0x80: "QUERY INSTANCE TYPE",
+    0x81: "QUERY RESOLUTION",
+    0x82: "QUERY INSTANCE ERROR",
+    0x83: "QUERY INSTANCE STATUS",
+    0x84: "QUERY EVENT PRIORITY",
+    0x86: "QUERY INSTANCE ENABLED",
+    0x88: "QUERY PRIMARY INSTANCE GROUP",
+    0x89: "QUERY INSTANCE GROUP 1",
+    0x8A: "QUERY INSTANCE GROUP 2",
+    0x8B: "QUERY EVENT SCHEME",
+    0x8C: "QUERY INPUT VALUE",
+    0x8D: "QUERY INPUT VALUE LATCH",
+    0x8E: "QUERY FEATURE TYPE",
+    0x8F: "QUERY NEXT FEATURE TYPE",
+    0x90: "QUERY EVENT FILTER 0-7",
+    0x91: "QUERY EVENT FILTER 8-15",
+    0x92: "QUERY EVENT FILTER 16-23",
+    0x93: "QUERY INSTANCE CONFIGURATION (DTR0)",
+    0x94: "QUERY AVAILABLE INSTANCE TYPES",
+}
+
+EDALI_SENSOR_COMMANDS = {
+    0x00: "QUERY SWITCH ADDRESS",
+    0x01: "QUERY CALCULATED CHECKSUM",
+    0x02: "QUERY FIRMWARE VERSION",
+    0x03: "QUERY EDALI VERSION",
+    0x10: "START DATA DOWNLOAD",
+    0x11: "STORE DTR0 AS DATA BYTE COUNTER",
+    0x12: "ENABLE DIRECT MODE",
+    0x13: "DISABLE DIRECT MODE",
+    0x14: "ENTER BOOTLOADER",
+    0x15: "HIDE MEMORY BANKS",
+    0x16: "DISCOVER HIDDEN MEMORY BANKS",
+    0x20: "ENHANCED RESET",
+    0x21: "ENHANCED STORE SHORT ADDRESS",
+    0x26: "QUERY ACTUATOR TYPE",
+    0x30: "QUERY ENHANCED RESET STATE",
+    0x31: "QUERY CONTROL TYPE NUMBER",
+    0x32: "QUERY VERSION NUMBER CONTROL TYPE",
+    0x33: "QUERY CLASS MEMBER 1-7",
+    0x34: "QUERY CLASS MEMBER 8-14",
+    0x35: "QUERY MULTIPLE CLASS ADDRESS",
+    0x36: "QUERY MULTIPLE CLASS",
+    0x37: "QUERY MISSING ENHANCED SHORT ADDRESS",
+    0x38: "QUERY ENHANCED GROUPS 0-7",
+    0x39: "QUERY ENHANCED GROUPS 8-15",
+    0x40: "QUERY COMMISSIONING FEATURES",
+    0x41: "QUERY CHANNEL SELECTOR",
+    0x42: "QUERY PARAMETER POINTER",
+    0x43: "QUERY PARAMTER",
+    0x44: "QUERY NUMBER OF PARAMETERS",
+    0x45: "START IDENTIFICATION",
+    0x46: "STOP IDENTIFICATION",
+    0x47: "MASSCONTROLLER ACTIVE",
+    0x50: "STORE DTR0 AS PARAMETER SELECTOR",
+    0x51: "STORE DTR0 AS PARAMETER POINTER",
+    0x52: "STORE DTR0 AS PARAMETER",
+    0x53: "START PARAMETER DOWMLOAD",
+    0x54: "STOP PARAMETER DOWNLOAD",
+    0x60: "QUERY MANUAL CONTROL FEATURES",
+    0x61: "QUERY EVENT FEATURES",
+    0x62: "QUERY MANUAL CONTROL STATUS",
+    0x63: "QUERY NUMBER OF BUTTONS",
+    0x64: "QUERY TYPE OF BUTTON 1-7",
+    0x65: "QUERY TYPE OF BUTTON 8-15",
+    0x66: "QUERY BUTTON LOCKED",
+    0x67: "QUERY BUTTON LOCKED STATUS 1-7",
+    0x68: "QUERY BUTTON LOCKED STATUS 8-15",
+    0x69: "QUERY BUTTON STATE 1-7",
+    0x6A: "QUERY BUTTON STATE 8-15",
+    0x6B: "QUERY TIME LONG PRESS",
+    0x6C: "QUERY TIME CONFIG1 EVENT",
+    0x6D: "QUERY TIME CONFIG2 EVENT",
+    0x70: "STORE DTR AS TYPE OF BUTTON 1-7",
+    0x71: "STORE DTR AS TYPE OF BUTTON 8-15",
+    0x72: "LOCK UNLOCK BUTTON 1-7",
+    0x73: "LOCK UNLOCK BUTTON 8-15",
+    0x74: "STORE DTR0 AS TIME LONG PRESS",
+    0x75: "STORE DTR0 AS TIME CONFIG1 EVENT",
+    0x76: "STORE DTR0 AS TIME CONFIG2 EVENT",
+    0xC8: "QUERY MOTION STATUS",
+    0xD4: "SET DTR0 AS DALI SHORT ADDRESS",
+    0xD5: "QUERY DALI SHORT ADDRESS",
+    0xD7: "QUERY SUPPORTED SENSORS",
+    0xD8: "SET DTR0 AS DALI SHORT ADDRESS MODE",
+    0xD9: "QUERY DALI SHORT ADDRESS MODE",
+    0xDA: "STORE DTR0 AS CONSTANT LIGHT CONTROL MODE",
+    0xDB: "QUERY CONSTANT LIGHT CONTROL MODE",
+    0xDC: "STORE DTR0 AS CONSTANT LIGHT REFERENCE VALUE",
+    0xDD: "QUERY CONSTANT LIGHT REFERENCE VALUE",
+    0xE1: "SET DTR0 AS OPERATING MODE",
+    0xE2: "QUERY OPERATING MODE",
+    0xE3: "SET DTR0 AS EVENT MESSAGE DESTINATION ADDRESS",
+    0xE4: "QUERY EVENT MESSAGE DESTINATION ADDRESS",
+    0xF0: "ACTIVATE CUSTOM SCENE BEHAVIOUR",
+    0xFA: "SET PRESET CONFIGURATION",
+    0xFB: "QUERY CONFIGURATION BYTE",
+}
+
+EDALI_INPUT_COMMANDS = {
+    0x00: "QUERY SWITCH ADDRESS",
+    0x01: "QUERY CALCULATED CHECKSUM",
+    0x02: "QUERY FIRMWARE VERSION",
+    0x03: "QUERY EDALI VERSION",
+    0x10: "START DATA DOWNLOAD",
+    0x11: "STORE DTR0 AS DATA BYTE COUNTER",
+    0x12: "ENABLE DIRECT MODE",
+    0x13: "DISABLE DIRECT MODE",
+    0x14: "ENTER BOOTLOADER",
+    0x15: "HIDE MEMORY BANKS",
+    0x16: "DISCOVER HIDDEN MEMORY BANKS",
+    0x20: "ENHANCED RESET",
+    0x21: "ENHANCED STORE SHORT ADDRESS",
+    0x26: "QUERY ACTUATOR TYPE",
+    0x30: "QUERY ENHANCED RESET STATE",
+    0x31: "QUERY CONTROL TYPE NUMBER",
+    0x32: "QUERY VERSION NUMBER CONTROL TYPE",
+    0x33: "QUERY CLASS MEMBER 1-7",
+    0x34: "QUERY CLASS MEMBER 8-14",
+    0x35: "QUERY MULTIPLE CLASS ADDRESS",
+    0x36: "QUERY MULTIPLE CLASS",
+    0x37: "QUERY MISSING ENHANCED SHORT ADDRESS",
+    0x38: "QUERY ENHANCED GROUPS 0-7",
+    0x39: "QUERY ENHANCED GROUPS 8-15",
+    0x40: "QUERY COMMISSIONING FEATURES",
+    0x41: "QUERY CHANNEL SELECTOR",
+    0x42: "QUERY PARAMETER POINTER",
+    0x43: "QUERY PARAMTER",
+    0x44: "QUERY NUMBER OF PARAMETERS",
+    0x45: "START IDENTIFICATION",
+    0x46: "STOP IDENTIFICATION",
+    0x47: "MASSCONTROLLER ACTIVE",
+    0x50: "STORE DTR0 AS PARAMETER SELECTOR",
+    0x51: "STORE DTR0 AS PARAMETER POINTER",
+    0x52: "STORE DTR0 AS PARAMETER",
+    0x53: "START PARAMETER DOWMLOAD",
+    0x54: "STOP PARAMETER DOWNLOAD",
+    0x60: "QUERY MANUAL CONTROL FEATURES",
+    0x61: "QUERY EVENT FEATURES",
+    0x62: "QUERY MANUAL CONTROL STATUS",
+    0x65: "MOTION SENSOR OFF-STATE",
+    0x66: "MOTION SENSOR ON-STATE",
+    0x69: "MOTION SENSOR MIN-STATE",
+    0xB4: "EVENT MESSAGE BUTTON SHORT PRESS",
+    0xB5: "EVENT MESSAGE BUTTON LONG PRESS",
+    0xB6: "EVENT MESSAGE BUTTON RELEASED",
+    0xB7: "EVENT MESSAGE BUTTON NEXT SHORT PRESS",
+    0xC8: "QUERY MOTION STATUS",
+    0xCD: "QUERY LIGHT LEVEL LOW",
+    0xCE: "QUERY LIGHT LEVEL HIGH",
+    0xD2: "QUERY TEMPERATURE",
+    0xD4: "SET DTR0 AS DALI SHORT ADDRESS",
+    0xD5: "QUERY DALI SHORT ADDRESS",
+    0xD7: "QUERY SUPPORTED SENSORS",
+    0xD8: "SET DTR0 AS DALI SHORT ADDRESS MODE",
+    0xD9: "QUERY DALI SHORT ADDRESS MODE",
+    0xDA: "STORE DTR0 AS CONSTANT LIGHT CONTROL MODE",
+    0xDB: "QUERY CONSTANT LIGHT CONTROL MODE",
+    0xDC: "STORE DTR0 AS CONSTANT LIGHT REFERENCE VALUE",
+    0xDD: "QUERY CONSTANT LIGHT REFERENCE VALUE",
+    0xE1: "SET DTR0 AS OPERATING MODE",
+    0xE2: "QUERY OPERATING MODE",
+    0xE3: "SET DTR0 AS EVENT MESSAGE DESTINATION ADDRESS",
+    0xE4: "QUERY EVENT MESSAGE DESTINATION ADDRESS",
+    0xF0: "ACTIVATE CUSTOM SCENE BEHAVIOUR",
+    0xFA: "SET PRESET CONFIGURATION",
+    0xFB: "QUERY CONFIGURATION BYTE",
+}
+
+# see iec 62386-105 11.2 table 6 - standard commands
+FIRMWARE_COMMANDS = {
+    0x00: "START FW TRANSFER",
+    0x01: "RESTART FW",
+    0x02: "ENABLE RESTART",
+    0x03: "FINISH FW UPDATE",
+    0x04: "CANCEL FW UPDATE",
+    0x05: "QUERY FW UPDATE FEATURES",
+    0x06: "QUERY FW RESTART ENABLED",
+    0x07: "QUERY FW UPDATE RUNNING",
+    0x08: "QUERY BLOCK FAULT",
+}
+
+
+class CommandRegistry:
+    # commands are keyed by (frame length, command space, device type or class, opcode)
+
+    def __init__(self):
+        self.known = {}
+        self.tables = {}
+
+    def register(self, frame_length, space, type, codes, fallback):
+        for opcode, name in codes.items():
+            self.known[(frame_length, space, type, opcode)] = name
+        # names of unknown codes are rendered once here and kept in the table
+        self.tables[(frame_length, space, type)] = tuple(
+            codes[opcode] if opcode in codes else fallback.format(opcode=opcode)
+            for opcode in range(0x100)
+        )
+
+    def table(self, frame_length, space, type=0):
+        return self.tables[(frame_length, space, type)]
+
+    def get(self, frame_length, space, type, opcode):
+        return self.tables[(frame_length, space, type)][opcode]
+
+    def commands(self, frame_length=None, space=None):
+        return sorted(
+            (key, name)
+            for key, name in self.known.items()
+            if (frame_length is None or key[0] == frame_length)
+            and (space is None or key[1] == space)
+        )
+
+
+REGISTRY = CommandRegistry()
+REGISTRY.register(
+    16,
+    CommandSpace.GEAR,
+    DeviceType.NONE,
+    GEAR_COMMANDS,
+    "--- CODE 0x{opcode:02X} = {opcode} UNKNOWN CONTROL GEAR COMMAND",
+)
+REGISTRY.register(
+    16,
+    CommandSpace.GEAR,
+    DeviceType.LED,
+    GEAR_LED_COMMANDS,
+    "--- CODE 0x{opcode:02X} = {opcode} UNKNOWN LED GEAR COMMAND",
+)
+REGISTRY.register(
+    16,
+    CommandSpace.GEAR,
+    DeviceType.SWITCH,
+    GEAR_SWITCH_COMMANDS,
+    "--- CODE 0x{opcode:02X} = {opcode} UNKNOWN SWITCH GEAR COMMAND",
+)
+REGISTRY.register(
+    16,
+    CommandSpace.GEAR,
+    DeviceType.COLOUR,
+    GEAR_COLOUR_COMMANDS,
+    "--- CODE 0x{opcode:02X} = {opcode} UNKNOWN COLOUR GEAR COMMAND",
+)
+REGISTRY.register(
+    24,
+    CommandSpace.DEVICE,
+    0,
+    DEVICE_COMMANDS,
+    "--- CODE 0x{opcode:02X} = {opcode} UNDEFINED CONTROL DEVICE COMMAND",
+)
+REGISTRY.register(
+    24,
+    CommandSpace.INSTANCE,
+    0,
+    INSTANCE_COMMANDS,
+    "--- CODE 0x{opcode:02X} = {opcode} UNDEFINED INSTANCE COMMAND",
+)
+for device_class in range(0x10):
+    if device_class == DeviceClass.SENSOR:
+        REGISTRY.register(
+            25,
+            CommandSpace.EDALI,
+            device_class,
+            EDALI_SENSOR_COMMANDS,
+            "--- CODE 0x{opcode:02X} = {opcode} UNKNOWN eDALI SENSOR COMMAND",
+        )
+    elif device_class == DeviceClass.INPUT:
+        REGISTRY.register(
+            25,
+            CommandSpace.EDALI,
+            device_class,
+            EDALI_INPUT_COMMANDS,
+            "--- CODE 0x{opcode:02X} = {opcode} UNKNOWN eDALI INPUT COMMAND",
+        )
+    else:
+        REGISTRY.register(
+            25,
+            CommandSpace.EDALI,
+            device_class,
+            {},
+            f"--- CLASS {device_class} NOT IMPLEMENTED",
+        )
+REGISTRY.register(
+    32,
+    CommandSpace.FIRMWARE,
+    0,
+    FIRMWARE_COMMANDS,
+    "--- CODE 0x{opcode:02X} = {opcode} UNKNOWN FIRMWARE UPDATE COMMAND",
+)
@@ -0,0 +1,251 @@
+from typing import NamedTuple
+
+from .backframe_8bit import Backframe8Bit
+from .fields import (
+    DEVICE_ADDRESS,
+    DEVICE_SPECIAL_DATA_NAMES,
+    EDALI_SPECIAL_NAMES,
+    GEAR_ADDRESS,
+    INSTANCE_ADDRESS,
+    MNEMONICS,
+    PARAMETER_NAMES,
+    AddressKind,
+    InstanceKind,
+    device_mnemonics,
+    device_special_mnemonics,
+    edali_mnemonics,
+    firmware_mnemonics,
+    gear_mnemonics,
+    instance_mnemonics,
+)
+from .forward_frame_16bit import DeviceType, ForwardFrame16Bit
+from .forward_frame_24bit import ForwardFrame24Bit
+from .forward_frame_25bit import ForwardFrame25Bit
+from .forward_frame_32bit import ForwardFrame32Bit
+
+ADDRESS_WIDTH = 14
+
+
+def render_parts(
+    length, data, device_type=DeviceType.NONE, address_width=ADDRESS_WIDTH
+):
+    # (address, command), the address is padded to address_width
+    if length == 8:
+        command = Backframe8Bit(data, address_width)
+    elif length == 16:
+        address_string, command_string = ForwardFrame16Bit.lookup(data, device_type)
+        return address_string.ljust(address_width), command_string
+    elif length == 24:
+        command = ForwardFrame24Bit(data, address_width)
+    elif length == 25:
+        command = ForwardFrame25Bit(data, address_width)
+    elif length == 32:
+        command = ForwardFrame32Bit(data, address_width)
+    else:
+        return " " * address_width, f"--- UNDEFINED FRAMELENGTH {length} BITS"
+    return command.address_string, command.command_string
+
+
+def render(length, data, device_type=DeviceType.NONE, address_width=ADDRESS_WIDTH):
+    address_string, command_string = render_parts(
+        length, data, device_type, address_width
+    )
+    return address_string + command_string
+
+
+class DecodeResult(NamedTuple):
+    frame_class: int
+    address_kind: int
+    address: int
+    instance_kind: int
+    instance: int
+    opcode: int
+    mnemonic: int
+    parameter: int | None
+    data: int
+    device_type: int = DeviceType.NONE
+
+    @property
+    def name(self):
+        return MNEMONICS.name(self.mnemonic)
+
+    def cmd(self):
+        # the human readable string is only rendered on demand
+        return render(self.frame_class, self.data, self.device_type)
+
+    def __str__(self):
+        return self.cmd()
+
+
+def _gear_fields(data, device_type):
+    address_kind, address = GEAR_ADDRESS[(data >> 8) & 0xFF]
+    mnemonic = gear_mnemonics(device_type)[data & 0xFFFF]
+    return address_kind, address, InstanceKind.NONE, 0, data & 0xFF, mnemonic
+
+
+def _device_fields(data):
+    address_byte = (data >> 16) & 0xFF
+    instance_byte = (data >> 8) & 0xFF
+    opcode_byte = data & 0xFF
+    # see iec 62386-103 7.2.2.1
+    if ((data >> 13) & 0x7FF) == 0x7F7:
+        if (data >> 6) & 0x01:
+            address_kind, address = AddressKind.DEVICE, data & 0x3F
+        elif (data >> 12) & 0x01:
+            address_kind, address = AddressKind.DEVICE_GROUP, (data >> 7) & 0x1F
+        else:
+            address_kind, address = AddressKind.NONE, 0
+        mnemonic = MNEMONICS.id("POWER CYCLE EVENT")
+        return address_kind, address, InstanceKind.NONE, 0, 0, mnemonic
+    # IEC 62386-103:2022 Table 3 - event message frame encoding
+    if not (data >> 16) & 0x01:
+        scheme_bit = (data >> 15) & 0x01
+        if not (data >> 23) & 0x01:
+            address_kind, address = AddressKind.DEVICE, (data >> 17) & 0x3F
+            instance_kind = InstanceKind.NUMBER if scheme_bit else InstanceKind.TYPE
+        elif not (data >> 22) & 0x01:
+            address = (data >> 17) & 0x1F
+            if scheme_bit:
+                address_kind = AddressKind.INSTANCE_TYPE
+                instance_kind = InstanceKind.NUMBER
+            else:
+                address_kind = AddressKind.DEVICE_GROUP
+                instance_kind = InstanceKind.TYPE
+        elif not scheme_bit:
+            address_kind, address = AddressKind.INSTANCE_GROUP, (data >> 17) & 0x1F
+            instance_kind = InstanceKind.TYPE
+        else:
+            mnemonic = MNEMONICS.id("RESERVED EVENT")
+            return AddressKind.RESERVED, 0, InstanceKind.NONE, 0, data & 0x3FF, mnemonic
+        mnemonic = MNEMONICS.id("EVENT DATA")
+        instance = (data >> 10) & 0x1F
+        return address_kind, address, instance_kind, instance, data & 0x3FF, mnemonic
+    # IEC 62386-103:2022 Table 1 - command frame encoding
+    address_kind, address = DEVICE_ADDRESS[address_byte]
+    if address_kind == AddressKind.SPECIAL:
+        mnemonic = device_special_mnemonics()[(address_byte << 8) | instance_byte]
+        return (
+            address_kind,
+            address,
+            InstanceKind.NONE,
+            instance_byte,
+            opcode_byte,
+            mnemonic,
+        )
+    instance_kind, instance = INSTANCE_ADDRESS[instance_byte]
+    if address_kind == AddressKind.RESERVED:
+        mnemonic = MNEMONICS.id("RESERVED")
+    elif instance_kind == InstanceKind.DEVICE:
+        mnemonic = device_mnemonics()[opcode_byte]
+    else:
+        mnemonic = instance_mnemonics()[opcode_byte]
+    return address_kind, address, instance_kind, instance, opcode_byte, mnemonic
+
+
+def _edali_fields(data):
+    class_byte = (data >> 17) & 0x0F
+    address_byte = (data >> 9) & 0xFF
+    opcode_byte = data & 0xFF
+    if address_byte in EDALI_SPECIAL_NAMES:
+        mnemonic = MNEMONICS.id(EDALI_SPECIAL_NAMES[address_byte])
+        # ENHANCED INITIALISE addresses a single device with the opcode byte
+        if address_byte == 0xA5 and opcode_byte not in (0x00, 0xFF):
+            address_kind, address = AddressKind.ENHANCED, (opcode_byte >> 1) & 0x3F
+        else:
+            address_kind, address = AddressKind.NONE, 0
+    else:
+        mnemonic = edali_mnemonics()[(class_byte << 8) | opcode_byte]
+        if address_byte == 0xFF:
+            address_kind, address = AddressKind.ENHANCED_BROADCAST, 0
+        elif address_byte == 0xFD:
+            address_kind, address = AddressKind.ENHANCED_BROADCAST_UNADDR, 0
+        elif address_byte & 0x80:
+            address_kind = AddressKind.ENHANCED_GROUP
+            address = (address_byte >> 1) & 0x3F
+        else:
+            address_kind, address = AddressKind.ENHANCED, (address_byte >> 1) & 0x3F
+    return address_kind, address, InstanceKind.CLASS, class_byte, opcode_byte, mnemonic
+
+
+def _firmware_fields(data):
+    # see iec 62386-105 11.2 table 7 - data transfer commands
+    address_byte = (data >> 24) & 0xFF
+    if address_byte == 0xCB:
+        mnemonic = MNEMONICS.id("BEGIN BLOCK")
+        return AddressKind.NONE, 0, InstanceKind.NONE, 0, data & 0xFFFFFF, mnemonic
+    if address_byte == 0xBD:
+        mnemonic = MNEMONICS.id("TRANSFER BLOCK DATA")
+        return AddressKind.NONE, 0, InstanceKind.NONE, 0, data & 0xFFFFFF, mnemonic
+    # see iec 62386-105 11.2 table 6 - standard commands
+    address = (data >> 25) & 0x7F
+    device_space = (data >> 24) & 0x01
+    if address == 0x7F:
+        address_kind = (
+            AddressKind.DEVICE_BROADCAST if device_space else AddressKind.GEAR_BROADCAST
+        )
+        address = 0
+    elif address == 0x7E:
+        address_kind = (
+            AddressKind.DEVICE_BROADCAST_UNADDR
+            if device_space
+            else AddressKind.GEAR_BROADCAST_UNADDR
+        )
+        address = 0
+    elif (address >> 6) == 0:
+        address_kind = AddressKind.DEVICE if device_space else AddressKind.GEAR
+    else:
+        address_kind = AddressKind.NONE
+    if address_kind == AddressKind.NONE or ((data >> 16) & 0xFF) != 0xFB:
+        return AddressKind.NONE, 0, InstanceKind.NONE, 0, 0, MNEMONICS.id("---")
+    opcode_byte = (data >> 8) & 0xFF
+    mnemonic = firmware_mnemonics()[opcode_byte]
+    return address_kind, address, InstanceKind.NONE, 0, opcode_byte, mnemonic
+
+
+def classify(length, data, device_type=DeviceType.NONE):
+    if length == 8:
+        fields = (
+            AddressKind.NONE,
+            0,
+            InstanceKind.NONE,
+            0,
+            data & 0xFF,
+            MNEMONICS.id("DATA"),
+        )
+    elif length == 16:
+        fields = _gear_fields(data, device_type)
+    elif length == 24:
+        fields = _device_fields(data)
+    elif length == 25:
+        fields = _edali_fields(data)
+    elif length == 32:
+        fields = _firmware_fields(data)
+    else:
+        fields = (
+            AddressKind.NONE,
+            0,
+            InstanceKind.NONE,
+            0,
+            0,
+            MNEMONICS.id("--- UNDEFINED FRAMELENGTH"),
+        )
+    address_kind, address, instance_kind, instance, opcode, mnemonic = fields
+    name = MNEMONICS.name(mnemonic)
+    if name not in PARAMETER_NAMES:
+        parameter = None
+    elif name in DEVICE_SPECIAL_DATA_NAMES.values():
+        parameter = (instance << 8) | opcode
+    else:
+        parameter = opcode
+    return DecodeResult(
+        length,
+        address_kind,
+        address,
+        instance_kind,
+        instance,
+        opcode,
+        mnemonic,
+        parameter,
+        data,
+        device_type,
+    )
@@ -0,0 +1,20 @@
+from .binary import (
+    CaptureFormatError,
+    CaptureReader,
+    CaptureWriter,
+    convert,
+    is_capture,
+)
+from .index import CaptureIndex, Checkpoint, frames_from, index_for
+
+__all__ = [
+    "CaptureFormatError",
+    "CaptureIndex",
+    "CaptureReader",
+    "CaptureWriter",
+    "Checkpoint",
+    "convert",
+    "frames_from",
+    "index_for",
+    "is_capture",
+]
@@ -0,0 +1,138 @@
+import mmap
+import struct
+
+from connection.frame import DaliFrame
+from connection.serial import DaliSerial
+from connection.status import DaliStatus
+
+# 16 byte header: magic, format version, record size
+MAGIC = b"DALICAP\x00"
+VERSION = 1
+HEADER = struct.Struct("<8sHH4x")
+# 10 byte records: timestamp in ms, length or status code, flags, data
+RECORD = struct.Struct("<IBBI")
+RECORD_DTYPE = [
+    ("timestamp", "<u4"),
+    ("length", "u1"),
+    ("flags", "u1"),
+    ("data", "<u4"),
+]
+
+FLAG_LOOPBACK = 0x01
+
+
+class CaptureFormatError(ValueError):
+    pass
+
+
+def is_capture(path):
+    with open(path, "rb") as capture:
+        return capture.read(len(MAGIC)) == MAGIC
+
+
+class CaptureWriter:
+    def __init__(self, path):
+        # closed by close() or the end of a with block
+        self.file = open(path, "wb")  # noqa: SIM115
+        self.file.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+        self.count = 0
+
+    def write(self, timestamp, loopback, length, data):
+        flags = FLAG_LOOPBACK if loopback else 0
+        self.file.write(RECORD.pack(timestamp & 0xFFFFFFFF, length, flags, data))
+        self.count += 1
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def convert(stream, path):
+    # text lines in the serial format from a binary stream to a binary capture,
+    # returns the number of frames written and the number of malformed lines
+    from pipeline import read_blocks
+
+    malformed = 0
+    with CaptureWriter(path) as writer:
+        for block in read_blocks(stream):
+            parsed = DaliSerial.parse_buffer(block)
+            malformed += parsed.malformed
+            for record in parsed.records:
+                writer.write(*record)
+    return writer.count, malformed
+
+
+class CaptureReader:
+    # records are read straight from the memory mapped file
+
+    def __init__(self, path):
+        with open(path, "rb") as capture:
+            header = capture.read(HEADER.size)
+            if len(header) < HEADER.size:
+                raise CaptureFormatError(f"{path} is too short for a capture header")
+            magic, version, record_size = HEADER.unpack(header)
+            if magic != MAGIC:
+                raise CaptureFormatError(f"{path} is not a binary capture")
+            if version != VERSION or record_size != RECORD.size:
+                raise CaptureFormatError(
+                    f"{path} has unsupported version {version} "
+                    f"or record size {record_size}"
+                )
+            self.map = mmap.mmap(capture.fileno(), 0, access=mmap.ACCESS_READ)
+        self.count = (len(self.map) - HEADER.size) // RECORD.size
+        self.view = memoryview(self.map)[
+            HEADER.size : HEADER.size + self.count * RECORD.size
+        ]
+
+    def __len__(self):
+        return self.count
+
+    def raw(self, start=0, stop=None):
+        # (timestamp in ms, length, flags, data) tuples
+        view = self.view[start * RECORD.size :]
+        if stop is not None:
+            view = view[: (stop - start) * RECORD.size]
+        return RECORD.iter_unpack(view)
+
+    def frames(self, start=0, stop=None):
+        for timestamp, length, flags, data in self.raw(start, stop):
+            yield DaliFrame(
+                timestamp=timestamp / 1000.0,
+                length=length,
+                data=data,
+                status=DaliStatus.from_code(bool(flags & FLAG_LOOPBACK), length, data),
+            )
+
+    def __iter__(self):
+        return self.frames()
+
+    def records(self):
+        # structured numpy view on the file, nothing is copied. The array holds
+        # its own reference to the mapping and stays valid after close()
+        import numpy as np
+
+        return np.frombuffer(self.view, dtype=np.dtype(RECORD_DTYPE))
+
+    def close(self):
+        # a records() array or an unfinished frames() or raw() keeps the
+        # mapping alive, it is unmapped once the last of them is gone
+        view, self.view = self.view, None
+        mapping, self.map = self.map, None
+        if view is None:
+            return
+        try:
+            view.release()
+            mapping.close()
+        except BufferError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
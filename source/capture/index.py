@@ -0,0 +1,152 @@
+import logging
+import os
+import struct
+from bisect import bisect_right
+from typing import NamedTuple
+
+from connection.serial import DaliSerial
+from connection.status import DaliStatus
+
+from .binary import FLAG_LOOPBACK, CaptureReader, is_capture
+
+logger = logging.getLogger(__name__)
+
+# frames between two checkpoints
+INTERVAL = 4096
+
+# magic, format version, capture size and modification time it was built for
+INDEX_MAGIC = b"DALIIDX\x00"
+INDEX_VERSION = 1
+INDEX_HEADER = struct.Struct("<8sHxxQq")
+CHECKPOINT = struct.Struct("<IQIB")
+
+NO_TIMESTAMP = 0
+
+
+class Checkpoint(NamedTuple):
+    # timestamp of the first frame after the checkpoint in ms
+    timestamp: int
+    # byte offset of the line in text captures, record number in binary ones
+    offset: int
+    # decoder context before that frame
+    last_timestamp: int
+    device_type: int
+
+
+def _next_device_type(device_type, loopback, length, data):
+    # same rule as DALI.Decode, frames with an error status keep the context
+    status = DaliStatus.from_code(loopback, length, data).status
+    if status not in (DaliStatus.OK, DaliStatus.FRAME, DaliStatus.LOOPBACK):
+        return device_type
+    if length == 16 and ((data >> 8) & 0xFF) == 0xC1:
+        return data & 0xFF
+    return 0
+
+
+def _text_records(path):
+    # (offset, timestamp, loopback, length, data) of every frame
+    offset = 0
+    with open(path, "rb") as capture:
+        for line in capture:
+            fields = DaliSerial.parse_raw(line)
+            if fields is not None:
+                yield (offset, *fields)
+            offset += len(line)
+
+
+def _binary_records(path):
+    with CaptureReader(path) as reader:
+        for number, (timestamp, length, flags, data) in enumerate(reader.raw()):
+            yield number, timestamp, bool(flags & FLAG_LOOPBACK), length, data
+
+
+def _stamp(path):
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+class CaptureIndex:
+    def __init__(self, checkpoints, binary):
+        self.checkpoints = checkpoints
+        self.timestamps = [checkpoint.timestamp for checkpoint in checkpoints]
+        self.binary = binary
+
+    @classmethod
+    def build(cls, path, interval=INTERVAL):
+        binary = is_capture(path)
+        records = _binary_records(path) if binary else _text_records(path)
+        checkpoints = []
+        last_timestamp = NO_TIMESTAMP
+        device_type = 0
+        for count, (offset, timestamp, loopback, length, data) in enumerate(records):
+            if count % interval == 0:
+                checkpoints.append(
+                    Checkpoint(timestamp, offset, last_timestamp, device_type)
+                )
+            device_type = _next_device_type(device_type, loopback, length, data)
+            last_timestamp = timestamp
+        return cls(checkpoints, binary)
+
+    def locate(self, timestamp):
+        # last checkpoint at or before timestamp, timestamps must not wrap
+        position = bisect_right(self.timestamps, timestamp) - 1
+        if position < 0:
+            return self.checkpoints[0] if self.checkpoints else None
+        return self.checkpoints[position]
+
+    def save(self, path, stamp):
+        size, mtime = stamp
+        with open(path, "wb") as index:
+            index.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, size, mtime))
+            index.write(bytes([self.binary]))
+            index.writelines(
+                CHECKPOINT.pack(*checkpoint) for checkpoint in self.checkpoints
+            )
+
+    @classmethod
+    def load(cls, path, stamp):
+        # None if the index is missing, damaged or outdated
+        try:
+            with open(path, "rb") as index:
+                data = index.read()
+        except OSError:
+            return None
+        if len(data) < INDEX_HEADER.size + 1:
+            return None
+        magic, version, size, mtime = INDEX_HEADER.unpack_from(data)
+        if (magic, version, (size, mtime)) != (INDEX_MAGIC, INDEX_VERSION, stamp):
+            return None
+        body = memoryview(data)[INDEX_HEADER.size + 1 :]
+        if len(body) % CHECKPOINT.size:
+            return None
+        checkpoints = [Checkpoint(*fields) for fields in CHECKPOINT.iter_unpack(body)]
+        return cls(checkpoints, bool(data[INDEX_HEADER.size]))
+
+
+def index_for(path, interval=INTERVAL):
+    # the index is kept next to the capture and rebuilt when the capture changes
+    index_path = f"{path}.idx"
+    stamp = _stamp(path)
+    index = CaptureIndex.load(index_path, stamp)
+    if index is None:
+        logger.debug(f"build index {index_path}")
+        index = CaptureIndex.build(path, interval)
+        try:
+            index.save(index_path, stamp)
+        except OSError as e:
+            logger.info(f"index not saved: {e}")
+    return index
+
+
+def frames_from(path, index, checkpoint):
+    # frames from a checkpoint to the end of the capture
+    if index.binary:
+        with CaptureReader(path) as reader:
+            yield from reader.frames(checkpoint.offset)
+        return
+    with open(path, "rb") as capture:
+        capture.seek(checkpoint.offset)
+        for line in capture:
+            frame = DaliSerial.parse(line)
+            if frame is not None:
+                yield frame
@@ -0,0 +1,244 @@
+import asyncio
+import errno
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from .frame import DaliFrame
+from .ring import OVERFLOW_POLICIES, QUEUE_SIZE, Overflow
+from .serial import DaliSerial
+from .status import DaliStatus
+from .timeline import NS_PER_SECOND, Timeline
+
+logger = logging.getLogger(__name__)
+
+# marks the end of the frame stream after close()
+_CLOSED = object()
+
+
+class AsyncConnection:
+    QUEUE_MAXSIZE = QUEUE_SIZE
+    RECEIVE_TIMEOUT = 1
+    # status of the echo of a transmitted frame
+    LOOPBACK_STATUS = DaliStatus.LOOPBACK
+
+    def __init__(self, overflow=Overflow.DROP_OLDEST):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"unknown overflow policy {overflow}")
+        self.overflow = overflow
+        self.queue = asyncio.Queue(maxsize=self.QUEUE_MAXSIZE)
+        # one queue per pending query_reply
+        self.waiters = []
+        self.keep_running = False
+        # frames lost to a full queue and the highest fill level seen
+        self.dropped = 0
+        self.high_water = 0
+        # set to tag the frames when several buses are monitored
+        self.bus = None
+
+    def received(self, frame):
+        # tags the frame and hands it to the pending queries
+        if frame is None:
+            frame = DaliFrame(status=DaliStatus.from_status(DaliStatus.GENERAL))
+        if self.bus is not None:
+            frame = frame._replace(bus=self.bus)
+        for waiter in self.waiters:
+            waiter.put_nowait(frame)
+        return frame
+
+    def dispatch(self, frame):
+        self._put(self.received(frame))
+
+    async def dispatch_wait(self, frame):
+        # the block policy, the caller stops reading while the queue is full
+        frame = self.received(frame)
+        if self.overflow != Overflow.BLOCK:
+            self._put(frame)
+            return
+        await self.queue.put(frame)
+        self.high_water = max(self.high_water, self.queue.qsize())
+
+    def _put(self, item):
+        # dispatch never waits, a full queue drops a frame by the policy
+        if self.queue.full():
+            self.dropped += 1
+            logger.debug("receive queue full, frame dropped")
+            if self.overflow == Overflow.DROP_NEWEST and item is not _CLOSED:
+                return
+            self.queue.get_nowait()
+        self.queue.put_nowait(item)
+        self.high_water = max(self.high_water, self.queue.qsize())
+
+    def host_ns(self, frame):
+        # host monotonic time of a frame, orders the frames of several buses
+        return frame.received_ns
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        frame = await self.queue.get()
+        if frame is _CLOSED:
+            raise StopAsyncIteration
+        return frame
+
+    async def get_next(self, timeout=None):
+        try:
+            frame = await asyncio.wait_for(self.__anext__(), timeout)
+        except TimeoutError:
+            return DaliFrame(status=DaliStatus.from_status(DaliStatus.TIMEOUT))
+        except StopAsyncIteration:
+            return DaliFrame(status=DaliStatus.from_status(DaliStatus.GENERAL))
+        return frame
+
+    async def _wait_reply(self, waiter):
+        try:
+            return await asyncio.wait_for(waiter.get(), self.RECEIVE_TIMEOUT)
+        except TimeoutError:
+            return DaliFrame(status=DaliStatus.from_status(DaliStatus.TIMEOUT))
+
+    async def query_reply(self, frame: DaliFrame):
+        # returns the backframe, or None if the query was not echoed on the bus
+        waiter = asyncio.Queue()
+        self.waiters.append(waiter)
+        try:
+            self.send_query(frame)
+            logger.debug("read loopback")
+            loopback = await self._wait_reply(waiter)
+            if (
+                loopback.status.status != self.LOOPBACK_STATUS
+                or loopback.data != frame.data
+                or loopback.length != frame.length
+            ):
+                return None
+            logger.debug("read backframe")
+            return await self._wait_reply(waiter)
+        finally:
+            self.waiters.remove(waiter)
+
+    def close(self):
+        self.keep_running = False
+        self._put(_CLOSED)
+
+
+class AsyncDaliSerial(AsyncConnection):
+    # the port is watched by the event loop, no thread is needed
+
+    def __init__(
+        self,
+        portname,
+        baudrate=DaliSerial.DEFAULT_BAUDRATE,
+        transparent=False,
+        overflow=Overflow.DROP_OLDEST,
+    ):
+        # pyserial is only loaded when a port is opened
+        import serial
+
+        if overflow == Overflow.BLOCK:
+            raise ValueError("the event loop can not block reading a serial port")
+        super().__init__(overflow)
+        logger.debug("open serial port")
+        self.port = serial.Serial(port=portname, baudrate=baudrate, timeout=0)
+        self.transparent = transparent
+        self.buffer = b""
+        self.timeline = Timeline()
+
+    def start_receive(self):
+        if not self.keep_running:
+            logger.debug("start receive")
+            self.keep_running = True
+            asyncio.get_running_loop().add_reader(self.port.fileno(), self.read_ready)
+
+    def read_ready(self):
+        lines = (self.buffer + self.port.read(self.port.in_waiting or 1)).split(b"\n")
+        # the lines of one read share the time they were received
+        received_ns = self.timeline.now()
+        self.buffer = lines.pop()
+        for line in lines:
+            if self.transparent:
+                print(line.decode("utf-8"))
+            line = line.strip(b" \r")
+            if len(line) > 0:
+                logger.debug(f"received line <{line}> from serial")
+                self.dispatch(
+                    DaliSerial.parse_stamped(line, self.timeline, received_ns)
+                )
+
+    def host_ns(self, frame):
+        # the adapter clock is more precise than the time a line was read
+        return self.timeline.to_host(round(frame.timestamp * NS_PER_SECOND))
+
+    def transmit(self, frame: DaliFrame):
+        self.port.write(DaliSerial.command("S", frame))
+
+    def send_query(self, frame: DaliFrame):
+        self.port.write(DaliSerial.command("Q", frame))
+
+    def close(self):
+        logger.debug("close connection")
+        if self.keep_running:
+            asyncio.get_running_loop().remove_reader(self.port.fileno())
+        super().close()
+        self.port.close()
+
+
+class AsyncDaliUsb(AsyncConnection):
+    # pyusb only offers blocking reads, every adapter has its own read thread
+    # so the reads of many adapters never wait for each other
+    LOOPBACK_STATUS = DaliStatus.FRAME
+    READ_TIMEOUT_MS = 100
+
+    def __init__(self, *args, overflow=Overflow.DROP_OLDEST, **kwargs):
+        # pyusb is only loaded when a USB device is used
+        import usb
+
+        from .hid import DaliUsb
+
+        super().__init__(overflow)
+        self.usb = usb
+        self.device = DaliUsb(*args, **kwargs)
+        self.executor = ThreadPoolExecutor(1, thread_name_prefix="dali-usb")
+        self.task = None
+
+    def start_receive(self):
+        if not self.keep_running:
+            logger.debug("start receive")
+            self.keep_running = True
+            self.task = asyncio.get_running_loop().create_task(self.read_loop())
+
+    async def read_loop(self):
+        loop = asyncio.get_running_loop()
+        # only one read is pending at a time, the buffer is reused
+        buffer = self.usb.util.create_buffer(self.device.ep_read.wMaxPacketSize)
+        try:
+            while self.keep_running:
+                try:
+                    count = await loop.run_in_executor(
+                        self.executor,
+                        self.device.read_into,
+                        buffer,
+                        self.READ_TIMEOUT_MS,
+                    )
+                except self.usb.USBError as e:
+                    if e.errno not in (errno.ETIMEDOUT, errno.ENODEV):
+                        raise
+                    continue
+                frame = self.device.parse_received(
+                    buffer, count, self.device.timeline.now()
+                )
+                if frame is not None:
+                    await self.dispatch_wait(frame)
+        finally:
+            # also when cancelled, a read still pending ends within the timeout
+            # and must be done before the resources are released
+            self.executor.shutdown(wait=True)
+            self.usb.util.dispose_resources(self.device.device)
+
+    def transmit(self, frame: DaliFrame):
+        self.device.transmit(frame)
+
+    def send_query(self, frame: DaliFrame):
+        self.device.transmit(frame)
+
+    def close(self):
+        logger.debug("close connection")
+        super().close()
@@ -1,6 +1,7 @@
-from .status import DaliStatus
 from typing import NamedTuple
 
+from .status import DaliStatus
+
 
 class DaliFrame(NamedTuple):
     timestamp: int = 0
@@ -8,4 +9,8 @@ class DaliFrame(NamedTuple):
     data: int = 0
     priority: int = 1
     send_twice: bool = False
-    status: DaliStatus = DaliStatus(status=DaliStatus.OK)
+    status: DaliStatus = DaliStatus.from_status(DaliStatus.OK)
+    # host monotonic clock in ns when the frame was received, 0 if unknown
+    received_ns: int = 0
+    # bus the frame was received on when several are monitored
+    bus: str | None = None
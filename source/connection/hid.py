@@ -4,12 +4,20 @@ import queue
 import struct
 import threading
 import time
+from typing import ClassVar
+
 import usb
-from .status import DaliStatus
+
 from .frame import DaliFrame
+from .ring import QUEUE_SIZE, Overflow, RingBuffer
+from .status import DaliStatus
+from .timeline import Timeline
 
 logger = logging.getLogger(__name__)
 
+# type, extension, address and opcode byte, sequence number of a report
+REPORT_HEADER = struct.Struct("xBxBBBxxB")
+
 
 class DaliUsb:
     _USB_VENDOR = 0x17B5
@@ -59,29 +67,49 @@ class DaliUsb:
     _USB_STATUS_DSI = 0x05
     _USB_STATUS_DALI = 0x06
 
-    def __init__(self, vendor=_USB_VENDOR, product=_USB_PRODUCT):
+    QUEUE_MAXSIZE = QUEUE_SIZE
+
+    # frame length, data mask and shared status by report type
+    _FRAME_TYPES: ClassVar[dict] = {
+        _USB_READ_TYPE_8BIT: (8, 0xFF, DaliStatus.from_status(DaliStatus.FRAME)),
+        _USB_READ_TYPE_16BIT: (16, 0xFFFF, DaliStatus.from_status(DaliStatus.FRAME)),
+        _USB_READ_TYPE_24BIT: (24, 0xFFFFFF, DaliStatus.from_status(DaliStatus.FRAME)),
+        _USB_READ_TYPE_NO_FRAME: (0, 0, DaliStatus.from_status(DaliStatus.TIMEOUT)),
+    }
+    _INFO_STATUS: ClassVar[dict] = {
+        _USB_STATUS_OK: DaliStatus.from_status(DaliStatus.OK),
+        _USB_STATUS_FRAME_ERROR: DaliStatus.from_status(DaliStatus.TIMING),
+    }
+
+    def __init__(
+        self,
+        vendor=_USB_VENDOR,
+        product=_USB_PRODUCT,
+        overflow=Overflow.DROP_OLDEST,
+        device=None,
+    ):
         # lookup devices by _USB_VENDOR and _USB_PRODUCT
         self.interface = 0
-        self.queue = queue.Queue(maxsize=40)
+        self.queue = RingBuffer(self.QUEUE_MAXSIZE, overflow)
+        # the adapter has no clock, frames are stamped by the host
+        self.timeline = Timeline()
         self.keep_running = False
         self.send_sequence_number = 1
         self.receive_sequence_number = None
         self.rx_frame = None
 
-        logger.debug("try to discover DALI interfaces")
-        devices = [
-            dev
-            for dev in usb.core.find(find_all=True, idVendor=vendor, idProduct=product)
-        ]
-
-        # if not found
-        if devices:
-            logger.info(f"DALI interfaces found: {devices}")
-        else:
-            raise usb.core.USBError("DALI interface not found")
+        if device is None:
+            devices = self.find_all(vendor, product)
 
-        # use first device from list
-        self.device = devices[0]
+            # if not found
+            if devices:
+                logger.info(f"DALI interfaces found: {devices}")
+            else:
+                raise usb.core.USBError("DALI interface not found")
+
+            # use first device from list
+            device = devices[0]
+        self.device = device
         self.device.reset()
 
         # detach kernel driver if necessary
@@ -117,9 +145,27 @@ class DaliUsb:
         except Exception:
             pass
 
+    @staticmethod
+    def find_all(vendor=_USB_VENDOR, product=_USB_PRODUCT):
+        # every connected adapter, pass one as device to use it
+        logger.debug("try to discover DALI interfaces")
+        return list(usb.core.find(find_all=True, idVendor=vendor, idProduct=product))
+
+    @property
+    def dropped(self):
+        return self.queue.dropped
+
+    @property
+    def high_water(self):
+        return self.queue.high_water
+
     def read_raw(self, timeout=None):
         return self.ep_read.read(self.ep_read.wMaxPacketSize, timeout=timeout)
 
+    def read_into(self, buffer, timeout=None):
+        # reuses buffer from usb.util.create_buffer, returns the received size
+        return self.ep_read.read(buffer, timeout=timeout)
+
     def transmit(self, frame: DaliFrame, block: bool = False):
         command = self._USB_CMD_SEND
         self.send_sequence_number = (self.send_sequence_number + 1) & 0xFF
@@ -182,57 +228,62 @@ class DaliUsb:
 
     def read_worker_thread(self):
         logger.debug("read_worker_thread started")
+        # one buffer for all reports, only the parsed frame is allocated
+        buffer = usb.util.create_buffer(self.ep_read.wMaxPacketSize)
         while self.keep_running:
             try:
-                usb_data = self.read_raw(timeout=100)
-                if usb_data:
-                    read_type = usb_data[1]
-                    receive_sequence_number = usb_data[8]
-                    logger.debug(
-                        f"DALI[IN]: SN=0x{usb_data[8]:02X} TY=0x{usb_data[1]:02X} "
-                        f"EC=0x{usb_data[3]:02X} AD=0x{usb_data[4]:02X} OC=0x{usb_data[5]:02X}"
-                    )
-                    if read_type == self._USB_READ_TYPE_8BIT:
-                        status = DaliStatus(status=DaliStatus.FRAME)
-                        length = 8
-                        dali_data = usb_data[5]
-                    elif read_type == self._USB_READ_TYPE_16BIT:
-                        status = DaliStatus(status=DaliStatus.FRAME)
-                        length = 16
-                        dali_data = usb_data[5] + (usb_data[4] << 8)
-                    elif read_type == self._USB_READ_TYPE_24BIT:
-                        status = DaliStatus(status=DaliStatus.FRAME)
-                        length = 24
-                        dali_data = (
-                            usb_data[5] + (usb_data[4] << 8) + (usb_data[3] << 16)
-                        )
-                    elif read_type == self._USB_READ_TYPE_NO_FRAME:
-                        status = DaliStatus(status=DaliStatus.TIMEOUT)
-                        length = 0
-                        dali_data = 0
-                    elif read_type == self._USB_READ_TYPE_INFO:
-                        length = 0
-                        dali_data = 0
-                        if usb_data[5] == self._USB_STATUS_OK:
-                            status = DaliStatus(status=DaliStatus.OK)
-                        elif usb_data[5] == self._USB_STATUS_FRAME_ERROR:
-                            status = DaliStatus(status=DaliStatus.TIMING)
-                        else:
-                            status = DaliStatus(status=DaliStatus.GENERAL)
-                    self.queue.put(
-                        DaliFrame(
-                            timestamp=time.time(),
-                            length=length,
-                            data=dali_data,
-                            status=status,
-                        )
-                    )
-
+                count = self.read_into(buffer, timeout=100)
             except usb.USBError as e:
                 if e.errno not in (errno.ETIMEDOUT, errno.ENODEV):
                     raise e
+                continue
+            frame = self.parse_received(buffer, count, self.timeline.now())
+            if frame is not None:
+                self.queue.put(frame)
         logger.debug("read_worker_thread terminated")
 
+    def parse_report(self, usb_data):
+        return self.parse_received(usb_data, len(usb_data), self.timeline.now())
+
+    def parse_received(self, buffer, count, received_ns):
+        # the first count bytes of buffer hold the report received at
+        # received_ns of the host monotonic clock
+        if count < REPORT_HEADER.size:
+            if count and logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"ignore short report of {count} bytes")
+            return None
+        return self.parse_header(received_ns, *REPORT_HEADER.unpack_from(buffer))
+
+    def parse_header(
+        self, received_ns, read_type, extension, address, opcode, sequence
+    ):
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"DALI[IN]: SN=0x{sequence:02X} TY=0x{read_type:02X} "
+                f"EC=0x{extension:02X} AD=0x{address:02X} OC=0x{opcode:02X}"
+            )
+        frame_type = self._FRAME_TYPES.get(read_type)
+        if frame_type is not None:
+            length, mask, status = frame_type
+            dali_data = (extension << 16 | address << 8 | opcode) & mask
+        elif read_type == self._USB_READ_TYPE_INFO:
+            length = 0
+            dali_data = 0
+            status = self._INFO_STATUS.get(opcode)
+            if status is None:
+                status = DaliStatus.from_status(DaliStatus.GENERAL)
+        else:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"ignore report type 0x{read_type:02X}")
+            return None
+        return DaliFrame(
+            timestamp=self.timeline.host_seconds(received_ns),
+            length=length,
+            data=dali_data,
+            status=status,
+            received_ns=received_ns,
+        )
+
     def start_receive(self):
         logger.debug("start receive")
         self.keep_running = True
@@ -247,10 +298,10 @@ class DaliUsb:
         try:
             self.rx_frame = self.queue.get(block=True, timeout=timeout)
         except queue.Empty:
-            self.rx_frame = DaliFrame(status=DaliStatus(status=DaliStatus.TIMEOUT))
+            self.rx_frame = DaliFrame(status=DaliStatus.from_status(DaliStatus.TIMEOUT))
             return
         if self.rx_frame is None:
-            self.rx_frame = DaliFrame(status=DaliStatus(status=DaliStatus.GENERAL))
+            self.rx_frame = DaliFrame(status=DaliStatus.from_status(DaliStatus.GENERAL))
             return
 
     def query_reply(self, frame: DaliFrame):
@@ -14,7 +14,6 @@ class DaliMock:
 
     def get_next(self, timeout=None):
         logger.debug("get next")
-        return
 
     def transmit(self, frame, block=False):
         logger.debug("transmit")
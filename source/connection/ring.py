@@ -0,0 +1,119 @@
+import queue
+import threading
+import time
+
+
+class Overflow:
+    DROP_OLDEST = "drop-oldest"
+    DROP_NEWEST = "drop-newest"
+    BLOCK = "block"
+
+
+OVERFLOW_POLICIES = (Overflow.DROP_OLDEST, Overflow.DROP_NEWEST, Overflow.BLOCK)
+
+# frames waiting for the decoder per connection, room for a few seconds of
+# a fully loaded bus
+QUEUE_SIZE = 1024
+
+
+class RingBuffer:
+    # Preallocated buffer between one read thread and one consumer. Only the
+    # producer moves tail, only the consumer moves head. Every slot holds
+    # (sequence, item), an item overwritten under drop-oldest is noticed by
+    # its sequence number, neither side takes a lock for the data.
+    # get() and put() raise queue.Empty and queue.Full like queue.Queue.
+
+    def __init__(self, capacity, policy=Overflow.DROP_OLDEST):
+        if capacity < 1:
+            raise ValueError(f"ring buffer capacity must be positive, not {capacity}")
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"unknown overflow policy {policy}")
+        self.capacity = capacity
+        self.policy = policy
+        self.slots = [(-1, None)] * capacity
+        self.head = 0
+        self.tail = 0
+        # frames refused by drop-newest, counted by the producer
+        self.rejected = 0
+        # overwritten frames the consumer skipped, counted by the consumer
+        self.skipped = 0
+        self.high_water = 0
+        # wake ups only, set after the data is visible
+        self.readable = threading.Event()
+        self.writable = threading.Event()
+
+    def qsize(self):
+        return min(self.tail - self.head, self.capacity)
+
+    __len__ = qsize
+
+    @property
+    def dropped(self):
+        # overwritten frames are counted once the consumer skips them, until
+        # then they are the part of the backlog beyond the capacity
+        overwritten = max(self.tail - self.head - self.capacity, 0)
+        return self.rejected + self.skipped + overwritten
+
+    def empty(self):
+        return self.tail == self.head
+
+    def put(self, item, block=True, timeout=None):
+        if self.tail - self.head >= self.capacity:
+            if self.policy == Overflow.DROP_NEWEST:
+                self.rejected += 1
+                return
+            if self.policy == Overflow.BLOCK:
+                if not block:
+                    raise queue.Full
+                self.wait_writable(timeout)
+        tail = self.tail
+        self.slots[tail % self.capacity] = (tail, item)
+        self.tail = tail + 1
+        depth = min(tail + 1 - self.head, self.capacity)
+        self.high_water = max(self.high_water, depth)
+        self.readable.set()
+
+    def put_nowait(self, item):
+        self.put(item, block=False)
+
+    def wait_writable(self, timeout):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.tail - self.head >= self.capacity:
+            self.writable.clear()
+            if self.tail - self.head < self.capacity:
+                break
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise queue.Full
+            self.writable.wait(remaining)
+
+    def get_nowait(self):
+        while True:
+            head = self.head
+            if self.tail == head:
+                raise queue.Empty
+            sequence, item = self.slots[head % self.capacity]
+            if sequence == head:
+                self.head = head + 1
+                if self.policy == Overflow.BLOCK:
+                    self.writable.set()
+                return item
+            # overwritten, continue with the oldest frame still in the buffer
+            oldest = max(head + 1, self.tail - self.capacity)
+            self.skipped += oldest - head
+            self.head = oldest
+
+    def get(self, block=True, timeout=None):
+        if not block:
+            return self.get_nowait()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            self.readable.clear()
+            try:
+                return self.get_nowait()
+            except queue.Empty:
+                pass
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise queue.Empty
+            self.readable.wait(remaining)
@@ -1,59 +1,162 @@
-import serial
 import logging
 import queue
+import re
 import threading
 import time
-from .status import DaliStatus
-from .frame import DaliFrame
+from typing import NamedTuple
 
+from .frame import DaliFrame
+from .ring import QUEUE_SIZE, Overflow, RingBuffer
+from .status import DaliStatus
+from .timeline import NS_PER_SECOND, Timeline
 
 logger = logging.getLogger(__name__)
 
+# "{" <timestamp> <error> <bits> " " <data> "}", see docs/serial.md. One
+# frame per line, only lines that parse_raw() reads the same way match
+FRAME_PATTERN = re.compile(
+    rb"^[^{}\n]*\{([0-9A-Fa-f]{8})([^}\n])([0-9A-Fa-f]{2})[^}\n]"
+    rb"([0-9A-Fa-f]{1,8})\}[^\n]*$",
+    re.MULTILINE,
+)
+LINE_PATTERN = re.compile(rb"^[ \t\r]*[^ \t\r\n]", re.MULTILINE)
+
+
+class ParsedBuffer(NamedTuple):
+    # (timestamp in ms, loopback, length or status code, data) per frame
+    records: list
+    # non empty lines without a frame
+    malformed: int
+
+    def frames(self):
+        for timestamp, loopback, length, data in self.records:
+            yield DaliFrame(
+                timestamp=timestamp / 1000.0,
+                length=length,
+                data=data,
+                status=DaliStatus.from_code(loopback, length, data),
+            )
+
+    def columns(self):
+        # numpy arrays timestamp, loopback, length, data e.g. for DALI.decode_batch
+        import numpy as np
+
+        records = np.array(self.records, dtype=np.uint32).reshape(-1, 4)
+        return records[:, 0], records[:, 1].astype(bool), records[:, 2], records[:, 3]
+
 
 class DaliSerial:
     DEFAULT_BAUDRATE = 115200
-    QUEUE_MAXSIZE = 40
+    QUEUE_MAXSIZE = QUEUE_SIZE
     RECEIVE_TIMEOUT = 1
 
-    def __init__(self, portname, baudrate=DEFAULT_BAUDRATE, transparent=False):
+    def __init__(
+        self,
+        portname,
+        baudrate=DEFAULT_BAUDRATE,
+        transparent=False,
+        overflow=Overflow.DROP_OLDEST,
+    ):
+        # pyserial is only loaded when a port is opened
+        import serial
+
         logger.debug("open serial port")
-        self.queue = queue.Queue(maxsize=self.QUEUE_MAXSIZE)
+        self.queue = RingBuffer(self.QUEUE_MAXSIZE, overflow)
+        self.timeline = Timeline()
         self.port = serial.Serial(port=portname, baudrate=baudrate, timeout=0.2)
         self.transparent = transparent
         self.keep_running = False
         self.rx_frame = None
 
+    @property
+    def dropped(self):
+        return self.queue.dropped
+
+    @property
+    def high_water(self):
+        return self.queue.high_water
+
     @staticmethod
-    def parse(line: str) -> DaliFrame:
+    def parse_raw(line: bytes):
+        # (timestamp in ms, loopback, length or status code, data)
         try:
             start = line.find(ord("{")) + 1
             end = line.find(ord("}"))
             payload = line[start:end]
-            timestamp = int(payload[0:8], 16) / 1000.0
+            timestamp = int(payload[0:8], 16)
             if payload[8] == ord(">"):
                 loopback = True
             else:
                 loopback = False
             length = int(payload[9:11], 16)
             data = int(payload[12:20], 16)
-            return DaliFrame(
-                timestamp=timestamp,
-                length=length,
-                data=data,
-                status=DaliStatus(loopback, length, data),
-            )
-        except ValueError:
+            return timestamp, loopback, length, data
+        except (ValueError, IndexError):
             return None
 
+    @staticmethod
+    def parse_buffer(buffer: bytes) -> ParsedBuffer:
+        # all frames of a buffer holding many lines, the same as parse_raw()
+        # of every line
+        records = [
+            (int(timestamp, 16), loopback == b">", int(length, 16), int(data, 16))
+            for timestamp, loopback, length, data in FRAME_PATTERN.findall(buffer)
+        ]
+        lines = buffer.count(b"\n") + (not buffer.endswith(b"\n"))
+        if lines == len(records):
+            return ParsedBuffer(records, 0)
+        # slow path, line by line and stripped like read_lines() does, blank
+        # lines are not counted as malformed
+        records = []
+        malformed = 0
+        for line in buffer.split(b"\n"):
+            fields = DaliSerial.parse_raw(line.strip(b" \r"))
+            if fields is not None:
+                records.append(fields)
+            elif LINE_PATTERN.match(line):
+                malformed += 1
+        return ParsedBuffer(records, malformed)
+
+    @staticmethod
+    def parse(line: str) -> DaliFrame:
+        fields = DaliSerial.parse_raw(line)
+        if fields is None:
+            return None
+        timestamp, loopback, length, data = fields
+        return DaliFrame(
+            timestamp=timestamp / 1000.0,
+            length=length,
+            data=data,
+            status=DaliStatus.from_code(loopback, length, data),
+        )
+
+    @staticmethod
+    def parse_stamped(line: bytes, timeline: Timeline, received_ns: int) -> DaliFrame:
+        # the adapter counter is extended to 64 bits, the line was received
+        # at received_ns of the host monotonic clock
+        fields = DaliSerial.parse_raw(line)
+        if fields is None:
+            return None
+        timestamp, loopback, length, data = fields
+        adapter_ns = timeline.adapter(timestamp, received_ns)
+        return DaliFrame(
+            timestamp=adapter_ns / NS_PER_SECOND,
+            length=length,
+            data=data,
+            status=DaliStatus.from_code(loopback, length, data),
+            received_ns=received_ns,
+        )
+
     def read_worker_thread(self):
         logger.debug("read_worker_thread started")
         while self.keep_running:
             line = self.port.readline()
+            received_ns = self.timeline.now()
             if self.transparent:
                 print(line.decode("utf-8"), end="")
             if len(line) > 0:
                 logger.debug(f"received line <{line}> from serial")
-                self.queue.put(self.parse(line))
+                self.queue.put(self.parse_stamped(line, self.timeline, received_ns))
         logger.debug("read_worker_thread terminated")
 
     def start_receive(self):
@@ -71,21 +174,21 @@ class DaliSerial:
         try:
             self.rx_frame = self.queue.get(block=True, timeout=timeout)
         except queue.Empty:
-            self.rx_frame = DaliFrame(status=DaliStatus(status=DaliStatus.TIMEOUT))
+            self.rx_frame = DaliFrame(status=DaliStatus.from_status(DaliStatus.TIMEOUT))
             return
         if self.rx_frame is None:
-            self.rx_frame = DaliFrame(status=DaliStatus(status=DaliStatus.GENERAL))
+            self.rx_frame = DaliFrame(status=DaliStatus.from_status(DaliStatus.GENERAL))
             return
 
+    @staticmethod
+    def command(kind: str, frame: DaliFrame) -> bytes:
+        # "S" sends a frame, "Q" sends a query and waits for the backframe
+        separator = "+" if frame.send_twice else " "
+        command = f"{kind}{frame.priority} {frame.length:X}{separator}{frame.data:X}\r"
+        return command.encode("utf-8")
+
     def transmit(self, frame: DaliFrame, block: bool = False):
-        if frame.send_twice:
-            command = f"S{frame.priority} {frame.length:X}+{frame.data:X}\r".encode(
-                "utf-8"
-            )
-        else:
-            command = f"S{frame.priority} {frame.length:X} {frame.data:X}\r".encode(
-                "utf-8"
-            )
+        command = self.command("S", frame)
         logger.debug(f"write <{command}>")
         self.port.write(command)
         if block:
@@ -97,14 +200,7 @@ class DaliSerial:
         logger.debug("flush queue")
         while not self.queue.empty():
             self.queue.get()
-        if frame.send_twice:
-            command = f"Q{frame.priority} {frame.length:X}+{frame.data:X}\r".encode(
-                "utf-8"
-            )
-        else:
-            command = f"Q{frame.priority} {frame.length:X} {frame.data:X}\r".encode(
-                "utf-8"
-            )
+        command = self.command("Q", frame)
         logger.debug(f"write <{command}>")
         self.port.write(command)
         logger.debug("read loopback")
@@ -16,7 +16,7 @@ class DaliStatus:
 
     def __init__(self, loopback=False, length=0, data=0, status=None):
         if status is None:
-            if length in range(0, 0x21):
+            if length in range(0x21):
                 if loopback:
                     self.status = DaliStatus.LOOPBACK
                     self.message = "LOOPBACK FRAME"
@@ -63,3 +63,41 @@ class DaliStatus:
                 self.message = message_dictionary[status]
             else:
                 self.message = f"ERROR: CODE 0x{status:02X}"
+
+    @staticmethod
+    def from_code(loopback=False, length=0, data=0):
+        # shared instance for the length or status code of a received frame
+        if length in (0x82, 0x83):
+            return DaliTimingStatus(length, data)
+        if loopback and length < 0x21:
+            return _LOOPBACK_STATUS
+        return _CODE_STATUS[length & 0xFF]
+
+    @staticmethod
+    def from_status(status):
+        # shared instance for a status value
+        shared = _STATUS.get(status)
+        if shared is None:
+            shared = _STATUS.setdefault(status, DaliStatus(status=status))
+        return shared
+
+
+class DaliTimingStatus(DaliStatus):
+    # timing errors carry bit and time, the message is only built when used
+
+    def __init__(self, length, data):
+        self.status = DaliStatus.TIMING
+        self.length = length
+        self.data = data
+
+    @property
+    def message(self):
+        if self.length == 0x82:
+            return self.built_message("START", self.data)
+        return self.built_message("DATA", self.data)
+
+
+# shared instances, must not be modified
+_CODE_STATUS = tuple(DaliStatus(False, length) for length in range(0x100))
+_LOOPBACK_STATUS = DaliStatus(True, 0)
+_STATUS = {status: DaliStatus(status=status) for status in range(DaliStatus.UNDEFINED)}
@@ -0,0 +1,148 @@
+import time
+from collections import deque
+
+NS_PER_MS = 1000000
+NS_PER_SECOND = 1000000000
+
+# the serial adapters count milliseconds in 32 bits, wrapping after 49.7 days
+COUNTER_BITS = 32
+
+# the offset is the smallest difference of host and adapter time in a block,
+# the transfer to the host only ever adds delay
+BLOCK_NS = 10 * NS_PER_SECOND
+# the drift is fitted over the minima of the last 10 minutes
+BLOCKS = 60
+
+
+class CounterExtender:
+    # Extends a wrapping adapter counter to 64 bits. A step back by more than
+    # half the range is a wrap, a smaller one a restart of the adapter, the
+    # extended counter continues from its last value then.
+
+    def __init__(self, bits=COUNTER_BITS):
+        self.modulus = 1 << bits
+        self.offset = 0
+        self.last = None
+        self.wraps = 0
+        self.restarts = 0
+
+    def extend(self, value):
+        last = self.last
+        if last is not None and value < last:
+            if last - value > self.modulus >> 1:
+                self.offset += self.modulus
+                self.wraps += 1
+            else:
+                self.offset += last - value
+                self.restarts += 1
+        self.last = value
+        return self.offset + value
+
+
+class ClockEstimator:
+    # Estimates host time = adapter time + offset + drift * elapsed adapter
+    # time from pairs of adapter and host time in ns. A least squares line is
+    # fitted through the minimum offset of every block.
+
+    def __init__(self, block_ns=BLOCK_NS, blocks=BLOCKS):
+        self.block_ns = block_ns
+        self.minima = deque(maxlen=blocks)
+        self.reset()
+
+    def reset(self):
+        self.minima.clear()
+        # (adapter time, offset) of the smallest offset in the current block
+        self.block_start = None
+        self.block_minimum = None
+        self.latest = None
+        # fitted line, offset at adapter time origin, drift in ns per ns
+        self.origin = None
+        self.intercept = 0.0
+        self.slope = 0.0
+
+    def add(self, adapter_ns, host_ns):
+        offset = host_ns - adapter_ns
+        self.latest = adapter_ns
+        if self.block_start is None:
+            self.block_start = adapter_ns
+        elif adapter_ns - self.block_start >= self.block_ns:
+            self.minima.append(self.block_minimum)
+            self.block_start = adapter_ns
+            self.block_minimum = None
+            self.fit()
+        if self.block_minimum is None or offset < self.block_minimum[1]:
+            self.block_minimum = (adapter_ns, offset)
+        if len(self.minima) < 2:
+            # no drift yet, the smallest offset seen
+            minimum = min((point[1] for point in self.minima), default=offset)
+            self.origin = adapter_ns
+            self.intercept = float(min(minimum, self.block_minimum[1]))
+
+    def fit(self):
+        if len(self.minima) < 2:
+            return
+        origin = self.minima[0][0]
+        count = len(self.minima)
+        mean_x = sum(point[0] - origin for point in self.minima) / count
+        mean_y = sum(point[1] for point in self.minima) / count
+        sxx = sxy = 0.0
+        for adapter_ns, offset in self.minima:
+            x = adapter_ns - origin - mean_x
+            sxx += x * x
+            sxy += x * (offset - mean_y)
+        self.slope = sxy / sxx if sxx else 0.0
+        self.origin = origin
+        self.intercept = mean_y - self.slope * mean_x
+
+    @property
+    def ready(self):
+        return self.origin is not None
+
+    @property
+    def drift_ppm(self):
+        # positive if the adapter clock is slower than the host clock
+        return self.slope * 1e6
+
+    def offset(self, adapter_ns):
+        # host minus adapter time in ns at adapter_ns
+        if self.origin is None:
+            return 0
+        return round(self.intercept + self.slope * (adapter_ns - self.origin))
+
+    def to_host(self, adapter_ns):
+        return adapter_ns + self.offset(adapter_ns)
+
+
+class Timeline:
+    # Stamps the frames of one connection with the host monotonic clock in
+    # integer ns, extends the adapter counter and reconciles both clocks.
+
+    def __init__(
+        self, bits=COUNTER_BITS, resolution_ns=NS_PER_MS, clock=time.monotonic_ns
+    ):
+        self.clock = clock
+        # wall clock time of the monotonic origin, host_seconds() compares
+        # to time.time() but never steps with it
+        self.epoch_ns = time.time_ns() - clock()
+        self.resolution_ns = resolution_ns
+        self.counter = CounterExtender(bits)
+        self.estimator = ClockEstimator()
+
+    def now(self):
+        return self.clock()
+
+    def host_seconds(self, host_ns):
+        return (self.epoch_ns + host_ns) / NS_PER_SECOND
+
+    def adapter(self, counter, host_ns):
+        # 64 bit adapter time in ns of a counter value received at host_ns
+        restarts = self.counter.restarts
+        adapter_ns = self.counter.extend(counter) * self.resolution_ns
+        if self.counter.restarts != restarts:
+            self.estimator.reset()
+        self.estimator.add(adapter_ns, host_ns)
+        return adapter_ns
+
+    def to_host(self, adapter_ns):
+        # host monotonic time in ns of an adapter time
+        return self.estimator.to_host(adapter_ns)
@@ -1,99 +1,118 @@
-import sys
 import logging
-import click
-from datetime import datetime
-from termcolor import cprint
 
-import DALI
-from connection.status import DaliStatus
-from connection.serial import DaliSerial
-from connection.hid import DaliUsb
+import click
 
 logger = logging.getLogger(__name__)
 
 
-def print_local_time(enabled):
-    if enabled:
-        time_string = datetime.now().strftime("%H:%M:%S")
-        cprint(f"{time_string} | ", color="yellow", end="")
-
-
-def print_command(absolute_time, timestamp, delta, dali_command):
-    print_local_time(absolute_time)
-    cprint(
-        f"{timestamp:.03f} | {delta:8.03f} | {dali_command} | ", color="green", end=""
-    )
-    cprint(f"{dali_command.cmd()}", color="white")
-
-
-def print_error(absolute_time, timestamp, delta, status):
-    print_local_time(absolute_time)
-    cprint(f"{timestamp:.03f} | {delta:8.03f} | ", color="green", end="")
-    cprint(f"{status.message}", color="red")
-
-
-def process_line(frame, absolute_time):
-    if process_line.last_timestamp != 0:
-        delta = frame.timestamp - process_line.last_timestamp
-    else:
-        delta = 0
-    if frame.status.status in (DaliStatus.OK, DaliStatus.FRAME, DaliStatus.LOOPBACK):
-        dali_command = DALI.Decode(
-            frame.length, frame.data, process_line.active_device_type
-        )
-        print_command(absolute_time, frame.timestamp, delta, dali_command)
-        process_line.active_device_type = dali_command.get_next_device_type()
-    else:
-        print_error(absolute_time, frame.timestamp, delta, frame.status)
-    process_line.last_timestamp = frame.timestamp
-
-
-def main_usb(absolute_time):
-    logger.debug("read from Lunatone usb device")
-    dali_connection = DaliUsb()
-    dali_connection.start_receive()
-    try:
-        while True:
-            dali_connection.get_next()
-            process_line(dali_connection.rx_frame, absolute_time)
-    except KeyboardInterrupt:
-        print("\rinterrupted")
-        dali_connection.close()
-
-
-def main_tty(transparent, absolute_time):
-    logger.debug("read from tty device")
-    line = ""
-    while True:
-        line = line + sys.stdin.readline()
-        if len(line) > 0 and line[-1] == "\n":
-            line = line.strip(" \r\n")
-            if len(line) > 0:
-                frame = DaliSerial.parse(line.encode("utf-8"))
-                process_line(frame, absolute_time)
-            line = ""
-
-
-def main_file(transparent, absolute_time):
-    logger.debug("read from file")
-    for line in sys.stdin:
-        if len(line) > 0:
-            frame = DaliSerial.parse(line.encode("utf-8"))
-            process_line(frame, absolute_time)
-
-
 @click.command()
 @click.version_option("1.4.2")
 @click.option(
     "-l",
     "--hid",
-    help="Use USB HID class connector for DALI communication.",
+    help="Read from all connected USB HID class connectors.",
     is_flag=True,
 )
 @click.option("--debug", help="Enable debug level logging.", is_flag=True)
 @click.option("--echo", help="Echo unprocessed input line to output.", is_flag=True)
 @click.option("--absolute", help="Add absolute local time to output.", is_flag=True)
-def dali_mon(hid, debug, echo, absolute):
+@click.option("--commands", help="List all known commands and exit.", is_flag=True)
+@click.option(
+    "--cache",
+    help="Cache decoded frames, number of entries (0 to disable).",
+    type=click.IntRange(min=0),
+    default=0,
+)
+@click.option(
+    "--file",
+    "path",
+    help="Read a capture file instead of stdin.",
+    type=click.Path(exists=True, dir_okay=False),
+)
+@click.option(
+    "--jobs",
+    help="Decode the capture file in this many processes.",
+    type=click.IntRange(min=1),
+    default=1,
+)
+@click.option(
+    "--port",
+    "ports",
+    help="Read from a serial port, can be given several times.",
+    multiple=True,
+)
+@click.option(
+    "--convert",
+    "output",
+    help="Convert the text input to a binary capture file and exit.",
+    type=click.Path(dir_okay=False, writable=True),
+)
+@click.option(
+    "--from",
+    "start",
+    help="With --file, start at this timestamp in seconds.",
+    type=float,
+)
+@click.option(
+    "--to",
+    "stop",
+    help="With --file, stop after this timestamp in seconds.",
+    type=float,
+)
+@click.option(
+    "--format",
+    "output_format",
+    help="Output format, jsonl, csv and arrow write one structured row per frame.",
+    type=click.Choice(["text", "jsonl", "csv", "arrow"]),
+    default="text",
+)
+@click.option(
+    "--stats",
+    help="Show bus statistics instead of the frames.",
+    is_flag=True,
+)
+@click.option(
+    "--metrics",
+    "metrics_port",
+    help="Serve Prometheus metrics on this localhost port.",
+    type=click.IntRange(min=0, max=65535),
+)
+@click.option(
+    "--replies",
+    help="Annotate backframes with their query, reply latency summary on exit.",
+    is_flag=True,
+)
+@click.option(
+    "--timing",
+    help="Check the gaps between frames against the IEC 62386-101 settling times.",
+    is_flag=True,
+)
+@click.option(
+    "--overflow",
+    help="What a full receive queue drops, block only stops reading USB adapters.",
+    type=click.Choice(["drop-oldest", "drop-newest", "block"]),
+    default="drop-oldest",
+)
+def dali_mon(
+    hid,
+    debug,
+    echo,
+    absolute,
+    commands,
+    cache,
+    path,
+    jobs,
+    ports,
+    output,
+    start,
+    stop,
+    output_format,
+    stats,
+    metrics_port,
+    replies,
+    timing,
+    overflow,
+):
     """
     Monitor for DALI commands,
     SevenLab 2023
@@ -101,17 +120,55 @@ def dali_mon(hid, debug, echo, absolute):
     if debug:
         logging.basicConfig(level=logging.DEBUG)
 
-    process_line.last_timestamp = 0
-    process_line.active_device_type = DALI.DeviceType.NONE
-    try:
-        if hid:
-            main_usb(absolute)
-        elif sys.stdin.isatty():
-            main_tty(echo, absolute)
-        else:
-            main_file(echo, absolute)
-    except KeyboardInterrupt:
-        print("\rinterrupted")
+    if commands:
+        import DALI
+
+        for (length, space, type, opcode), name in DALI.REGISTRY.commands():
+            print(f"{length:2} | {space:8} | {type:2} | 0x{opcode:02X} | {name}")
+        return
+
+    # decoders and connections are only loaded once the mode is known
+    from monitor import convert, run
+
+    if output:
+        convert(path, output)
+        return
+
+    if path is None and (start is not None or stop is not None):
+        raise click.UsageError("--from and --to need a capture --file")
+    if ports and overflow == "block":
+        raise click.UsageError("--overflow block can not be used with --port")
+    if stats and output_format != "text":
+        raise click.UsageError("--stats can not be combined with --format")
+    # structured formats keep address and command apart, not in the cache
+    if cache and output_format != "text":
+        raise click.UsageError("--cache can not be combined with --format")
+    if jobs > 1 and path is None:
+        raise click.UsageError("--jobs needs a capture --file")
+    if jobs > 1 and (start is not None or stop is not None):
+        raise click.UsageError("--jobs can not be combined with --from and --to")
+    # these follow the whole bus history, the workers only see their chunk
+    if jobs > 1 and (stats or replies or timing or metrics_port is not None):
+        raise click.UsageError(
+            "--jobs can not be combined with --stats, --replies, --timing or --metrics"
+        )
+    run(
+        hid,
+        echo,
+        absolute,
+        cache,
+        path,
+        jobs,
+        ports,
+        start,
+        stop,
+        output_format,
+        stats,
+        metrics_port,
+        replies,
+        timing,
+        overflow,
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,311 @@
+import logging
+import os
+import sys
+
+import DALI
+import pipeline
+from capture import is_capture
+
+logger = logging.getLogger(__name__)
+
+
+def usb_adapters():
+    # pyusb is only loaded when a USB device is used
+    from connection.hid import DaliUsb
+
+    return DaliUsb.find_all()
+
+
+def report_queues(connections, labels):
+    # dropped frames must not go unnoticed, printed like the other summaries
+    for connection, label in zip(connections, labels):
+        print(
+            f"{label}: {connection.dropped} frames dropped by a full receive queue, "
+            f"at most {connection.high_water} frames were waiting",
+            file=sys.stderr,
+        )
+
+
+def plain_decoder(bus=None):
+    return pipeline.Decoder()
+
+
+def print_summary(bus, lines):
+    # the lines of several buses are told apart by the bus name
+    if bus is not None:
+        lines = [f"{bus}: {line}" for line in lines]
+    print("\n".join(lines), file=sys.stderr)
+
+
+def main_usb(decoder, sink, metrics=None, overflow=None, device=None):
+    # pyusb is only loaded when a USB device is used
+    from connection.hid import DaliUsb
+
+    logger.debug("read from Lunatone usb device")
+    if overflow is None:
+        dali_connection = DaliUsb(device=device)
+    else:
+        dali_connection = DaliUsb(overflow=overflow, device=device)
+    if metrics is not None:
+        metrics.watch(dali_connection)
+    try:
+        frames = pipeline.connection_frames(dali_connection, idle=sink.flush)
+        pipeline.run(frames, decoder, sink)
+    except KeyboardInterrupt:
+        sink.flush()
+        # structured output on stdout must stay parseable
+        print("\rinterrupted", file=sys.stderr if sink.split else sys.stdout)
+    finally:
+        sink.close()
+        dali_connection.close()
+        report_queues([dali_connection], ["usb"])
+
+
+def main_tty(decoder, sink):
+    logger.debug("read from tty device")
+    lines = pipeline.read_tty(sys.stdin, idle=sink.flush)
+    pipeline.run(lines, pipeline.parse, decoder, sink)
+
+
+def main_file(decoder, sink, capture=None):
+    logger.debug("read from file")
+    if capture is None:
+        capture = sys.stdin
+    parser = pipeline.BlockParser()
+    blocks = pipeline.read_blocks(capture.buffer, idle=sink.flush)
+    pipeline.run(blocks, parser, decoder, sink)
+    if parser.malformed:
+        logger.warning(f"{parser.malformed} malformed lines skipped")
+
+
+async def main_async(connections, sink, new_decoder=plain_decoder):
+    # one event loop services all connections, every bus has its own decoder
+    import asyncio
+
+    async def follow(connection):
+        decoder = new_decoder(connection.bus)
+        connection.start_receive()
+        async for frame in connection:
+            sink.write(decoder.decode(frame))
+            if connection.queue.empty():
+                sink.flush()
+
+    try:
+        await asyncio.gather(*(follow(connection) for connection in connections))
+    finally:
+        for connection in connections:
+            connection.close()
+
+
+async def main_merged(
+    connections, sink, new_decoder=plain_decoder, window=pipeline.REORDER_WINDOW
+):
+    # every bus has its own decoder, the records of all buses are merged in
+    # the order of their host time
+    import asyncio
+
+    reorder = pipeline.ReorderWindow(window)
+
+    async def follow(connection):
+        decoder = new_decoder(connection.bus)
+        connection.start_receive()
+        async for frame in connection:
+            reorder.push(connection.host_ns(frame), decoder.decode(frame))
+
+    async def release():
+        while True:
+            await asyncio.sleep(reorder.delay())
+            records = reorder.pop_ready()
+            if records:
+                for record in records:
+                    sink.write(record)
+                sink.flush()
+
+    releaser = asyncio.get_running_loop().create_task(release())
+    try:
+        await asyncio.gather(*(follow(connection) for connection in connections))
+    finally:
+        releaser.cancel()
+        for connection in connections:
+            connection.close()
+        for record in reorder.drain():
+            sink.write(record)
+        if reorder.late:
+            logger.warning(f"{reorder.late} frames arrived after the reorder window")
+
+
+async def main_ports(
+    ports,
+    echo,
+    sink,
+    new_decoder=plain_decoder,
+    metrics=None,
+    adapters=(),
+    overflow=None,
+):
+    from connection.aio import AsyncDaliSerial
+
+    logger.debug(f"read from serial ports {ports}")
+    options = {} if overflow is None else {"overflow": overflow}
+    connections = []
+    labels = []
+    if adapters:
+        from connection.aio import AsyncDaliUsb
+
+        for number, device in enumerate(adapters):
+            connections.append(AsyncDaliUsb(device=device, **options))
+            labels.append(f"usb{number}")
+            logger.info(f"usb{number}: bus {device.bus} address {device.address}")
+    for port in ports:
+        connections.append(AsyncDaliSerial(port, transparent=echo, **options))
+        labels.append(os.path.basename(port))
+    if metrics is not None:
+        for connection in connections:
+            metrics.watch(connection)
+    try:
+        if len(connections) == 1:
+            await main_async(connections, sink, new_decoder)
+            return
+        for connection, label in zip(connections, labels):
+            connection.bus = label
+        await main_merged(connections, sink, new_decoder)
+    finally:
+        report_queues(connections, labels)
+
+
+def main_capture(decoder, sink, path):
+    logger.debug("read from binary capture")
+    pipeline.run(pipeline.read_capture(path), decoder, sink)
+
+
+def main_range(decoder, sink, path, start=None, stop=None):
+    # seeks to the last checkpoint before start, the frames up to start are
+    # decoded for their context only
+    from capture import frames_from, index_for
+
+    logger.debug(f"read {path} from {start} to {stop}")
+    index = index_for(path)
+    checkpoint = index.locate(round(start * 1000) if start is not None else 0)
+    if checkpoint is None:
+        return
+    decoder.last_timestamp = checkpoint.last_timestamp / 1000.0
+    decoder.device_type = checkpoint.device_type
+    for frame in frames_from(path, index, checkpoint):
+        if stop is not None and frame.timestamp > stop:
+            break
+        record = decoder.decode(frame)
+        if start is None or frame.timestamp >= start:
+            sink.write(record)
+    sink.flush()
+
+
+def convert(path, output):
+    import capture
+
+    if path is not None:
+        with open(path, "rb") as stream:
+            count, malformed = capture.convert(stream, output)
+    else:
+        count, malformed = capture.convert(sys.stdin.buffer, output)
+    logger.info(f"{count} frames written to {output}, {malformed} malformed lines")
+
+
+def run(
+    hid,
+    echo,
+    absolute,
+    cache,
+    path=None,
+    jobs=1,
+    ports=(),
+    start=None,
+    stop=None,
+    output_format="text",
+    stats=False,
+    metrics_port=None,
+    replies=False,
+    timing=False,
+    overflow=None,
+):
+    cache = DALI.DecodeCache(cache) if cache else None
+    adapters = usb_adapters() if hid else []
+    # frames of several buses are tagged with their bus
+    buses = len(adapters) + len(ports) > 1
+    if stats:
+        sink = pipeline.StatsSink()
+    else:
+        sink = pipeline.make_sink(output_format, absolute, buses=buses)
+    metrics = server = None
+    if metrics_port is not None:
+        from pipeline.metrics import Metrics, serve_metrics
+
+        metrics = Metrics()
+        server = serve_metrics(metrics, metrics_port)
+
+    # (bus, correlator) and (bus, timing analyzer) of every bus
+    correlators = []
+    analyzers = []
+
+    def new_decoder(bus=None):
+        annotators = []
+        if replies:
+            correlators.append((bus, pipeline.QueryCorrelator()))
+            annotators.append(correlators[-1][1])
+        if timing:
+            analyzers.append((bus, pipeline.TimingAnalyzer()))
+            annotators.append(analyzers[-1][1])
+        if metrics is not None:
+            return metrics.decoder(cache, split=sink.split, annotators=annotators)
+        return pipeline.Decoder(cache, split=sink.split, annotators=annotators)
+
+    # several buses are decoded by main_ports, one decoder per bus
+    decoder = None if (buses if hid else ports) else new_decoder()
+    # the workers of --jobs decode plain frames, these need the whole file
+    sequential = stats or replies or timing or metrics is not None
+    try:
+        if hid and not buses:
+            # a single adapter is read by its own thread
+            device = adapters[0] if adapters else None
+            main_usb(decoder, sink, metrics, overflow, device)
+        elif hid or ports:
+            # asyncio and ssl with it are only loaded for the event loop
+            import asyncio
+
+            asyncio.run(
+                main_ports(ports, echo, sink, new_decoder, metrics, adapters, overflow)
+            )
+        elif path is not None and (start is not None or stop is not None):
+            if jobs > 1:
+                logger.warning("a time range is decoded in one process")
+            main_range(decoder, sink, path, start, stop)
+        elif path is not None and is_capture(path):
+            if jobs > 1:
+                logger.warning("binary captures are decoded in one process")
+            main_capture(decoder, sink, path)
+        elif path is not None and jobs > 1 and not sequential:
+            from parallel import main_parallel
+
+            main_parallel(path, jobs, decoder, sink)
+        elif path is not None:
+            with open(path) as capture:
+                main_file(decoder, sink, capture)
+        elif sys.stdin.isatty():
+            main_tty(decoder, sink)
+        else:
+            main_file(decoder, sink)
+    except KeyboardInterrupt:
+        sink.flush()
+        # structured output on stdout must stay parseable
+        print("\rinterrupted", file=sys.stderr if sink.split else sys.stdout)
+    finally:
+        sink.close()
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+    for bus, correlator in correlators:
+        correlator.finish()
+        print_summary(bus, correlator.summary())
+    for bus, analyzer in analyzers:
+        print_summary(bus, analyzer.summary())
+    if cache is not None:
+        print(cache, file=sys.stderr)
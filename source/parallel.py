@@ -0,0 +1,116 @@
+import io
+import logging
+import os
+from collections import deque
+from multiprocessing import Pool
+
+import DALI
+from connection.serial import DaliSerial
+from pipeline import Decoder, is_decoded, make_sink
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 16 * 1024 * 1024
+# chunks decoded ahead of the output, per process
+CHUNKS_AHEAD = 2
+
+
+def chunk_offsets(path, chunk_size=CHUNK_SIZE):
+    # (start, end) byte offsets, every chunk ends on a line boundary
+    size = os.path.getsize(path)
+    offsets = []
+    start = 0
+    with open(path, "rb") as capture:
+        while start < size:
+            capture.seek(min(start + chunk_size, size))
+            capture.readline()
+            end = capture.tell()
+            offsets.append((start, end))
+            start = end
+    return offsets
+
+
+def init_worker(cache_size, output_format, colour):
+    init_worker.cache = DALI.DecodeCache(cache_size) if cache_size else None
+    # only renders, the main process writes to the real output and adds the
+    # local time
+    init_worker.sink = make_sink(output_format, stream=io.StringIO(), colour=colour)
+
+
+def cache_counts(cache):
+    # hits, misses and evictions
+    if cache is None:
+        return 0, 0, 0
+    return cache.hits, cache.misses, cache.evictions
+
+
+def decode_chunk(path, start, end):
+    # Frames up to and including the first decoded one depend on the device
+    # type and timestamp left by the previous chunk. They are returned as
+    # parsed frames and decoded in order by the main process, everything
+    # after them is decoded and formatted here.
+    sink = init_worker.sink
+    decoder = Decoder(init_worker.cache, split=sink.split)
+    head = []
+    with open(path, "rb") as capture:
+        capture.seek(start)
+        data = capture.read(end - start)
+    parsed = DaliSerial.parse_buffer(data)
+    frames = parsed.frames()
+    body = sink.render(())
+    last_timestamp = device_type = None
+    # cache lookups of the body, the main process counts those of the head
+    lookups = (0, 0, 0)
+    for frame in frames:
+        head.append(frame)
+        if is_decoded(frame):
+            decoder.decode(frame)
+            before = cache_counts(init_worker.cache)
+            body = sink.render(decoder(frames))
+            after = cache_counts(init_worker.cache)
+            lookups = tuple(count - first for count, first in zip(after, before))
+            last_timestamp, device_type = decoder.last_timestamp, decoder.device_type
+            break
+    return head, body, last_timestamp, device_type, parsed.malformed, lookups
+
+
+def main_parallel(path, jobs, decoder, sink, chunk_size=CHUNK_SIZE):
+    logger.debug(f"decode {path} with {jobs} processes")
+    cache_size = decoder.cache.capacity if decoder.cache is not None else 0
+    malformed = 0
+
+    def emit(result):
+        nonlocal malformed
+        head, body, last_timestamp, device_type, chunk_malformed, lookups = result
+        malformed += chunk_malformed
+        cache = decoder.cache
+        if cache is not None:
+            cache.hits += lookups[0]
+            cache.misses += lookups[1]
+            cache.evictions += lookups[2]
+        sink.write_batch(decoder.decode_batch(head))
+        sink.write_rendered(body)
+        if device_type is not None:
+            decoder.last_timestamp = last_timestamp
+            decoder.device_type = device_type
+
+    with Pool(
+        jobs,
+        initializer=init_worker,
+        initargs=(
+            cache_size,
+            sink.output_format,
+            getattr(sink, "colour", False),
+        ),
+    ) as pool:
+        pending = deque()
+        for start, end in chunk_offsets(path, chunk_size):
+            pending.append(pool.apply_async(decode_chunk, (path, start, end)))
+            # bounds memory, chunks are emitted in file order
+            if len(pending) >= jobs * CHUNKS_AHEAD:
+                emit(pending.popleft().get())
+        while pending:
+            emit(pending.popleft().get())
+    sink.flush()
+    if malformed:
+        logger.warning(f"{malformed} malformed lines skipped")
@@ -0,0 +1,64 @@
+from .correlate import QueryCorrelator, Reply
+from .decode import DecodedFrame, Decoder, is_decoded
+from .merge import REORDER_WINDOW, ReorderWindow
+from .sink import OUTPUT_FORMATS, CallbackSink, LineSink, TextSink, make_sink
+from .source import (
+    BlockParser,
+    connection_frames,
+    parse,
+    read_blocks,
+    read_capture,
+    read_file,
+    read_lines,
+    read_tty,
+)
+from .stage import Tally, batched, commands, errors, flatten, select
+from .state import BusState, DeviceState, GearState
+from .stats import BusStats, StatsSink, StatsSnapshot
+from .timing import TimingAnalyzer, Violation
+
+__all__ = [
+    "OUTPUT_FORMATS",
+    "REORDER_WINDOW",
+    "BlockParser",
+    "BusState",
+    "BusStats",
+    "CallbackSink",
+    "DecodedFrame",
+    "Decoder",
+    "DeviceState",
+    "GearState",
+    "LineSink",
+    "QueryCorrelator",
+    "ReorderWindow",
+    "Reply",
+    "StatsSink",
+    "StatsSnapshot",
+    "Tally",
+    "TextSink",
+    "TimingAnalyzer",
+    "Violation",
+    "batched",
+    "commands",
+    "connection_frames",
+    "errors",
+    "flatten",
+    "is_decoded",
+    "make_sink",
+    "parse",
+    "read_blocks",
+    "read_capture",
+    "read_file",
+    "read_lines",
+    "read_tty",
+    "run",
+    "select",
+]
+
+
+def run(source, *stages):
+    # source -> stage -> ... -> sink, the last stage consumes the stream
+    stream = source
+    for stage in stages:
+        stream = stage(stream)
+    return stream
@@ -0,0 +1,205 @@
+from collections import Counter
+from typing import NamedTuple
+
+import DALI
+
+from .decode import DecodedFrame
+from .stats import Histogram, address_label, frame_fields, is_query
+
+# iec 62386-101 backward frame settling time is at most 10.5 ms, plus the
+# 8 bit frame itself and the millisecond resolution of the adapter timestamps
+REPLY_TIMEOUT = 0.025
+
+# upper bounds of the reply latency buckets in seconds
+REPLY_BUCKETS = (0.004, 0.006, 0.008, 0.01, 0.0125, 0.015, 0.02, 0.025)
+
+# queries answered by YES (0xFF) or not at all for NO
+YES_NO_QUERIES = frozenset(
+    (
+        "QUERY CONTROL GEAR PRESENT",
+        "QUERY LAMP FAILURE",
+        "QUERY LAMP POWER ON",
+        "QUERY LIMIT ERROR",
+        "QUERY RESET STATE",
+        "QUERY MISSING SHORT ADDRESS",
+        "QUERY POWER FAILURE",
+        "QUERY CONTROL GEAR FAILURE",
+        "QUERY INPUT DEVICE ERROR",
+        "QUERY APPLICATION CONTROLLER ENABLED",
+        "QUERY APPLICATION CONTROLLER ALWAYS ACTIVE",
+        "QUERY POWER CYCLE NOTIFICATION",
+        "COMPARE",
+        "VERIFY SHORT ADDRESS",
+    )
+)
+
+LEVEL_QUERIES = frozenset(
+    (
+        "QUERY ACTUAL LEVEL",
+        "QUERY MAX LEVEL",
+        "QUERY MIN LEVEL",
+        "QUERY POWER ON LEVEL",
+        "QUERY SYSTEM FAILURE LEVEL",
+        "QUERY PHYSICAL MINIMUM",
+    )
+)
+
+# iec 62386-102 11.2 and 62386-103 11.2, bit 0 first
+STATUS_BITS = {
+    "QUERY STATUS": (
+        "control gear failure",
+        "lamp failure",
+        "lamp on",
+        "limit error",
+        "fade running",
+        "reset state",
+        "short address missing",
+        "power cycle seen",
+    ),
+    "QUERY DEVICE STATUS": (
+        "input device error",
+        "quiescent mode",
+        "short address missing",
+        "application active",
+        "application controller error",
+        "power cycle seen",
+        "reset state",
+    ),
+}
+
+GROUP_QUERIES = {
+    "QUERY GROUPS 0-7": 0,
+    "QUERY GROUPS 8-15": 8,
+    "QUERY DEVICE GROUPS 0-7": 0,
+    "QUERY DEVICE GROUPS 8-15": 8,
+    "QUERY DEVICE GROUPS 16-23": 16,
+    "QUERY DEVICE GROUPS 24-31": 24,
+}
+
+
+def answer_meaning(name, value):
+    # the answer of a query as text, None is no answer
+    if value is None:
+        return "NO" if name in YES_NO_QUERIES else "NO REPLY"
+    if name in YES_NO_QUERIES:
+        return "YES" if value == 0xFF else f"INVALID 0x{value:02X}"
+    if name in LEVEL_QUERIES or name.startswith("QUERY SCENE LEVEL"):
+        return "MASK" if value == 0xFF else f"LEVEL {value}"
+    if name in STATUS_BITS:
+        bits = STATUS_BITS[name]
+        names = [bit for position, bit in enumerate(bits) if value >> position & 1]
+        return ", ".join(names) if names else "OK"
+    if name in GROUP_QUERIES:
+        offset = GROUP_QUERIES[name]
+        groups = [str(offset + bit) for bit in range(8) if value >> bit & 1]
+        return f"GROUPS {','.join(groups)}" if groups else "NO GROUPS"
+    if name == "QUERY FADE TIME / FADE RATE":
+        return f"FADE TIME {value >> 4}, FADE RATE {value & 0x0F}"
+    if name == "QUERY DEVICE TYPE":
+        return "SEVERAL DEVICE TYPES" if value == 0xFF else f"DEVICE TYPE {value}"
+    if name in ("QUERY VERSION NUMBER", "QUERY EXTENDED VERSION NUMBER (DTR0)"):
+        return f"VERSION {value >> 2}.{value & 0x03}"
+    return str(value)
+
+
+class Reply(NamedTuple):
+    query: DecodedFrame
+    address: str
+    command: str
+    # the backframe, an error frame for a garbled answer, None without answer
+    answer: DecodedFrame | None
+    latency: float | None
+    meaning: str
+
+
+class QueryCorrelator:
+    # Pairs forward queries with the backframe that follows within
+    # REPLY_TIMEOUT. Answers are annotated with the query and its meaning.
+
+    def __init__(self, timeout=REPLY_TIMEOUT, on_reply=None, buckets=REPLY_BUCKETS):
+        self.timeout = timeout
+        self.on_reply = on_reply
+        self.buckets = buckets
+        # (address label, query name) -> Histogram of the reply latency
+        self.latency = {}
+        self.no_reply = Counter()
+        self.garbled = Counter()
+        # (record, address label, name) of the query waiting for its answer
+        self.pending = None
+
+    def reply(self, query, address, name, answer, latency, meaning):
+        key = (address, name)
+        if answer is None:
+            self.no_reply[key] += 1
+        elif answer.is_error:
+            self.garbled[key] += 1
+        else:
+            histogram = self.latency.get(key)
+            if histogram is None:
+                histogram = self.latency[key] = Histogram(self.buckets)
+            histogram.observe(latency)
+        reply = Reply(query, address, name, answer, latency, meaning)
+        if self.on_reply is not None:
+            self.on_reply(reply)
+        return reply
+
+    def annotate(self, record):
+        frame = record.frame
+        pending, self.pending = self.pending, None
+        if pending is not None:
+            query, address, name = pending
+            latency = frame.timestamp - query.frame.timestamp
+            if latency > self.timeout or (not record.is_error and frame.length != 8):
+                self.reply(query, address, name, None, None, answer_meaning(name, None))
+            elif record.is_error:
+                self.reply(query, address, name, record, latency, "GARBLED")
+                return record
+            else:
+                meaning = answer_meaning(name, frame.data)
+                self.reply(query, address, name, record, latency, meaning)
+                note = f" <- {address} {name}: {meaning}"
+                if record.command is not None:
+                    return record._replace(
+                        command_string=record.command_string + note,
+                        command=record.command + note,
+                    )
+                return record._replace(command_string=record.command_string + note)
+        if record.is_error or frame.length == 8:
+            return record
+        fields = frame_fields(frame.length, frame.data, record.device_type)
+        if is_query(fields.mnemonic):
+            self.pending = (
+                record,
+                address_label(fields.address_kind, fields.address),
+                DALI.MNEMONICS.name(fields.mnemonic),
+            )
+        return record
+
+    def finish(self):
+        # the last query of a capture never got an answer
+        if self.pending is not None:
+            query, address, name = self.pending
+            self.pending = None
+            self.reply(query, address, name, None, None, answer_meaning(name, None))
+
+    def summary(self):
+        # lines of replies, missing replies and mean latency per address and query
+        keys = set(self.latency) | set(self.no_reply) | set(self.garbled)
+        lines = []
+        for address, name in sorted(keys):
+            histogram = self.latency.get((address, name))
+            answered = histogram.count if histogram is not None else 0
+            line = (
+                f"{address:10} {name:40} {answered:6} replies "
+                f"{self.no_reply[(address, name)]:6} none "
+                f"{self.garbled[(address, name)]:6} garbled"
+            )
+            if answered:
+                line += f"  mean {histogram.sum / answered * 1000:5.1f} ms"
+            lines.append(line)
+        return lines
+
+    def __call__(self, records):
+        for record in records:
+            yield self.annotate(record)
+        self.finish()
@@ -0,0 +1,97 @@
+from typing import NamedTuple
+
+import DALI
+from connection.frame import DaliFrame
+from connection.status import DaliStatus
+
+
+class DecodedFrame(NamedTuple):
+    frame: DaliFrame
+    # seconds since the previous frame, 0 for the first one
+    delta: float
+    # device type the frame was decoded with
+    device_type: int
+    # None for frames with an error status
+    data_string: str | None = None
+    command_string: str | None = None
+    # only set by a Decoder with split=True
+    address: str | None = None
+    command: str | None = None
+
+    @property
+    def is_error(self):
+        return self.data_string is None
+
+
+def is_decoded(frame):
+    return frame.status.status in (DaliStatus.OK, DaliStatus.FRAME, DaliStatus.LOOPBACK)
+
+
+class Decoder:
+    # keeps the decoder context between frames and batches
+
+    def __init__(
+        self,
+        cache=None,
+        last_timestamp=0,
+        device_type=DALI.DeviceType.NONE,
+        split=False,
+        annotators=(),
+    ):
+        # split keeps address and command apart, the cache is not used then
+        self.cache = cache
+        self.split = split
+        # per bus stages with annotate(record) returning the record passed on
+        self.annotators = annotators
+        self.last_timestamp = last_timestamp
+        self.device_type = device_type
+
+    def decode(self, frame):
+        record = self.decode_frame(frame)
+        for annotator in self.annotators:
+            record = annotator.annotate(record)
+        return record
+
+    def decode_frame(self, frame):
+        if self.last_timestamp != 0:
+            delta = frame.timestamp - self.last_timestamp
+        else:
+            delta = 0
+        self.last_timestamp = frame.timestamp
+        device_type = self.device_type
+        if not is_decoded(frame):
+            return DecodedFrame(frame, delta, device_type)
+        if self.split:
+            dali_command = DALI.Decode(frame.length, frame.data, device_type)
+            address, command = dali_command.parts()
+            self.device_type = dali_command.get_next_device_type()
+            return DecodedFrame(
+                frame,
+                delta,
+                device_type,
+                str(dali_command),
+                address + command,
+                address.strip(),
+                command.strip(),
+            )
+        if self.cache is not None:
+            data_string, command_string, self.device_type = self.cache.decode(
+                frame.length, frame.data, device_type
+            )
+        else:
+            dali_command = DALI.Decode(frame.length, frame.data, device_type)
+            data_string = str(dali_command)
+            command_string = dali_command.cmd()
+            self.device_type = dali_command.get_next_device_type()
+        return DecodedFrame(frame, delta, device_type, data_string, command_string)
+
+    def decode_batch(self, frames):
+        return [self.decode(frame) for frame in frames]
+
+    def __call__(self, frames):
+        for frame in frames:
+            yield self.decode(frame)
+
+    def batches(self, batches):
+        for frames in batches:
+            yield self.decode_batch(frames)
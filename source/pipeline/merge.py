@@ -0,0 +1,59 @@
+import heapq
+from time import monotonic_ns
+
+# records of several buses are held this long to be sorted by time
+REORDER_WINDOW = 0.05
+
+
+class ReorderWindow:
+    # Merges the records of several buses in the order of their host time in
+    # ns. A record is released once it is older than the window. A record
+    # older than one already released is late, it is released on the next
+    # call and counted.
+
+    def __init__(self, window=REORDER_WINDOW, clock=monotonic_ns):
+        self.window_ns = round(window * 1e9)
+        self.clock = clock
+        # (host time, arrival, record), arrival keeps the order of equal times
+        self.heap = []
+        self.arrival = 0
+        self.released_ns = None
+        self.late = 0
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push(self, host_ns, record):
+        if self.released_ns is not None and host_ns < self.released_ns:
+            self.late += 1
+        heapq.heappush(self.heap, (host_ns, self.arrival, record))
+        self.arrival += 1
+
+    def pop_ready(self, now=None):
+        # records older than the window, oldest first
+        if now is None:
+            now = self.clock()
+        limit = now - self.window_ns
+        heap = self.heap
+        records = []
+        while heap and heap[0][0] <= limit:
+            host_ns, _, record = heapq.heappop(heap)
+            records.append(record)
+            if self.released_ns is None or host_ns > self.released_ns:
+                self.released_ns = host_ns
+        return records
+
+    def drain(self):
+        # all records, at the end of the input
+        records = []
+        while self.heap:
+            records.append(heapq.heappop(self.heap)[2])
+        return records
+
+    def delay(self, now=None):
+        # seconds until the oldest record is due, the window if there is none
+        if not self.heap:
+            return self.window_ns / 1e9
+        if now is None:
+            now = self.clock()
+        return max(self.heap[0][0] + self.window_ns - now, 0) / 1e9
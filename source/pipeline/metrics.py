@@ -0,0 +1,176 @@
+import logging
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import perf_counter
+
+from connection.status import DaliStatus
+
+from .decode import Decoder
+from .stats import Histogram, address_label, classify
+
+logger = logging.getLogger(__name__)
+
+# bound to localhost only, the exporter is scraped by a local agent
+METRICS_HOST = "127.0.0.1"
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# upper bounds of the decode latency buckets in seconds
+LATENCY_BUCKETS = (1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 1e-2)
+
+ERROR_KINDS = {
+    DaliStatus.TIMEOUT: "timeout",
+    DaliStatus.TIMING: "timing",
+    DaliStatus.INTERFACE: "interface",
+    DaliStatus.FAILURE: "system_failure",
+    DaliStatus.GENERAL: "general",
+    DaliStatus.UNDEFINED: "undefined",
+}
+COLLISION_MESSAGE = "ERROR: COLLISION DETECTED"
+
+
+def error_kind(status):
+    if status.message == COLLISION_MESSAGE:
+        return "collision"
+    return ERROR_KINDS.get(status.status, "other")
+
+
+def queue_depth(connection):
+    # neither the ring buffer nor asyncio.Queue take a lock for the size
+    return connection.queue.qsize()
+
+
+class Metrics:
+    # Updated by the thread consuming the decoded frames, read by the HTTP
+    # thread. Counters are only copied on a scrape, nothing takes a lock.
+
+    def __init__(self):
+        self.frames = Counter()
+        self.errors = Counter()
+        self.decode_latency = Histogram(LATENCY_BUCKETS)
+        self.connections = []
+
+    def watch(self, connection):
+        # exposes the receive queue depth, high water mark and drops
+        self.connections.append(connection)
+
+    def observe(self, record, seconds):
+        frame = record.frame
+        self.decode_latency.observe(seconds)
+        if record.is_error:
+            self.errors[error_kind(frame.status)] += 1
+            return
+        address_kind, address, _ = classify(
+            frame.length, frame.data, record.device_type
+        )
+        self.frames[(frame.length, address_kind, address)] += 1
+
+    def decoder(self, *args, **kwargs):
+        return MeteredDecoder(self, *args, **kwargs)
+
+    def exposition(self):
+        # OpenMetrics text format
+        lines = ["# TYPE dali_frames counter", "# HELP dali_frames Decoded frames."]
+        for (length, address_kind, address), count in sorted(dict(self.frames).items()):
+            label = address_label(address_kind, address)
+            lines.append(
+                f'dali_frames_total{{length="{length}",address="{label}"}} {count}'
+            )
+        lines += ["# TYPE dali_errors counter", "# HELP dali_errors Frame errors."]
+        for kind, count in sorted(dict(self.errors).items()):
+            lines.append(f'dali_errors_total{{kind="{kind}"}} {count}')
+        lines += [
+            "# TYPE dali_queue_depth gauge",
+            "# HELP dali_queue_depth Frames waiting in the receive queue.",
+        ]
+        for number, connection in enumerate(self.connections):
+            lines.append(
+                f'dali_queue_depth{{connection="{number}"}} {queue_depth(connection)}'
+            )
+        lines += [
+            "# TYPE dali_queue_high_water gauge",
+            "# HELP dali_queue_high_water Most frames ever waiting in the receive queue.",
+        ]
+        for number, connection in enumerate(self.connections):
+            high_water = getattr(connection, "high_water", 0)
+            lines.append(f'dali_queue_high_water{{connection="{number}"}} {high_water}')
+        lines += [
+            "# TYPE dali_queue_dropped counter",
+            "# HELP dali_queue_dropped Frames dropped by a full receive queue.",
+        ]
+        for number, connection in enumerate(self.connections):
+            dropped = getattr(connection, "dropped", 0)
+            lines.append(f'dali_queue_dropped_total{{connection="{number}"}} {dropped}')
+        # only adapters with their own clock have an estimate
+        clocks = [
+            (number, connection.timeline.estimator)
+            for number, connection in enumerate(self.connections)
+            if getattr(connection, "timeline", None) is not None
+            and connection.timeline.estimator.ready
+        ]
+        lines += [
+            "# TYPE dali_clock_offset_seconds gauge",
+            "# HELP dali_clock_offset_seconds Host minus adapter clock.",
+        ]
+        for number, estimator in clocks:
+            offset = estimator.offset(estimator.latest) / 1e9
+            lines.append(
+                f'dali_clock_offset_seconds{{connection="{number}"}} {offset:.6f}'
+            )
+        lines += [
+            "# TYPE dali_clock_drift_ppm gauge",
+            "# HELP dali_clock_drift_ppm Drift of the adapter clock against the host.",
+        ]
+        for number, estimator in clocks:
+            lines.append(
+                f'dali_clock_drift_ppm{{connection="{number}"}} '
+                f"{estimator.drift_ppm:.3f}"
+            )
+        lines += [
+            "# TYPE dali_decode_seconds histogram",
+            "# HELP dali_decode_seconds Time to decode a frame.",
+            *self.decode_latency.samples("dali_decode_seconds"),
+            "# EOF",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+class MeteredDecoder(Decoder):
+    def __init__(self, metrics, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = metrics
+
+    def decode(self, frame):
+        start = perf_counter()
+        record = super().decode(frame)
+        self.metrics.observe(record, perf_counter() - start)
+        return record
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.server.metrics.exposition().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+
+def serve_metrics(metrics, port, host=METRICS_HOST):
+    # serves /metrics from a daemon thread, shutdown() stops it
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    server.metrics = metrics
+    thread = threading.Thread(
+        target=server.serve_forever, name="dali-metrics", daemon=True
+    )
+    thread.start()
+    logger.info(f"metrics on http://{host}:{server.server_port}/metrics")
+    return server
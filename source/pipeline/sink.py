@@ -0,0 +1,195 @@
+import os
+import sys
+import time
+from datetime import datetime
+
+# flush when this many characters are pending, or the oldest is this old
+BUFFER_SIZE = 64 * 1024
+FLUSH_DELAY = 0.1
+
+RESET = "\033[0m"
+GREEN = "\033[32m"
+YELLOW = "\033[33m"
+RED = "\033[31m"
+WHITE = "\033[97m"
+
+
+def use_colour(stream):
+    # same rules as termcolor
+    if os.environ.get("ANSI_COLORS_DISABLED") or os.environ.get("NO_COLOR"):
+        return False
+    if os.environ.get("FORCE_COLOR"):
+        return True
+    if os.environ.get("TERM") == "dumb":
+        return False
+    try:
+        return os.isatty(stream.fileno())
+    except (AttributeError, OSError, ValueError):
+        return False
+
+
+class LineTemplates:
+    # str.format of the whole output line, colour codes are part of the template
+
+    def __init__(self, colour):
+        if colour:
+            green, yellow, red, white, reset = GREEN, YELLOW, RED, WHITE, RESET
+        else:
+            green = yellow = red = white = reset = ""
+        self.local_time = f"{yellow}{{}} | {reset}".format
+        self.bus = f"{yellow}{{:8}} | {reset}".format
+        self.command = (
+            f"{green}{{:.03f}} | {{:8.03f}} | {{}} | {reset}{white}{{}}{reset}\n"
+        ).format
+        self.error = f"{green}{{:.03f}} | {{:8.03f}} | {reset}{red}{{}}{reset}\n".format
+
+
+class BufferedOutput:
+    def __init__(self, stream, size=BUFFER_SIZE, delay=FLUSH_DELAY):
+        self.stream = stream
+        self.size = size
+        self.delay = delay
+        self.parts = []
+        self.pending = 0
+        self.since = None
+
+    def write(self, text):
+        self.parts.append(text)
+        self.pending += len(text)
+        if self.pending >= self.size:
+            self.flush()
+        elif self.since is None:
+            self.since = time.monotonic()
+        elif time.monotonic() - self.since >= self.delay:
+            self.flush()
+
+    def flush(self):
+        if self.parts:
+            self.stream.write("".join(self.parts))
+            self.parts.clear()
+            self.pending = 0
+            self.since = None
+        self.stream.flush()
+
+
+class LineSink:
+    # sinks writing one line of text per record through a BufferedOutput
+    split = False
+
+    def write(self, record):
+        self.output.write(self.format(record))
+
+    def write_batch(self, records):
+        self.output.write(self.render(records))
+
+    def write_text(self, text):
+        # already formatted lines
+        self.output.write(text)
+
+    # the parallel decoder renders in the workers and writes in the main process
+    def render(self, records):
+        return "".join(self.format(record) for record in records)
+
+    def write_rendered(self, text):
+        self.output.write(text)
+
+    def flush(self):
+        self.output.flush()
+
+    def close(self):
+        self.flush()
+
+    def __call__(self, records):
+        for record in records:
+            self.write(record)
+        self.close()
+
+
+class TextSink(LineSink):
+    # the dali_mon console output, flush() when the input goes idle
+    output_format = "text"
+
+    def __init__(
+        self,
+        absolute_time=False,
+        stream=None,
+        colour=None,
+        size=BUFFER_SIZE,
+        delay=FLUSH_DELAY,
+        buses=False,
+    ):
+        self.absolute_time = absolute_time
+        # prefix every line with the bus of the frame
+        self.buses = buses
+        self.stream = stream if stream is not None else sys.stdout
+        self.colour = use_colour(self.stream) if colour is None else colour
+        self.templates = LineTemplates(self.colour)
+        self.output = BufferedOutput(self.stream, size, delay)
+        self.local_second = None
+        self.local_prefix = ""
+
+    def local_time(self):
+        # formatted once per second
+        second = int(time.time())
+        if second != self.local_second:
+            self.local_second = second
+            time_string = datetime.fromtimestamp(second).strftime("%H:%M:%S")
+            self.local_prefix = self.templates.local_time(time_string)
+        return self.local_prefix
+
+    def format(self, record):
+        frame = record.frame
+        if record.is_error:
+            line = self.templates.error(
+                frame.timestamp, record.delta, frame.status.message
+            )
+        else:
+            line = self.templates.command(
+                frame.timestamp,
+                record.delta,
+                record.data_string,
+                record.command_string,
+            )
+        if self.buses:
+            line = self.templates.bus(frame.bus) + line
+        if self.absolute_time:
+            return self.local_time() + line
+        return line
+
+    def write_rendered(self, text):
+        # lines rendered by the parallel decoder get the local time of their
+        # output here, not the time a worker rendered them
+        if self.absolute_time:
+            prefix = self.local_time()
+            text = "".join(prefix + line for line in text.splitlines(keepends=True))
+        self.output.write(text)
+
+
+class CallbackSink:
+    def __init__(self, callback):
+        self.callback = callback
+
+    def __call__(self, records):
+        for record in records:
+            self.callback(record)
+
+
+OUTPUT_FORMATS = ("text", "jsonl", "csv", "arrow")
+
+
+def make_sink(
+    output_format="text", absolute_time=False, stream=None, colour=None, buses=False
+):
+    # buses adds the bus of the frame to every line or row
+    if output_format == "text":
+        return TextSink(absolute_time, stream, colour, buses=buses)
+    # structured sinks, pyarrow is only needed for arrow
+    from . import structured
+
+    if output_format == "jsonl":
+        return structured.JsonLinesSink(stream, buses=buses)
+    if output_format == "csv":
+        return structured.CsvSink(stream, buses=buses)
+    if output_format == "arrow":
+        return structured.ArrowSink(stream, buses=buses)
+    raise ValueError(f"unknown output format {output_format}")
@@ -0,0 +1,97 @@
+import sys
+
+from connection.serial import DaliSerial
+
+BLOCK_SIZE = 1024 * 1024
+
+
+def read_lines(stream=sys.stdin):
+    # ends with the stream
+    for line in stream:
+        line = line.strip(" \r\n")
+        if len(line) > 0:
+            yield line
+
+
+def read_tty(stream=sys.stdin, idle=None):
+    # a tty may return partial lines, keeps reading after end of input
+    line = ""
+    while True:
+        if idle is not None:
+            idle()
+        line = line + stream.readline()
+        if len(line) > 0 and line[-1] == "\n":
+            line = line.strip(" \r\n")
+            if len(line) > 0:
+                yield line
+            line = ""
+
+
+def read_file(path):
+    with open(path) as capture:
+        yield from read_lines(capture)
+
+
+def read_capture(path):
+    # frames from a binary capture, parse is not needed
+    from capture import CaptureReader
+
+    with CaptureReader(path) as reader:
+        yield from reader
+
+
+def read_blocks(stream=None, size=BLOCK_SIZE, idle=None):
+    # blocks of whole lines from a binary stream, read1 returns what is
+    # available so live input is not held back
+    if stream is None:
+        stream = sys.stdin.buffer
+    rest = b""
+    drained = False
+    while True:
+        # idle is called before a read that may block
+        if drained and idle is not None:
+            idle()
+        block = stream.read1(size)
+        if not block:
+            break
+        drained = len(block) < size
+        block = rest + block
+        end = block.rfind(b"\n") + 1
+        rest = block[end:]
+        if end > 0:
+            yield block[:end]
+    if rest:
+        yield rest
+
+
+class BlockParser:
+    # frames from blocks of lines, counts the lines without a frame
+
+    def __init__(self):
+        self.malformed = 0
+
+    def __call__(self, blocks):
+        for block in blocks:
+            parsed = DaliSerial.parse_buffer(block)
+            self.malformed += parsed.malformed
+            yield from parsed.frames()
+
+
+def parse(lines):
+    # lines that are not a valid frame are dropped
+    for line in lines:
+        if isinstance(line, str):
+            line = line.encode("utf-8")
+        frame = DaliSerial.parse(line)
+        if frame is not None:
+            yield frame
+
+
+def connection_frames(connection, timeout=None, idle=None):
+    # DaliSerial or DaliUsb, a timeout yields a TIMEOUT status frame
+    connection.start_receive()
+    while True:
+        if idle is not None and connection.queue.empty():
+            idle()
+        connection.get_next(timeout)
+        yield connection.rx_frame
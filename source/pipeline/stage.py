@@ -0,0 +1,41 @@
+from collections import Counter
+from itertools import islice
+
+
+def select(records, predicate):
+    return (record for record in records if predicate(record))
+
+
+def errors(records):
+    return select(records, lambda record: record.is_error)
+
+
+def commands(records):
+    return select(records, lambda record: not record.is_error)
+
+
+def batched(items, size):
+    # lists of up to size items, the last one may be shorter
+    items = iter(items)
+    while batch := list(islice(items, size)):
+        yield batch
+
+
+def flatten(batches):
+    for batch in batches:
+        yield from batch
+
+
+class Tally:
+    # passes records through and counts them by command or error message
+
+    def __init__(self):
+        self.counts = Counter()
+
+    def __call__(self, records):
+        for record in records:
+            if record.is_error:
+                self.counts[record.frame.status.message] += 1
+            else:
+                self.counts[record.command_string.strip()] += 1
+            yield record
@@ -0,0 +1,371 @@
+from copy import copy
+
+import DALI
+
+from .stats import frame_fields
+
+# value of scene levels and DAPC that leaves the level unchanged
+MASK = 0xFF
+
+# iec 62386-102 - control gear opcodes
+OFF = 0x00
+RECALL_MAX_LEVEL = 0x05
+RECALL_MIN_LEVEL = 0x06
+GO_TO_SCENE = range(0x10, 0x20)
+RESET = 0x20
+SET_SCENE = range(0x40, 0x50)
+REMOVE_FROM_SCENE = range(0x50, 0x60)
+ADD_TO_GROUP = range(0x60, 0x70)
+REMOVE_FROM_GROUP = range(0x70, 0x80)
+SET_SHORT_ADDRESS = 0x80
+QUERY_SCENE_LEVEL = range(0xB0, 0xC0)
+# UP, DOWN, STEP UP, STEP DOWN, ON AND STEP UP, STEP DOWN AND OFF, GO TO LAST
+# ACTIVE LEVEL, the resulting level is not known from the frame
+RELATIVE_LEVEL = (0x01, 0x02, 0x03, 0x04, 0x07, 0x08, 0x0A)
+
+# configuration commands storing DTR0 in an attribute
+GEAR_STORE_DTR0 = {
+    0x2A: "max_level",
+    0x2B: "min_level",
+    0x2C: "system_failure_level",
+    0x2D: "power_on_level",
+    0x2E: "fade_time",
+    0x2F: "fade_rate",
+    0x30: "extended_fade_time",
+}
+
+# queries answering with an attribute
+GEAR_QUERY = {
+    0x90: "status",
+    0x99: "device_type",
+    0xA0: "level",
+    0xA1: "max_level",
+    0xA2: "min_level",
+    0xA3: "power_on_level",
+    0xA4: "system_failure_level",
+}
+QUERY_DTR = {0x98: 0, 0x9C: 1, 0x9D: 2}
+QUERY_FADE = 0xA5
+QUERY_GROUPS = {0xC0: 0, 0xC1: 8}
+
+# iec 62386-103 - control device instruction opcodes, instance byte 0xFE
+DEVICE_INSTANCE = 0xFE
+DEVICE_RESET = 0x10
+SET_OPERATING_MODE = 0x18
+ADD_TO_DEVICE_GROUPS = {0x19: 0, 0x1A: 16}
+REMOVE_FROM_DEVICE_GROUPS = {0x1B: 0, 0x1C: 16}
+DEVICE_QUERY = {
+    0x30: "status",
+    0x35: "instances",
+    0x3E: "operating_mode",
+}
+DEVICE_QUERY_DTR = {0x36: 0, 0x37: 1, 0x38: 2}
+QUERY_DEVICE_GROUPS = {0x41: 0, 0x42: 8, 0x43: 16, 0x44: 24}
+
+DTR_REGISTERS = {
+    DALI.MNEMONICS.id("DTR0"): 0,
+    DALI.MNEMONICS.id("DTR1"): 1,
+    DALI.MNEMONICS.id("DTR2"): 2,
+}
+
+GEAR_BROADCAST = (DALI.AddressKind.GEAR_BROADCAST,)
+DEVICE_BROADCAST = (DALI.AddressKind.DEVICE_BROADCAST,)
+
+
+class GearState:
+    # None is not known yet
+    __slots__ = (
+        "address",
+        "device_type",
+        "dtr",
+        "extended_fade_time",
+        "fade_rate",
+        "fade_time",
+        "groups",
+        "level",
+        "max_level",
+        "min_level",
+        "power_on_level",
+        "scenes",
+        "status",
+        "system_failure_level",
+        "timestamp",
+    )
+
+    def __init__(self, address):
+        self.address = address
+        self.timestamp = None
+        self.level = None
+        self.max_level = None
+        self.min_level = None
+        self.power_on_level = None
+        self.system_failure_level = None
+        self.fade_time = None
+        self.fade_rate = None
+        self.extended_fade_time = None
+        # DTR contents the gear used or answered last
+        self.dtr = [None, None, None]
+        # bit per group, only bits seen set or cleared are meaningful
+        self.groups = 0
+        self.scenes = [None] * 16
+        self.device_type = None
+        self.status = None
+
+    def reset(self):
+        # iec 62386-102 reset values
+        self.level = self.max_level = self.power_on_level = 254
+        self.system_failure_level = 254
+        self.fade_time = self.extended_fade_time = 0
+        self.fade_rate = 7
+        self.groups = 0
+        self.scenes = [MASK] * 16
+
+    def copy(self):
+        state = copy(self)
+        state.dtr = list(self.dtr)
+        state.scenes = list(self.scenes)
+        return state
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"GearState({fields})"
+
+
+class DeviceState:
+    __slots__ = (
+        "address",
+        "dtr",
+        "groups",
+        "instances",
+        "operating_mode",
+        "status",
+        "timestamp",
+    )
+
+    def __init__(self, address):
+        self.address = address
+        self.timestamp = None
+        self.dtr = [None, None, None]
+        self.groups = 0
+        self.operating_mode = None
+        self.instances = None
+        self.status = None
+
+    def copy(self):
+        state = copy(self)
+        state.dtr = list(self.dtr)
+        return state
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"DeviceState({fields})"
+
+
+class BusState:
+    # State of the control gear and control devices as far as it can be
+    # inferred from the traffic. Every frame is a constant time update, a
+    # group or broadcast command touches at most 64 known addresses.
+
+    def __init__(self):
+        self.gear = {}
+        self.devices = {}
+        # bus wide registers, gear and devices have their own
+        self.gear_dtr = [None, None, None]
+        self.device_dtr = [None, None, None]
+        # (state, answer handler) of a query waiting for its backframe
+        self.pending = None
+
+    def __getitem__(self, label):
+        # "G17" or "D05"
+        kind, address = label[0], int(label[1:])
+        if kind == "G":
+            return self.gear[address]
+        if kind == "D":
+            return self.devices[address]
+        raise KeyError(label)
+
+    def gear_targets(self, address_kind, address):
+        if address_kind == DALI.AddressKind.GEAR:
+            state = self.gear.get(address)
+            if state is None:
+                state = self.gear[address] = GearState(address)
+            return (state,)
+        if address_kind == DALI.AddressKind.GEAR_GROUP:
+            bit = 1 << address
+            return [state for state in self.gear.values() if state.groups & bit]
+        if address_kind in GEAR_BROADCAST:
+            return self.gear.values()
+        return ()
+
+    def device_targets(self, address_kind, address):
+        if address_kind == DALI.AddressKind.DEVICE:
+            state = self.devices.get(address)
+            if state is None:
+                state = self.devices[address] = DeviceState(address)
+            return (state,)
+        if address_kind == DALI.AddressKind.DEVICE_GROUP:
+            bit = 1 << address
+            return [state for state in self.devices.values() if state.groups & bit]
+        if address_kind in DEVICE_BROADCAST:
+            return self.devices.values()
+        return ()
+
+    def update(self, record):
+        pending, self.pending = self.pending, None
+        if record.is_error:
+            return
+        frame = record.frame
+        if frame.length == 8:
+            if pending is not None:
+                state, answer = pending
+                state.timestamp = frame.timestamp
+                answer(state, frame.data)
+            return
+        fields = frame_fields(frame.length, frame.data, record.device_type)
+        if fields.address_kind == DALI.AddressKind.SPECIAL:
+            register = DTR_REGISTERS.get(fields.mnemonic)
+            if register is not None:
+                dtr = self.gear_dtr if frame.length == 16 else self.device_dtr
+                dtr[register] = frame.data & 0xFF
+        elif frame.length == 16:
+            self.gear_command(frame, fields)
+        elif frame.length == 24 and (frame.data >> 8) & 0xFF == DEVICE_INSTANCE:
+            self.device_command(frame, fields)
+
+    def gear_command(self, frame, fields):
+        opcode = fields.opcode
+        direct = not (frame.data >> 8) & 0x01
+        single = fields.address_kind == DALI.AddressKind.GEAR
+        dtr0 = self.gear_dtr[0]
+        if single and not direct and opcode == SET_SHORT_ADDRESS:
+            self.move_gear(frame, fields.address, dtr0)
+            return
+        targets = self.gear_targets(fields.address_kind, fields.address)
+        for state in targets:
+            state.timestamp = frame.timestamp
+            if direct:
+                if opcode != MASK:
+                    state.level = opcode
+            elif opcode == OFF:
+                state.level = 0
+            elif opcode == RECALL_MAX_LEVEL:
+                state.level = state.max_level
+            elif opcode == RECALL_MIN_LEVEL:
+                state.level = state.min_level
+            elif opcode in RELATIVE_LEVEL:
+                state.level = None
+            elif opcode in GO_TO_SCENE:
+                level = state.scenes[opcode & 0x0F]
+                state.level = level if level != MASK else state.level
+            elif opcode == RESET:
+                state.reset()
+            elif opcode in GEAR_STORE_DTR0:
+                setattr(state, GEAR_STORE_DTR0[opcode], dtr0)
+                state.dtr[0] = dtr0
+            elif opcode in SET_SCENE:
+                state.scenes[opcode & 0x0F] = dtr0
+                state.dtr[0] = dtr0
+            elif opcode in REMOVE_FROM_SCENE:
+                state.scenes[opcode & 0x0F] = MASK
+            elif opcode in ADD_TO_GROUP:
+                state.groups |= 1 << (opcode & 0x0F)
+            elif opcode in REMOVE_FROM_GROUP:
+                state.groups &= ~(1 << (opcode & 0x0F))
+        if single and not direct:
+            state = targets[0]
+            self.pending = self.gear_query(state, opcode)
+
+    def move_gear(self, frame, address, dtr0):
+        # no state is created for an unknown address, the repeated frame of
+        # the send twice command finds the gear already moved
+        state = self.gear.get(address)
+        if state is None or dtr0 is None:
+            return
+        state.timestamp = frame.timestamp
+        if dtr0 == MASK:
+            del self.gear[state.address]
+        elif dtr0 & 0x81 == 0x01:
+            del self.gear[state.address]
+            state.address = (dtr0 >> 1) & 0x3F
+            self.gear[state.address] = state
+
+    def gear_query(self, state, opcode):
+        if opcode in GEAR_QUERY:
+            name = GEAR_QUERY[opcode]
+            return state, lambda state, value: setattr(state, name, value)
+        if opcode in QUERY_DTR:
+            register = QUERY_DTR[opcode]
+            return state, lambda state, value: self.answer_dtr(
+                state, self.gear_dtr, register, value
+            )
+        if opcode == QUERY_FADE:
+            return state, answer_fade
+        if opcode in QUERY_SCENE_LEVEL:
+            scene = opcode & 0x0F
+            return state, lambda state, value: state.scenes.__setitem__(scene, value)
+        if opcode in QUERY_GROUPS:
+            return state, answer_groups(QUERY_GROUPS[opcode])
+        return None
+
+    def answer_dtr(self, state, dtr, register, value):
+        state.dtr[register] = dtr[register] = value
+
+    def device_command(self, frame, fields):
+        targets = self.device_targets(fields.address_kind, fields.address)
+        opcode = fields.opcode
+        dtr = self.device_dtr
+        for state in targets:
+            state.timestamp = frame.timestamp
+            if opcode == DEVICE_RESET:
+                state.groups = 0
+                state.operating_mode = 0
+            elif opcode == SET_OPERATING_MODE:
+                state.operating_mode = state.dtr[0] = dtr[0]
+            elif opcode in ADD_TO_DEVICE_GROUPS and None not in dtr[1:]:
+                mask = (dtr[2] << 8 | dtr[1]) << ADD_TO_DEVICE_GROUPS[opcode]
+                state.groups |= mask
+            elif opcode in REMOVE_FROM_DEVICE_GROUPS and None not in dtr[1:]:
+                mask = (dtr[2] << 8 | dtr[1]) << REMOVE_FROM_DEVICE_GROUPS[opcode]
+                state.groups &= ~mask
+        if fields.address_kind == DALI.AddressKind.DEVICE:
+            self.pending = self.device_query(targets[0], opcode)
+
+    def device_query(self, state, opcode):
+        if opcode in DEVICE_QUERY:
+            name = DEVICE_QUERY[opcode]
+            return state, lambda state, value: setattr(state, name, value)
+        if opcode in DEVICE_QUERY_DTR:
+            register = DEVICE_QUERY_DTR[opcode]
+            return state, lambda state, value: self.answer_dtr(
+                state, self.device_dtr, register, value
+            )
+        if opcode in QUERY_DEVICE_GROUPS:
+            return state, answer_groups(QUERY_DEVICE_GROUPS[opcode])
+        return None
+
+    def snapshot(self):
+        # copies by address label, later frames do not change them
+        states = {
+            f"G{address:02}": state.copy() for address, state in self.gear.items()
+        }
+        states.update(
+            (f"D{address:02}", state.copy()) for address, state in self.devices.items()
+        )
+        return states
+
+    def __call__(self, records):
+        for record in records:
+            self.update(record)
+            yield record
+
+
+def answer_fade(state, value):
+    state.fade_time = value >> 4
+    state.fade_rate = value & 0x0F
+
+
+def answer_groups(shift):
+    def answer(state, value):
+        state.groups = state.groups & ~(0xFF << shift) | value << shift
+
+    return answer
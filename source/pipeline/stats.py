@@ -0,0 +1,308 @@
+import sys
+import time
+from bisect import bisect_left
+from collections import Counter
+from functools import cache, lru_cache
+from typing import NamedTuple
+
+import DALI
+from connection.status import DaliStatus
+
+# rolling windows in seconds of capture time
+WINDOWS = (1, 60, 15 * 60)
+WINDOW_NAMES = {1: "1s", 60: "1min", 15 * 60: "15min"}
+
+# seconds of wall time between two reports of the StatsSink
+REPORT_INTERVAL = 10.0
+
+STATUS_NAMES = {
+    DaliStatus.OK: "OK",
+    DaliStatus.LOOPBACK: "LOOPBACK",
+    DaliStatus.FRAME: "FRAME",
+    DaliStatus.TIMEOUT: "TIMEOUT",
+    DaliStatus.TIMING: "TIMING",
+    DaliStatus.INTERFACE: "INTERFACE",
+    DaliStatus.FAILURE: "FAILURE",
+    DaliStatus.GENERAL: "GENERAL",
+    DaliStatus.UNDEFINED: "UNDEFINED",
+}
+
+ADDRESS_LABELS = {
+    DALI.AddressKind.NONE: "-",
+    DALI.AddressKind.GEAR: "G{:02}",
+    DALI.AddressKind.GEAR_GROUP: "GG{:02}",
+    DALI.AddressKind.GEAR_BROADCAST: "BC GEAR",
+    DALI.AddressKind.GEAR_BROADCAST_UNADDR: "BC GEAR UN",
+    DALI.AddressKind.DEVICE: "D{:02}",
+    DALI.AddressKind.DEVICE_GROUP: "DG{:02}",
+    DALI.AddressKind.DEVICE_BROADCAST: "BC DEV",
+    DALI.AddressKind.DEVICE_BROADCAST_UNADDR: "BC DEV UN",
+    DALI.AddressKind.SPECIAL: "SPECIAL",
+    DALI.AddressKind.RESERVED: "RESERVED",
+    DALI.AddressKind.ENHANCED: "E{:02}",
+    DALI.AddressKind.ENHANCED_GROUP: "EG{:02}",
+    DALI.AddressKind.ENHANCED_BROADCAST: "BC ENH",
+    DALI.AddressKind.ENHANCED_BROADCAST_UNADDR: "BC ENH UN",
+    DALI.AddressKind.INSTANCE_TYPE: "T{:02}",
+    DALI.AddressKind.INSTANCE_GROUP: "IG{:02}",
+}
+
+# forward frames answered by a backframe besides the QUERY commands
+QUERY_NAMES = ("READ MEMORY LOCATION", "COMPARE", "VERIFY SHORT ADDRESS")
+
+# distinct frames classified, the table-driven lookup is cheap but not free
+CLASSIFY_CACHE = 4096
+
+
+def address_label(address_kind, address):
+    return ADDRESS_LABELS.get(address_kind, "?").format(address)
+
+
+@lru_cache(maxsize=CLASSIFY_CACHE)
+def frame_fields(length, data, device_type):
+    return DALI.Decode(length, data, device_type).fields()
+
+
+def classify(length, data, device_type):
+    # (address kind, address, mnemonic) of a decoded frame
+    fields = frame_fields(length, data, device_type)
+    return fields.address_kind, fields.address, fields.mnemonic
+
+
+@cache
+def is_query(mnemonic):
+    # bounded by the mnemonic table
+    name = DALI.MNEMONICS.name(mnemonic)
+    return name.startswith("QUERY") or name.startswith(QUERY_NAMES)
+
+
+class RollingCount:
+    # events per second over several windows, one bucket per second
+
+    def __init__(self, windows=WINDOWS):
+        self.windows = windows
+        self.size = max(windows)
+        self.buckets = [0] * self.size
+        self.sums = [0] * len(windows)
+        self.second = None
+
+    def reset(self, second):
+        self.buckets = [0] * self.size
+        self.sums = [0] * len(self.windows)
+        self.second = second
+
+    def advance(self, second):
+        # the time between two frames costs one step per second, bounded by size
+        if self.second is None or second < self.second:
+            # start or timestamps wrapped
+            self.reset(second)
+            return
+        if second - self.second >= self.size:
+            self.reset(second)
+            return
+        for step in range(self.second + 1, second + 1):
+            for position, window in enumerate(self.windows):
+                self.sums[position] -= self.buckets[(step - window) % self.size]
+            self.buckets[step % self.size] = 0
+        self.second = second
+
+    def add(self, timestamp, count=1):
+        second = int(timestamp)
+        if second != self.second:
+            self.advance(second)
+        self.buckets[second % self.size] += count
+        for position in range(len(self.sums)):
+            self.sums[position] += count
+
+    def rates(self, timestamp=None):
+        # events per second by window name, the current second counts in full
+        if timestamp is not None:
+            self.advance(int(timestamp))
+        return {
+            WINDOW_NAMES.get(window, f"{window}s"): total / window
+            for window, total in zip(self.windows, self.sums)
+        }
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        # the last count is the +Inf bucket
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    @property
+    def count(self):
+        return sum(self.counts)
+
+    def samples(self, name):
+        counts = list(self.counts)
+        total = 0
+        for bound, count in zip((*self.buckets, "+Inf"), counts):
+            total += count
+            yield f'{name}_bucket{{le="{bound}"}} {total}'
+        yield f"{name}_count {total}"
+        yield f"{name}_sum {self.sum}"
+
+
+class StatsSnapshot(NamedTuple):
+    timestamp: float
+    frames: int
+    errors: int
+    lengths: dict
+    addresses: dict
+    commands: dict
+    statuses: dict
+    queries: int
+    answered: int
+    rates: dict
+    error_rates: dict
+
+    @property
+    def answer_rate(self):
+        if self.queries == 0:
+            return 0.0
+        return self.answered / self.queries
+
+
+class BusStats:
+    # passes records through and keeps running counters, memory is bounded by
+    # the address, mnemonic and status tables and the longest window
+
+    def __init__(self, windows=WINDOWS):
+        self.frames = 0
+        self.errors = 0
+        self.lengths = Counter()
+        # by (address kind, address) and mnemonic id, labels are only built
+        # for snapshots
+        self.addresses = Counter()
+        self.commands = Counter()
+        self.statuses = Counter()
+        self.queries = 0
+        self.answered = 0
+        self.pending_query = False
+        self.timestamp = 0.0
+        self.frame_count = RollingCount(windows)
+        self.error_count = RollingCount(windows)
+
+    def update(self, record):
+        frame = record.frame
+        self.frames += 1
+        self.timestamp = frame.timestamp
+        self.statuses[frame.status.status] += 1
+        self.frame_count.add(frame.timestamp)
+        pending_query, self.pending_query = self.pending_query, False
+        if record.is_error:
+            self.errors += 1
+            self.error_count.add(frame.timestamp)
+            return
+        self.lengths[frame.length] += 1
+        address_kind, address, mnemonic = classify(
+            frame.length, frame.data, record.device_type
+        )
+        self.commands[mnemonic] += 1
+        if frame.length == 8:
+            if pending_query:
+                self.answered += 1
+            return
+        self.addresses[(address_kind, address)] += 1
+        if is_query(mnemonic):
+            self.queries += 1
+            self.pending_query = True
+
+    def snapshot(self):
+        return StatsSnapshot(
+            self.timestamp,
+            self.frames,
+            self.errors,
+            dict(self.lengths),
+            {
+                address_label(*address): count
+                for address, count in self.addresses.items()
+            },
+            {
+                DALI.MNEMONICS.name(mnemonic): count
+                for mnemonic, count in self.commands.items()
+            },
+            {
+                STATUS_NAMES.get(status, str(status)): count
+                for status, count in self.statuses.items()
+            },
+            self.queries,
+            self.answered,
+            self.frame_count.rates(self.timestamp),
+            self.error_count.rates(self.timestamp),
+        )
+
+    def __call__(self, records):
+        for record in records:
+            self.update(record)
+            yield record
+
+
+def format_counts(counts, limit=None):
+    ordered = sorted(counts.items(), key=lambda item: (-item[1], str(item[0])))
+    return ", ".join(f"{key}: {count}" for key, count in ordered[:limit])
+
+
+def format_snapshot(snapshot, limit=10):
+    rates = "  ".join(f"{name} {rate:.1f}/s" for name, rate in snapshot.rates.items())
+    error_rates = "  ".join(
+        f"{name} {rate:.1f}/s" for name, rate in snapshot.error_rates.items()
+    )
+    return (
+        f"--- {snapshot.timestamp:.3f} | {snapshot.frames} frames, "
+        f"{snapshot.errors} errors, {snapshot.answered}/{snapshot.queries} "
+        f"queries answered\n"
+        f"rate     {rates}\n"
+        f"errors   {error_rates}\n"
+        f"length   {format_counts(snapshot.lengths)}\n"
+        f"status   {format_counts(snapshot.statuses)}\n"
+        f"address  {format_counts(snapshot.addresses, limit)}\n"
+        f"command  {format_counts(snapshot.commands, limit)}\n"
+    )
+
+
+class StatsSink:
+    # --stats, reports the statistics instead of the frames
+    output_format = "stats"
+    split = False
+
+    def __init__(self, stream=None, interval=REPORT_INTERVAL, stats=None):
+        self.stream = stream if stream is not None else sys.stdout
+        self.interval = interval
+        self.stats = stats if stats is not None else BusStats()
+        self.next_report = time.monotonic() + interval
+        self.closed = False
+
+    def report(self):
+        self.stream.write(format_snapshot(self.stats.snapshot()))
+        self.stream.flush()
+        self.next_report = time.monotonic() + self.interval
+
+    def write(self, record):
+        self.stats.update(record)
+        if time.monotonic() >= self.next_report:
+            self.report()
+
+    def write_batch(self, records):
+        for record in records:
+            self.write(record)
+
+    def flush(self):
+        if time.monotonic() >= self.next_report:
+            self.report()
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.report()
+
+    def __call__(self, records):
+        for record in records:
+            self.write(record)
+        self.close()
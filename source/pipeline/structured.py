@@ -0,0 +1,164 @@
+import csv
+import io
+import json
+import sys
+
+from .sink import BufferedOutput, LineSink
+
+FIELDS = (
+    "timestamp",
+    "delta",
+    "length",
+    "data",
+    "status",
+    "message",
+    "address",
+    "command",
+)
+
+
+def row(record):
+    # address and command are None for frames with an error status
+    frame = record.frame
+    return (
+        round(frame.timestamp, 3),
+        round(float(record.delta), 3),
+        frame.length,
+        frame.data,
+        frame.status.status,
+        frame.status.message,
+        record.address,
+        record.command,
+    )
+
+
+# leading column with buses=True
+BUS_FIELDS = ("bus", *FIELDS)
+
+
+def bus_row(record):
+    return (record.frame.bus, *row(record))
+
+
+class JsonLinesSink(LineSink):
+    output_format = "jsonl"
+    split = True
+
+    def __init__(self, stream=None, buses=False):
+        self.stream = stream if stream is not None else sys.stdout
+        self.output = BufferedOutput(self.stream)
+        self.encode = json.JSONEncoder(separators=(",", ":")).encode
+        self.fields, self.row = (BUS_FIELDS, bus_row) if buses else (FIELDS, row)
+
+    def format(self, record):
+        return self.encode(dict(zip(self.fields, self.row(record)))) + "\n"
+
+
+class CsvSink(LineSink):
+    output_format = "csv"
+    split = True
+
+    def __init__(self, stream=None, header=True, buses=False):
+        self.stream = stream if stream is not None else sys.stdout
+        self.output = BufferedOutput(self.stream)
+        self.line = io.StringIO()
+        self.writer = csv.writer(self.line, lineterminator="\n")
+        fields, self.row = (BUS_FIELDS, bus_row) if buses else (FIELDS, row)
+        if header:
+            self.writer.writerow(fields)
+            self.output.write(self.take_line())
+
+    def take_line(self):
+        text = self.line.getvalue()
+        self.line.seek(0)
+        self.line.truncate()
+        return text
+
+    def format(self, record):
+        self.writer.writerow(self.row(record))
+        return self.take_line()
+
+    def render(self, records):
+        self.writer.writerows(self.row(record) for record in records)
+        return self.take_line()
+
+
+class ArrowSink:
+    # Arrow IPC file, the footer is written by close()
+    output_format = "arrow"
+    split = True
+    BATCH_SIZE = 64 * 1024
+
+    def __init__(self, stream=None, batch_size=BATCH_SIZE, buses=False):
+        import pyarrow as pa
+
+        self.pa = pa
+        self.stream = stream if stream is not None else sys.stdout.buffer
+        self.batch_size = batch_size
+        self.row = bus_row if buses else row
+        self.schema = pa.schema(
+            ([("bus", pa.string())] if buses else [])
+            + [
+                ("timestamp", pa.float64()),
+                ("delta", pa.float64()),
+                ("length", pa.uint8()),
+                ("data", pa.uint32()),
+                ("status", pa.uint8()),
+                ("message", pa.string()),
+                ("address", pa.string()),
+                ("command", pa.string()),
+            ]
+        )
+        self.rows = []
+        self.writer = None
+        self.closed = False
+
+    def write(self, record):
+        self.rows.append(self.row(record))
+        if len(self.rows) >= self.batch_size:
+            self.write_rows()
+
+    def write_batch(self, records):
+        self.write_rendered(self.render(records))
+
+    def render(self, records):
+        return [self.row(record) for record in records]
+
+    def write_rendered(self, rows):
+        self.rows.extend(rows)
+        if len(self.rows) >= self.batch_size:
+            self.write_rows()
+
+    def write_rows(self):
+        if self.writer is None:
+            self.writer = self.pa.ipc.new_file(self.stream, self.schema)
+        if self.rows:
+            columns = list(zip(*self.rows))
+            self.writer.write_batch(
+                self.pa.record_batch(
+                    [
+                        self.pa.array(column, type=field.type)
+                        for column, field in zip(columns, self.schema)
+                    ],
+                    schema=self.schema,
+                )
+            )
+            self.rows = []
+
+    def flush(self):
+        # a batch is only written when it is full, keeps batches large
+        pass
+
+    def close(self):
+        if self.closed:
+            return
+        # an empty capture still gives a valid file with the schema
+        self.write_rows()
+        self.writer.close()
+        self.stream.flush()
+        self.closed = True
+
+    def __call__(self, records):
+        for record in records:
+            self.write(record)
+        self.close()
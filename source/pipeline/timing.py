@@ -0,0 +1,173 @@
+from collections import Counter
+from typing import NamedTuple
+
+from .decode import DecodedFrame
+from .stats import Histogram, address_label, frame_fields
+
+# iec 62386-101 half bit time, 1200 baud
+TE = 1 / 2400
+
+# timestamps of the adapters mark the end of a frame, resolution 1 ms
+TOLERANCE = 0.001
+
+FORWARD_BACKFRAME = "forward-backframe"
+BACKFRAME_FORWARD = "backframe-forward"
+FORWARD_FORWARD = "forward-forward"
+SEND_TWICE = "send-twice"
+
+# iec 62386-101 settling times in seconds, from the end of a frame to the
+# start of the next one
+BACKFRAME_WINDOW = (0.0055, 0.0105)
+AFTER_BACKFRAME = 0.0024
+# the repeated frame of a send twice command within 100 ms
+SEND_TWICE_WINDOW = (0.0135, 0.1)
+# forward frame settling time by priority
+PRIORITY_WINDOWS = (
+    (1, 0.0135, 0.0147),
+    (2, 0.0149, 0.0162),
+    (3, 0.0163, 0.0177),
+    (4, 0.0179, 0.0193),
+    (5, 0.0195, 0.0211),
+)
+# longer gaps between forward frames are an idle bus, priority 0
+IDLE = 0
+
+GAP_BUCKETS = (
+    0.0024,
+    0.0055,
+    0.0105,
+    0.0135,
+    0.0147,
+    0.0162,
+    0.0177,
+    0.0193,
+    0.0211,
+    0.1,
+)
+
+
+def frame_duration(length):
+    # start bit, data bits and the stop condition of 4 Te
+    return (1 + length) * 2 * TE + 4 * TE
+
+
+def priority(gap):
+    # gaps between two windows count to the lower priority
+    for number, _, longest in PRIORITY_WINDOWS:
+        if gap <= longest:
+            return number
+    return IDLE
+
+
+class Violation(NamedTuple):
+    record: DecodedFrame
+    kind: str
+    gap: float
+    # the violated limit, the gap was shorter or longer
+    limit: float
+    too_short: bool
+
+    def __str__(self):
+        relation = "<" if self.too_short else ">"
+        return (
+            f"TIMING {self.kind} {self.gap * 1000:.1f} ms "
+            f"{relation} {self.limit * 1000:.1f} ms"
+        )
+
+
+class TimingAnalyzer:
+    # Classifies the gap before every frame and checks it against the
+    # settling times. Violations are appended to the command of the record.
+
+    def __init__(self, tolerance=TOLERANCE, on_violation=None):
+        self.tolerance = tolerance
+        self.on_violation = on_violation
+        # (kind, address label, priority) -> Histogram of the gaps
+        self.gaps = {}
+        self.violations = Counter()
+        # the previous frame, None after an error
+        self.previous = None
+
+    def observe(self, kind, address, gap, number=IDLE):
+        key = (kind, address, number)
+        histogram = self.gaps.get(key)
+        if histogram is None:
+            histogram = self.gaps[key] = Histogram(GAP_BUCKETS)
+        histogram.observe(gap)
+
+    def check(self, record, kind, gap, shortest, longest=None):
+        if gap < shortest - self.tolerance:
+            violation = Violation(record, kind, gap, shortest, True)
+        elif longest is not None and gap > longest + self.tolerance:
+            violation = Violation(record, kind, gap, longest, False)
+        else:
+            return None
+        self.violations[kind] += 1
+        if self.on_violation is not None:
+            self.on_violation(violation)
+        return violation
+
+    def classify(self, record, previous):
+        # (kind, address, priority, violation) of the gap before record
+        frame = record.frame
+        gap = record.delta - frame_duration(frame.length)
+        backframe = frame.length == 8
+        if previous.length == 8:
+            if backframe:
+                return None
+            address = self.address(record)
+            self.observe(BACKFRAME_FORWARD, address, gap)
+            return self.check(record, BACKFRAME_FORWARD, gap, AFTER_BACKFRAME)
+        if backframe:
+            address = self.address_of(previous, record.device_type)
+            self.observe(FORWARD_BACKFRAME, address, gap)
+            return self.check(record, FORWARD_BACKFRAME, gap, *BACKFRAME_WINDOW)
+        address = self.address(record)
+        if (previous.length, previous.data) == (frame.length, frame.data):
+            self.observe(SEND_TWICE, address, gap)
+            return self.check(record, SEND_TWICE, gap, *SEND_TWICE_WINDOW)
+        number = priority(gap)
+        self.observe(FORWARD_FORWARD, address, gap, number)
+        return self.check(record, FORWARD_FORWARD, gap, PRIORITY_WINDOWS[0][1])
+
+    def address(self, record):
+        return self.address_of(record.frame, record.device_type)
+
+    def address_of(self, frame, device_type):
+        fields = frame_fields(frame.length, frame.data, device_type)
+        return address_label(fields.address_kind, fields.address)
+
+    def annotate(self, record):
+        previous, self.previous = self.previous, None
+        if record.is_error:
+            return record
+        self.previous = record.frame
+        if previous is None or record.delta <= 0:
+            return record
+        violation = self.classify(record, previous)
+        if violation is None:
+            return record
+        note = f" !! {violation}"
+        if record.command is not None:
+            return record._replace(
+                command_string=record.command_string + note,
+                command=record.command + note,
+            )
+        return record._replace(command_string=record.command_string + note)
+
+    def summary(self):
+        # gaps and mean gap per kind, address and priority
+        lines = []
+        for (kind, address, number), histogram in sorted(self.gaps.items()):
+            label = f"P{number}" if number else "  "
+            lines.append(
+                f"{kind:18} {address:10} {label} {histogram.count:8} gaps "
+                f"mean {histogram.sum / histogram.count * 1000:6.1f} ms"
+            )
+        for kind, count in sorted(self.violations.items()):
+            lines.append(f"{kind:18} {count} violations")
+        return lines
+
+    def __call__(self, records):
+        for record in records:
+            yield self.annotate(record)
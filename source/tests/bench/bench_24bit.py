@@ -0,0 +1,154 @@
+import functools
+import importlib.util
+import random
+import subprocess
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, ".")
+
+import DALI
+from DALI.forward_frame_24bit import (
+    ADDRESS_BYTE,
+    EVENT_INSTANCE,
+    INSTANCE_BYTE,
+    OPCODE_BYTE,
+    SHORT_ADDRESS,
+    ForwardFrame24Bit,
+)
+
+FRAMES = 100000
+REPEAT = 5
+
+
+def input_device_traffic(count, seed=0):
+    # mostly event messages from push buttons and occupancy sensors,
+    # mixed with some instance queries of an application controller
+    generator = random.Random(seed)
+    frames = []
+    for _ in range(count):
+        if generator.random() < 0.8:
+            short_address = generator.randrange(0x40)
+            instance_number = generator.randrange(0x20)
+            event_data = generator.randrange(0x400)
+            frames.append(
+                (short_address << 17) | 0x8000 | (instance_number << 10) | event_data
+            )
+        else:
+            short_address = generator.randrange(0x40)
+            instance_number = generator.randrange(0x20)
+            opcode = generator.choice((0x80, 0x83, 0x8C, 0x0A))
+            frames.append(
+                (short_address << 17) | 0x10000 | (instance_number << 8) | opcode
+            )
+    return frames
+
+
+def per_frame_us(function, frames):
+    seconds = min(timeit.repeat(lambda: function(frames), number=1, repeat=REPEAT))
+    return seconds / len(frames) * 1e6
+
+
+def decode(frames):
+    for frame in frames:
+        DALI.Decode(24, frame).cmd()
+
+
+def git(*args):
+    try:
+        result = subprocess.run(
+            ["git", *args], check=False, capture_output=True, text=True
+        )
+    except FileNotFoundError:
+        raise ImportError("git not installed") from None
+    if result.returncode != 0:
+        raise ImportError(f"git {args[0]} failed, {result.stderr.strip()}")
+    return result.stdout
+
+
+def load_bitarray_decoder():
+    # the BitArray based decoder of version 1.4.2 from the git history, the
+    # last commit removing bitstring from it is the port
+    path = "DALI/forward_frame_24bit.py"
+    port = git("log", "-1", "--format=%H", "-S", "from bitstring", "--", path)
+    if not port.strip():
+        raise ImportError("no BitArray based decoder in the git history")
+    source = git("show", f"{port.strip()}^:./{path}")
+    with tempfile.TemporaryDirectory() as directory:
+        module_path = Path(directory) / "forward_frame_24bit_bitarray.py"
+        module_path.write_text(source)
+        spec = importlib.util.spec_from_file_location(module_path.stem, module_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    return module.ForwardFrame24Bit
+
+
+def decode_frame(frames, decoder=ForwardFrame24Bit):
+    for frame in frames:
+        decoder(frame)
+
+
+def same_results(baseline, frames):
+    # both decoders must agree, or the comparison means nothing
+    for frame in frames:
+        old, new = baseline(frame), ForwardFrame24Bit(frame)
+        if (old.address_string, old.command_string) != (
+            new.address_string,
+            new.command_string,
+        ):
+            return False
+    return True
+
+
+def extract_bit_field(frames):
+    for frame in frames:
+        ADDRESS_BYTE.get(frame)
+        INSTANCE_BYTE.get(frame)
+        OPCODE_BYTE.get(frame)
+        SHORT_ADDRESS.get(frame)
+        EVENT_INSTANCE.get(frame)
+
+
+def extract_bitarray(frames):
+    # field extraction as done by the decoders up to version 1.4.2
+    from bitstring import BitArray
+
+    for frame in frames:
+        frame_bits = BitArray(uint=frame, length=24)
+        _ = frame_bits[:8].uint
+        _ = frame_bits[8:16].uint
+        _ = frame_bits[16:].uint
+        _ = frame_bits[1:7].uint
+        _ = frame_bits[9:14].uint
+
+
+if __name__ == "__main__":
+    frames = input_device_traffic(FRAMES)
+    print(f"{FRAMES} 24 bit frames, best of {REPEAT}")
+    try:
+        print(
+            f"field extraction BitArray : {per_frame_us(extract_bitarray, frames):7.3f} us/frame"
+        )
+    except ImportError:
+        print("field extraction BitArray : bitstring not installed")
+    print(
+        f"field extraction BitField : {per_frame_us(extract_bit_field, frames):7.3f} us/frame"
+    )
+    try:
+        baseline = load_bitarray_decoder()
+    except ImportError as error:
+        print(f"decode frame BitArray     : {error}")
+    else:
+        if same_results(baseline, frames):
+            decode_baseline = functools.partial(decode_frame, decoder=baseline)
+            print(
+                f"decode frame BitArray     : {per_frame_us(decode_baseline, frames):7.3f} us/frame"
+            )
+        else:
+            print("decode frame BitArray     : decoders disagree, not timed")
+    print(
+        f"decode frame BitField     : {per_frame_us(decode_frame, frames):7.3f} us/frame"
+    )
+    print(f"decode to string          : {per_frame_us(decode, frames):7.3f} us/frame")
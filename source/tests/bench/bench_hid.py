@@ -0,0 +1,114 @@
+import sys
+import time
+import timeit
+
+sys.path.insert(0, ".")
+
+from bench_24bit import input_device_traffic
+
+from connection.frame import DaliFrame
+from connection.hid import DaliUsb
+from connection.ring import RingBuffer
+from connection.status import DaliStatus
+from connection.timeline import Timeline
+from pipeline.timing import PRIORITY_WINDOWS, frame_duration
+
+FRAMES = 100000
+REPEAT = 5
+
+
+def reports(frames):
+    packets = []
+    for data in frames:
+        packet = bytearray(64)
+        packet[1] = DaliUsb._USB_READ_TYPE_24BIT
+        packet[3:6] = data.to_bytes(3, "big")
+        packets.append(bytes(packet))
+    return packets
+
+
+class Endpoint:
+    # hands out the reports like ep_read.read, into a buffer or as a new array
+    wMaxPacketSize = 64
+
+    def __init__(self, packets):
+        self.packets = packets
+        self.position = 0
+
+    def next(self):
+        packet = self.packets[self.position]
+        self.position = (self.position + 1) % len(self.packets)
+        return packet
+
+    def read(self, size_or_buffer, timeout=None):
+        packet = self.next()
+        if isinstance(size_or_buffer, int):
+            return bytearray(packet)
+        size_or_buffer[:] = packet
+        return len(packet)
+
+
+def parse_bytewise(device, usb_data):
+    # 24 bit reports as parsed up to version 1.4.2, debug message always built
+    device.logged = (
+        f"DALI[IN]: SN=0x{usb_data[8]:02X} TY=0x{usb_data[1]:02X} "
+        f"EC=0x{usb_data[3]:02X} AD=0x{usb_data[4]:02X} OC=0x{usb_data[5]:02X}"
+    )
+    return DaliFrame(
+        timestamp=time.time(),
+        length=24,
+        data=usb_data[5] + (usb_data[4] << 8) + (usb_data[3] << 16),
+        status=DaliStatus.from_status(DaliStatus.FRAME),
+    )
+
+
+def adapter(packets):
+    device = DaliUsb.__new__(DaliUsb)
+    device.timeline = Timeline()
+    device.queue = RingBuffer(FRAMES)
+    device.ep_read = Endpoint(packets)
+    return device
+
+
+def receive_bytewise(device, count):
+    for _ in range(count):
+        device.queue.put(parse_bytewise(device, device.read_raw(timeout=100)))
+        device.queue.get_nowait()
+
+
+def receive_report(device, count):
+    # one array per report, as read_raw and parse_report
+    for _ in range(count):
+        device.queue.put(device.parse_report(device.read_raw(timeout=100)))
+        device.queue.get_nowait()
+
+
+def receive_into(device, count):
+    # the path of read_worker_thread
+    buffer = bytearray(device.ep_read.wMaxPacketSize)
+    for _ in range(count):
+        size = device.read_into(buffer, timeout=100)
+        device.queue.put(device.parse_received(buffer, size, device.timeline.now()))
+        device.queue.get_nowait()
+
+
+def per_report_us(function, device):
+    seconds = min(
+        timeit.repeat(lambda: function(device, FRAMES), number=1, repeat=REPEAT)
+    )
+    return seconds / FRAMES * 1e6
+
+
+if __name__ == "__main__":
+    device = adapter(reports(input_device_traffic(1000)))
+    # back to back 24 bit frames with the shortest forward frame settling time
+    bus_us = (frame_duration(24) + PRIORITY_WINDOWS[0][1]) * 1e6
+    print(f"{FRAMES} 24 bit reports, best of {REPEAT}")
+    print(f"bus, one frame every      : {bus_us:9.1f} us")
+    for name, function in (
+        ("former bytewise parsing", receive_bytewise),
+        ("read_raw + parse_report", receive_report),
+        ("read_into + parse_received", receive_into),
+    ):
+        cost = per_report_us(function, device)
+        print(f"{name:26}: {cost:9.3f} us/report, {bus_us / cost:6.0f} buses")
@@ -1,10 +1,11 @@
-import pytest
 import logging
 
-from connection.status import DaliStatus
-from connection.serial import DaliSerial
-from connection.hid import DaliUsb
+import pytest
+
 from connection.frame import DaliFrame
+from connection.hid import DaliUsb
+from connection.serial import DaliSerial
+from connection.status import DaliStatus
 
 serial_port = "/dev/ttyUSB0"
 logger = logging.getLogger(__name__)
@@ -1,4 +1,5 @@
 import pytest
+
 import DALI
 
 ADDRESS_WIDTH = 14
@@ -249,3 +250,14 @@ def test_initialise_short_address():
 def test_initialise_special_cases(data, target_command):
     decoded_command = DALI.Decode(16, data, DALI.DeviceType.NONE)
     assert decoded_command.cmd() == " " * ADDRESS_WIDTH + target_command
+
+
+def test_unsupported_device_type_decodes_as_gear_command():
+    # enabled device types without own command set fall back to iec62386 102
+    for opcode in range(0x100):
+        for address_byte in (0x01, 0x81, 0xFF):
+            data = (address_byte << 8) + opcode
+            assert (
+                DALI.Decode(16, data, 1).cmd()
+                == DALI.Decode(16, data, DALI.DeviceType.NONE).cmd()
+            )
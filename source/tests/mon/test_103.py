@@ -1,4 +1,5 @@
 import pytest
+
 import DALI
 
 ADDRESS_WIDTH = 14
@@ -1,4 +1,5 @@
 import pytest
+
 import DALI
 
 ADDRESS_WIDTH = 14
@@ -39,7 +40,7 @@ def test_dt6_command(name, opcode):
     target_command = "BC GEAR UN".ljust(ADDRESS_WIDTH) + name
     assert decoded_command.cmd() == target_command
     # short address
-    for short_address in range(0, 0x40):
+    for short_address in range(0x40):
         decoded_command = DALI.Decode(
             length=16,
             data=0x0100 + (short_address << 9) + opcode,
@@ -48,7 +49,7 @@ def test_dt6_command(name, opcode):
         target_command = f"G{short_address:02}".ljust(ADDRESS_WIDTH) + name
         assert decoded_command.cmd() == target_command
     # group address
-    for group_address in range(0, 0x10):
+    for group_address in range(0x10):
         decoded_command = DALI.Decode(
             length=16,
             data=0x8100 + (group_address << 9) + opcode,
@@ -93,7 +94,7 @@ def test_dt6_undefined_codes(opcode):
     target_command = "BC GEAR UN".ljust(ADDRESS_WIDTH) + "---"
     assert decoded_command.cmd()[: len(target_command)] == target_command
     # short address
-    for short_address in range(0, 0x40):
+    for short_address in range(0x40):
         decoded_command = DALI.Decode(
             length=16,
             data=0x0100 + (short_address << 9) + opcode,
@@ -102,7 +103,7 @@ def test_dt6_undefined_codes(opcode):
         target_command = f"G{short_address:02}".ljust(ADDRESS_WIDTH) + "---"
         assert decoded_command.cmd()[: len(target_command)] == target_command
     # group address
-    for group_address in range(0, 0x10):
+    for group_address in range(0x10):
         decoded_command = DALI.Decode(
             length=16,
             data=0x8100 + (group_address << 9) + opcode,
@@ -1,4 +1,3 @@
-import pytest
 import DALI
 
 ADDRESS_WIDTH = 14
@@ -0,0 +1,105 @@
+import asyncio
+import errno
+import os
+import time
+
+import pytest
+
+import connection.hid
+from connection.aio import AsyncDaliSerial, AsyncDaliUsb
+from connection.frame import DaliFrame
+from connection.status import DaliStatus
+
+pytest.importorskip("serial")
+
+
+def open_pty():
+    controller, device = os.openpty()
+    return controller, os.ttyname(device)
+
+
+def test_frames_from_serial_port():
+    async def receive():
+        controller, portname = open_pty()
+        connection = AsyncDaliSerial(portname)
+        connection.start_receive()
+        os.write(controller, b"{00000001:10 0000FF06}\n{00000002:08 0000")
+        first = await connection.get_next(timeout=1)
+        os.write(controller, b"0012}\n")
+        second = await connection.get_next(timeout=1)
+        third = await connection.get_next(timeout=0.05)
+        connection.close()
+        frames = [frame async for frame in connection]
+        os.close(controller)
+        return first, second, third, frames
+
+    first, second, third, frames = asyncio.run(receive())
+    assert (first.length, first.data) == (16, 0xFF06)
+    assert (second.length, second.data) == (8, 0x12)
+    assert third.status.status == DaliStatus.TIMEOUT
+    assert frames == []
+
+
+def test_query_reply():
+    async def query():
+        controller, portname = open_pty()
+        connection = AsyncDaliSerial(portname)
+        connection.start_receive()
+        reply = asyncio.create_task(
+            connection.query_reply(DaliFrame(length=16, data=0xFF90))
+        )
+        await asyncio.sleep(0.05)
+        command = os.read(controller, 64)
+        os.write(controller, b"{00000001>10 0000FF90}\n{00000002:08 000000FF}\n")
+        backframe = await reply
+        # frames are also seen by the monitor loop
+        monitored = [await connection.get_next(timeout=1) for _ in range(2)]
+        connection.close()
+        os.close(controller)
+        return command, backframe, monitored
+
+    command, backframe, monitored = asyncio.run(query())
+    assert command == b"Q1 10 FF90\r"
+    assert backframe.length == 8
+    assert backframe.data == 0xFF
+    assert [frame.data for frame in monitored] == [0xFF90, 0xFF]
+
+
+class SlowUsb:
+    # every read blocks until its timeout, like an idle bus
+    def __init__(self, events):
+        self.events = events
+        self.device = object()
+        self.ep_read = type("Endpoint", (), {"wMaxPacketSize": 64})
+
+    def read_into(self, buffer, timeout):
+        import usb
+
+        self.events.append("read")
+        time.sleep(timeout / 1000)
+        self.events.append("timeout")
+        raise usb.USBError("timeout", errno=errno.ETIMEDOUT)
+
+
+def test_usb_cancelled_read_releases_device(monkeypatch):
+    usb = pytest.importorskip("usb")
+    events = []
+    monkeypatch.setattr(connection.hid, "DaliUsb", lambda: SlowUsb(events))
+    monkeypatch.setattr(
+        usb.util, "dispose_resources", lambda device: events.append(device)
+    )
+
+    async def cancel():
+        first, second = AsyncDaliUsb(), AsyncDaliUsb()
+        first.start_receive()
+        await asyncio.sleep(0.02)
+        first.task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first.task
+        second.executor.shutdown()
+        return first, second
+
+    first, second = asyncio.run(cancel())
+    # the pending read ended before the device was released
+    assert events == ["read", "timeout", first.device.device]
+    assert first.executor is not second.executor
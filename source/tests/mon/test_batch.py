@@ -0,0 +1,64 @@
+import pytest
+
+import DALI
+
+np = pytest.importorskip("numpy")
+
+
+def decode_names(lengths, data, device_types=None):
+    result = DALI.decode_batch(np.array(lengths), np.array(data), device_types)
+    return [result.mnemonics[mnemonic] for mnemonic in result.mnemonic], result
+
+
+def test_gear_frames():
+    names, result = decode_names([16, 16, 16, 16], [0x0102, 0x8B05, 0xFE80, 0xA300])
+    assert names == ["DOWN", "RECALL MAX LEVEL", "DAPC", "DTR0"]
+    assert list(result.address_kind) == [
+        DALI.AddressKind.GEAR,
+        DALI.AddressKind.GEAR_GROUP,
+        DALI.AddressKind.GEAR_BROADCAST,
+        DALI.AddressKind.SPECIAL,
+    ]
+    assert list(result.address) == [0, 5, 0, 0xA3]
+    assert list(result.opcode) == [0x02, 0x05, 0x80, 0x00]
+
+
+def test_enable_device_type_from_previous_frame():
+    names, _ = decode_names([16, 16, 16], [0xC106, 0xFFF1, 0xFFF1])
+    assert names == [
+        "ENABLE DEVICE TYPE",
+        "QUERY FAILURE STATUS",
+        "--- CODE 0xF1 = 241 UNKNOWN CONTROL GEAR COMMAND",
+    ]
+    names, _ = decode_names([16, 16], [0xFFF1, 0xFFF1], np.array([8, 0]))
+    assert names == ["STORE XY-COORDINATE PRIMARY N", names[1]]
+
+
+def test_device_frames():
+    names, result = decode_names(
+        [24, 24, 24, 24], [0x010121, 0x03FE30, 0x0A8523, 0xC10300]
+    )
+    assert names == [
+        "SET HOLD TIMER (DTR0) - TYPE 303",
+        "QUERY DEVICE STATUS",
+        "EVENT DATA",
+        "COMPARE",
+    ]
+    assert list(result.address_kind[:3]) == [DALI.AddressKind.DEVICE] * 3
+    assert list(result.address[:3]) == [0, 1, 5]
+    assert list(result.instance_kind[:3]) == [
+        DALI.InstanceKind.NUMBER,
+        DALI.InstanceKind.DEVICE,
+        DALI.InstanceKind.NUMBER,
+    ]
+    assert list(result.instance[:3]) == [1, 0, 1]
+    assert result.opcode[2] == 0x123
+
+
+def test_mixed_lengths_match_decode():
+    lengths = [8, 16, 24, 25, 32, 32, 20]
+    data = [0x55, 0x0100, 0x7FEFC3, 0x0A1FF01, 0xFEFB0300, 0xCB010203, 0x1]
+    names, _ = decode_names(lengths, data)
+    for length, frame, name in zip(lengths, data, names):
+        command = DALI.Decode(length, frame).cmd()[DALI.Decode.ADDRESS_WIDTH :]
+        assert command.startswith(name)
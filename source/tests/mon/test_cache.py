@@ -0,0 +1,52 @@
+from pathlib import Path
+
+import pytest
+
+import DALI
+from monitor import run
+
+
+def test_hits_and_misses():
+    cache = DALI.DecodeCache(capacity=4)
+    first = cache.decode(16, 0xFF05)
+    second = cache.decode(16, 0xFF05)
+    assert first == second
+    assert first[1] == DALI.Decode(16, 0xFF05).cmd()
+    assert (cache.hits, cache.misses, cache.evictions) == (1, 1, 0)
+    assert cache.hit_rate() == 0.5
+
+
+def test_device_type_is_part_of_key():
+    cache = DALI.DecodeCache()
+    assert cache.decode(16, 0xC106)[2] == DALI.DeviceType.LED
+    led = cache.decode(16, 0xFFF1, DALI.DeviceType.LED)
+    none = cache.decode(16, 0xFFF1, DALI.DeviceType.NONE)
+    assert led[1] != none[1]
+    # other frame lengths do not depend on the device type
+    cache.decode(24, 0x010121, DALI.DeviceType.LED)
+    cache.decode(24, 0x010121, DALI.DeviceType.NONE)
+    assert cache.hits == 1
+
+
+def test_least_recently_used_is_evicted():
+    cache = DALI.DecodeCache(capacity=2)
+    cache.decode(8, 0x01)
+    cache.decode(8, 0x02)
+    cache.decode(8, 0x01)
+    cache.decode(8, 0x03)
+    assert cache.evictions == 1
+    assert len(cache) == 2
+    cache.decode(8, 0x01)
+    assert cache.hits == 2
+
+
+def test_invalid_capacity():
+    with pytest.raises(ValueError):
+        DALI.DecodeCache(capacity=0)
+
+
+def test_summary_on_exit(capsys):
+    # the counters are shown without --debug
+    sample = Path(__file__).resolve().parents[1] / "sample.txt"
+    run(False, False, False, 16, path=str(sample))
+    assert "decode cache: " in capsys.readouterr().err
@@ -0,0 +1,70 @@
+import io
+
+import pytest
+
+import capture
+from connection.status import DaliStatus
+from pipeline import parse, read_lines
+
+TEXT = b"""{00000001:10 0000FF06}
+{00000002>10 0000FF90}
+garbage
+
+{00000003:91 00000000}
+{00000004:82 00012345}
+"""
+
+
+def test_convert_and_read(tmp_path):
+    path = tmp_path / "capture.dcap"
+    assert capture.convert(io.BytesIO(TEXT), path) == (4, 1)
+    assert capture.is_capture(path)
+    assert path.stat().st_size == capture.binary.HEADER.size + 4 * 10
+
+    expected = list(parse(read_lines(io.StringIO(TEXT.decode()))))
+    with capture.CaptureReader(path) as reader:
+        assert len(reader) == 4
+        frames = list(reader)
+        assert [frame[:3] for frame in frames] == [frame[:3] for frame in expected]
+        assert [frame.status.status for frame in frames] == [
+            DaliStatus.FRAME,
+            DaliStatus.LOOPBACK,
+            DaliStatus.FAILURE,
+            DaliStatus.TIMING,
+        ]
+        assert frames[3].status.message == expected[3].status.message
+        assert [frame.data for frame in reader.frames(1, 3)] == [0xFF90, 0]
+
+
+def test_numpy_view(tmp_path):
+    np = pytest.importorskip("numpy")
+    path = tmp_path / "capture.dcap"
+    capture.convert(io.BytesIO(TEXT), path)
+    with capture.CaptureReader(path) as reader:
+        records = reader.records()
+        assert list(records["timestamp"]) == [1, 2, 3, 4]
+        assert list(records["flags"]) == [0, 1, 0, 0]
+        assert records["data"].dtype == np.dtype("<u4")
+    # the array outlives the reader
+    assert list(records["data"]) == [0xFF06, 0xFF90, 0, 0x12345]
+
+
+def test_close_with_unfinished_frames(tmp_path):
+    path = tmp_path / "capture.dcap"
+    capture.convert(io.BytesIO(TEXT), path)
+    with capture.CaptureReader(path) as reader:
+        frames = reader.frames()
+        raw = reader.raw()
+        assert next(frames).data == 0xFF06
+        next(raw)
+    assert [frame.data for frame in frames] == [0xFF90, 0, 0x12345]
+    assert len(list(raw)) == 3
+    reader.close()
+
+
+def test_not_a_capture(tmp_path):
+    path = tmp_path / "capture.txt"
+    path.write_bytes(TEXT)
+    assert not capture.is_capture(path)
+    with pytest.raises(capture.CaptureFormatError):
+        capture.CaptureReader(path)
@@ -0,0 +1,63 @@
+import io
+
+import pipeline
+from pipeline.correlate import answer_meaning
+
+CAPTURE = [
+    "{00000064:10 000023A0}",  # G17 QUERY ACTUAL LEVEL
+    "{0000006D:08 000000C8}",
+    "{000000C8:10 00002390}",  # G17 QUERY STATUS
+    "{000000D2:08 00000024}",
+    "{0000012C:10 00002392}",  # G17 QUERY LAMP FAILURE, no answer means NO
+    "{00000190:10 00000190}",  # G00 QUERY STATUS
+    "{0000019A:84 00000000}",
+    "{000001F4:18 0001FE30}",  # D00 QUERY DEVICE STATUS, answered too late
+    "{00000258:08 00000001}",
+]
+
+
+def correlate(lines, replies):
+    correlator = pipeline.QueryCorrelator(on_reply=replies.append)
+    frames = pipeline.parse(pipeline.read_lines(io.StringIO("\n".join(lines))))
+    decoder = pipeline.Decoder(annotators=[correlator])
+    records = list(decoder(frames))
+    correlator.finish()
+    return correlator, records
+
+
+def test_replies():
+    replies = []
+    correlator, records = correlate(CAPTURE, replies)
+    assert [(reply.address, reply.command, reply.meaning) for reply in replies] == [
+        ("G17", "QUERY ACTUAL LEVEL", "LEVEL 200"),
+        ("G17", "QUERY STATUS", "lamp on, reset state"),
+        ("G17", "QUERY LAMP FAILURE", "NO"),
+        ("G00", "QUERY STATUS", "GARBLED"),
+        ("D00", "QUERY DEVICE STATUS", "NO REPLY"),
+    ]
+    assert round(replies[0].latency, 3) == 0.009
+    assert records[1].command_string.endswith("<- G17 QUERY ACTUAL LEVEL: LEVEL 200")
+    # the late backframe is not annotated
+    assert "<-" not in records[-1].command_string
+    histogram = correlator.latency[("G17", "QUERY STATUS")]
+    assert (histogram.count, round(histogram.sum, 3)) == (1, 0.01)
+    assert correlator.no_reply[("D00", "QUERY DEVICE STATUS")] == 1
+    assert correlator.garbled[("G00", "QUERY STATUS")] == 1
+    assert len(correlator.summary()) == 5
+
+
+def test_last_query_without_answer():
+    replies = []
+    correlate(CAPTURE[:1], replies)
+    assert [reply.meaning for reply in replies] == ["NO REPLY"]
+
+
+def test_answer_meaning():
+    assert answer_meaning("QUERY CONTROL GEAR PRESENT", 0xFF) == "YES"
+    assert answer_meaning("QUERY SCENE LEVEL 3", 0xFF) == "MASK"
+    assert answer_meaning("QUERY GROUPS 8-15", 0b101) == "GROUPS 8,10"
+    assert answer_meaning("QUERY DEVICE STATUS", 0) == "OK"
+    assert answer_meaning("QUERY FADE TIME / FADE RATE", 0x27) == (
+        "FADE TIME 2, FADE RATE 7"
+    )
+    assert answer_meaning("QUERY RANDOM ADDRESS (H)", 12) == "12"
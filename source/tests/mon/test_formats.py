@@ -0,0 +1,94 @@
+import csv
+import io
+import json
+
+import pytest
+
+import pipeline
+from pipeline.structured import FIELDS, CsvSink, JsonLinesSink
+
+CAPTURE = (
+    "{00000001:10 0000FF06}\n"
+    "{00000002:91 00000000}\n"
+    "{00000003:10 0000C108}\n"
+    "{00000005:10 0000FFE2}\n"
+)
+
+
+def records():
+    frames = pipeline.parse(pipeline.read_lines(io.StringIO(CAPTURE)))
+    return list(pipeline.Decoder(split=True)(frames))
+
+
+def test_split_matches_text():
+    frames = pipeline.parse(pipeline.read_lines(io.StringIO(CAPTURE)))
+    for text, record in zip(pipeline.Decoder()(frames), records()):
+        if record.is_error:
+            assert record.address is None and record.command is None
+        else:
+            assert text.command_string == record.command_string
+            assert text.command_string.split() == (
+                record.address.split() + record.command.split()
+            )
+
+
+def test_jsonl():
+    stream = io.StringIO()
+    JsonLinesSink(stream)(records())
+    rows = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert rows[0] == {
+        "timestamp": 0.001,
+        "delta": 0.0,
+        "length": 16,
+        "data": 0xFF06,
+        "status": 2,
+        "message": rows[0]["message"],
+        "address": "BC GEAR",
+        "command": "RECALL MIN LEVEL",
+    }
+    assert rows[1]["address"] is None
+    assert rows[1]["message"] == "ERROR: SYSTEM FAILURE"
+    # device type context of the ENABLE DEVICE TYPE 8 before
+    assert rows[3]["command"] == "ACTIVATE"
+    assert rows[3]["delta"] == 0.002
+
+
+def test_csv():
+    stream = io.StringIO()
+    CsvSink(stream)(records())
+    rows = list(csv.reader(io.StringIO(stream.getvalue())))
+    assert tuple(rows[0]) == FIELDS
+    assert len(rows) == 5
+    assert rows[1][6:] == ["BC GEAR", "RECALL MIN LEVEL"]
+    assert rows[2][6:] == ["", ""]
+
+
+def test_arrow_reads_back_memory_mapped(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    from pipeline.structured import ArrowSink
+
+    path = tmp_path / "capture.arrow"
+    with open(path, "wb") as stream:
+        sink = ArrowSink(stream, batch_size=3)
+        sink(records())
+    reader = pa.ipc.open_file(pa.memory_map(str(path)))
+    assert reader.num_record_batches == 2
+    table = reader.read_all()
+    assert table.column_names == list(FIELDS)
+    assert table.column("data").to_pylist() == [0xFF06, 0, 0xC108, 0xFFE2]
+    assert table.column("command").to_pylist()[1] is None
+
+
+def test_parallel_matches_sequential(tmp_path, capsys):
+    from monitor import main_file
+    from parallel import main_parallel
+
+    path = tmp_path / "capture.txt"
+    path.write_text(CAPTURE)
+    with open(path) as capture:
+        sink = pipeline.make_sink("csv")
+        main_file(pipeline.Decoder(split=True), sink, capture)
+    expected = capsys.readouterr().out
+    sink = pipeline.make_sink("csv")
+    main_parallel(path, 2, pipeline.Decoder(split=True), sink, chunk_size=20)
+    assert capsys.readouterr().out == expected
@@ -0,0 +1,64 @@
+import io
+
+import capture
+from monitor import main_file, main_range
+from pipeline import Decoder, TextSink
+
+CAPTURE = "".join(
+    f"{{{timestamp:08X}:10 0000{data:04X}}}\n"
+    for timestamp, data in enumerate(
+        [0xFF06, 0xC108, 0xFFE2, 0xC108, 0xFFE2, 0xFF05, 0xC108, 0xFFE2] * 4, start=1
+    )
+)
+
+
+def write_capture(tmp_path, text=CAPTURE):
+    path = tmp_path / "capture.txt"
+    path.write_text(text)
+    return path
+
+
+def decode_range(path, start, stop):
+    output = io.StringIO()
+    main_range(Decoder(), TextSink(stream=output), path, start, stop)
+    return output.getvalue().splitlines()
+
+
+def test_checkpoints_keep_context(tmp_path):
+    path = write_capture(tmp_path)
+    index = capture.CaptureIndex.build(path, interval=3)
+    assert len(index.checkpoints) == 11
+    checkpoint = index.checkpoints[1]
+    assert checkpoint.timestamp == 4
+    assert checkpoint.last_timestamp == 3
+    assert checkpoint.device_type == 0
+    assert index.checkpoints[5].device_type == 8
+    assert index.locate(5) == checkpoint
+    assert index.locate(0) == index.checkpoints[0]
+
+
+def test_range_matches_full_decode(tmp_path):
+    path = write_capture(tmp_path)
+    output = io.StringIO()
+    with open(path) as lines:
+        main_file(Decoder(), TextSink(stream=output), lines)
+    expected = output.getvalue().splitlines()
+    assert decode_range(path, 0.005, 0.012) == expected[4:12]
+    assert decode_range(path, None, 0.002) == expected[:2]
+    assert decode_range(path, 0.031, None) == expected[30:]
+
+    converted = tmp_path / "capture.dcap"
+    with open(path, "rb") as lines:
+        capture.convert(lines, converted)
+    assert decode_range(converted, 0.005, 0.012) == expected[4:12]
+
+
+def test_index_is_saved_and_rebuilt(tmp_path):
+    path = write_capture(tmp_path)
+    index = capture.index_for(path, interval=5)
+    saved = capture.CaptureIndex.load(f"{path}.idx", capture.index._stamp(path))
+    assert saved.checkpoints == index.checkpoints
+
+    write_capture(tmp_path, CAPTURE * 2)
+    assert capture.CaptureIndex.load(f"{path}.idx", capture.index._stamp(path)) is None
+    assert len(capture.index_for(path, interval=5).checkpoints) == 13
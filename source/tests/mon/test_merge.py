@@ -0,0 +1,125 @@
+import asyncio
+import io
+import os
+
+import pytest
+
+import monitor
+import pipeline
+from monitor import main_merged
+from pipeline.merge import ReorderWindow
+
+MS = 1000000
+
+
+def test_reorder_window():
+    reorder = ReorderWindow(0.01, clock=lambda: 0)
+    reorder.push(3 * MS, "c")
+    reorder.push(1 * MS, "a")
+    reorder.push(2 * MS, "b")
+    reorder.push(2 * MS, "b2")
+    assert reorder.pop_ready(now=5 * MS) == []
+    assert reorder.delay(now=5 * MS) == pytest.approx(0.006)
+    assert reorder.pop_ready(now=12 * MS) == ["a", "b", "b2"]
+    assert len(reorder) == 1
+    reorder.push(1 * MS, "late")
+    assert reorder.late == 1
+    assert reorder.drain() == ["late", "c"]
+    assert reorder.delay() == pytest.approx(0.01)
+
+
+def test_sink_bus_column():
+    stream = io.StringIO()
+    sink = pipeline.make_sink("csv", stream=stream, buses=True)
+    frames = pipeline.parse(["{00000001:10 0000FF06}"])
+    records = [
+        record._replace(frame=record.frame._replace(bus="ttyUSB3"))
+        for record in pipeline.Decoder(split=True)(frames)
+    ]
+    sink(records)
+    header, line = stream.getvalue().splitlines()
+    assert header.startswith("bus,timestamp,")
+    assert line.startswith("ttyUSB3,0.001,")
+    stream = io.StringIO()
+    pipeline.TextSink(stream=stream, colour=False, buses=True)(records)
+    assert stream.getvalue().startswith("ttyUSB3  | 0.001 | ")
+
+
+def test_merged_serial_ports():
+    # two buses, every one decoded with its own device type context
+    pytest.importorskip("serial")
+    from connection.aio import AsyncDaliSerial
+
+    async def monitor():
+        ports = [os.openpty() for _ in range(2)]
+        connections = []
+        for number, (_, device) in enumerate(ports):
+            connection = AsyncDaliSerial(os.ttyname(device))
+            connection.bus = f"bus{number}"
+            connections.append(connection)
+        stream = io.StringIO()
+        sink = pipeline.TextSink(stream=stream, colour=False, buses=True)
+        task = asyncio.create_task(main_merged(connections, sink, window=0.02))
+        # ENABLE DEVICE TYPE 6 on bus0 only, then the same command on both
+        lines = (
+            (0, b"{00001000:10 0000C106}\n"),
+            (1, b"{00500000:10 0000FF90}\n"),
+            (0, b"{00001020:10 0000FFE0}\n"),
+            (1, b"{00500020:10 0000FFE0}\n"),
+        )
+        for number, line in lines:
+            os.write(ports[number][0], line)
+            await asyncio.sleep(0.03)
+        for connection in connections:
+            connection.close()
+        await task
+        for controller, device in ports:
+            os.close(controller)
+            os.close(device)
+        return stream.getvalue().splitlines()
+
+    lines = asyncio.run(monitor())
+    assert [line.split(" | ")[0].strip() for line in lines] == [
+        "bus0",
+        "bus1",
+        "bus0",
+        "bus1",
+    ]
+    assert lines[2].endswith("REFERENCE SYSTEM POWER")
+    assert "UNKNOWN CONTROL GEAR COMMAND" in lines[3]
+
+
+def test_replies_of_two_buses(monkeypatch, capsys):
+    # one summary per bus, every line names its bus
+    pytest.importorskip("serial")
+    ports = [os.openpty() for _ in range(2)]
+    names = [os.ttyname(device) for _, device in ports]
+
+    async def stop_after_frames(connections, sink, new_decoder):
+        task = asyncio.create_task(main_merged(connections, sink, new_decoder, 0.02))
+        lines = (
+            (0, b"{00000064:10 000023A0}\n"),
+            (0, b"{0000006D:08 000000C8}\n"),
+            (1, b"{00000064:10 00002390}\n"),
+        )
+        for number, line in lines:
+            os.write(ports[number][0], line)
+            await asyncio.sleep(0.03)
+        for connection in connections:
+            connection.close()
+        await task
+
+    monkeypatch.setattr(monitor, "main_merged", stop_after_frames)
+    monitor.run(False, False, False, 0, ports=names, replies=True)
+    for controller, device in ports:
+        os.close(controller)
+        os.close(device)
+    buses = [os.path.basename(name) for name in names]
+    summary = [
+        line for line in capsys.readouterr().err.splitlines() if "replies" in line
+    ]
+    assert len(summary) == 2
+    assert summary[0].startswith(f"{buses[0]}: G17")
+    assert "QUERY ACTUAL LEVEL" in summary[0]
+    assert summary[1].startswith(f"{buses[1]}: G17")
+    assert "QUERY STATUS" in summary[1]
@@ -0,0 +1,111 @@
+import asyncio
+import io
+import urllib.request
+
+import pipeline
+from connection.aio import AsyncConnection
+from connection.ring import QUEUE_SIZE, Overflow, RingBuffer
+from pipeline.metrics import Metrics, queue_depth, serve_metrics
+
+CAPTURE = (
+    "{00000001:10 0000FF06}\n"
+    "{00000002:10 00000190}\n"
+    "{00000003:84 00000000}\n"
+    "{00000004:91 00000000}\n"
+    "{00000005:82 00012345}\n"
+)
+
+
+class Connection:
+    def __init__(self, frames=0):
+        self.queue = RingBuffer(4)
+        for frame in range(frames):
+            self.queue.put(frame)
+        self.queue.get()
+        self.dropped = self.queue.dropped
+        self.high_water = self.queue.high_water
+
+
+def metered(metrics):
+    frames = pipeline.parse(pipeline.read_lines(io.StringIO(CAPTURE)))
+    return list(metrics.decoder()(frames))
+
+
+def test_exposition():
+    metrics = Metrics()
+    metrics.watch(Connection(6))
+    assert len(metered(metrics)) == 5
+    text = metrics.exposition()
+    assert 'dali_frames_total{length="16",address="BC GEAR"} 1' in text
+    assert 'dali_frames_total{length="16",address="G00"} 1' in text
+    assert 'dali_errors_total{kind="collision"} 1' in text
+    assert 'dali_errors_total{kind="system_failure"} 1' in text
+    assert 'dali_errors_total{kind="timing"} 1' in text
+    assert 'dali_queue_depth{connection="0"} 3' in text
+    assert 'dali_queue_high_water{connection="0"} 4' in text
+    assert 'dali_queue_dropped_total{connection="0"} 2' in text
+    assert 'dali_decode_seconds_bucket{le="+Inf"} 5' in text
+    assert "dali_decode_seconds_count 5" in text
+    assert text.endswith("# EOF\n")
+
+
+def test_async_queue_drops():
+    async def fill():
+        connection = AsyncConnection()
+        for frame in range(AsyncConnection.QUEUE_MAXSIZE + 2):
+            connection.dispatch(frame)
+        return connection
+
+    connection = asyncio.run(fill())
+    # the same buffer as the threaded connections
+    assert AsyncConnection.QUEUE_MAXSIZE == QUEUE_SIZE
+    assert connection.dropped == 2
+    assert connection.high_water == AsyncConnection.QUEUE_MAXSIZE
+    assert queue_depth(connection) == AsyncConnection.QUEUE_MAXSIZE
+
+
+def test_async_overflow_policies():
+    async def fill(overflow):
+        connection = AsyncConnection(overflow)
+        for frame in range(AsyncConnection.QUEUE_MAXSIZE + 2):
+            await connection.dispatch_wait(frame)
+        return connection
+
+    connection = asyncio.run(fill(Overflow.DROP_NEWEST))
+    assert connection.dropped == 2
+    assert connection.queue.get_nowait() == 0
+
+    async def block():
+        connection = AsyncConnection(Overflow.BLOCK)
+        reader = asyncio.create_task(fill_blocked(connection))
+        await asyncio.sleep(0.01)
+        # the reader waits for room instead of dropping
+        assert not reader.done()
+        frames = [connection.queue.get_nowait() for _ in range(3)]
+        await reader
+        return connection, frames
+
+    async def fill_blocked(connection):
+        for frame in range(AsyncConnection.QUEUE_MAXSIZE + 2):
+            await connection.dispatch_wait(frame)
+
+    connection, frames = asyncio.run(block())
+    assert frames == [0, 1, 2]
+    assert connection.dropped == 0
+    assert connection.high_water == AsyncConnection.QUEUE_MAXSIZE
+
+
+def test_http_endpoint():
+    metrics = Metrics()
+    metered(metrics)
+    server = serve_metrics(metrics, 0)
+    try:
+        url = f"http://127.0.0.1:{server.server_port}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as response:
+            assert response.headers["Content-Type"].startswith(
+                "application/openmetrics-text"
+            )
+            assert response.read().decode() == metrics.exposition()
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,117 @@
+import io
+import itertools
+
+import pytest
+from click.testing import CliRunner
+
+import capture
+import DALI
+from dali_mon import dali_mon
+from monitor import main_file, run
+from parallel import chunk_offsets, main_parallel
+from pipeline import Decoder, TextSink
+
+CAPTURE = [
+    "{00000001:10 0000FF06}",
+    "{00000002:10 0000C108}",
+    "{00000003:10 0000FFE2}",
+    "{00000004:82 00012345}",
+    "{00000005:10 0000C106}",
+    "{00000006:82 00012345}",
+    "{00000007:10 0000FFE2}",
+    "{00000008:18 00FFFE00}",
+    "{00000009:10 0000FFE2}",
+    "{0000000A:08 00000012}",
+]
+
+
+def write_capture(tmp_path):
+    path = tmp_path / "capture.txt"
+    path.write_text("\n".join(CAPTURE) + "\n")
+    return path
+
+
+def test_chunks_end_on_lines(tmp_path):
+    path = write_capture(tmp_path)
+    data = path.read_bytes()
+    offsets = chunk_offsets(path, 7)
+    assert offsets[0][0] == 0
+    assert offsets[-1][1] == len(data)
+    for (_, end), (start, _) in itertools.pairwise(offsets):
+        assert end == start
+        assert data[end - 1 : end] == b"\n"
+
+
+def test_parallel_output_matches_sequential(tmp_path, capsys):
+    path = write_capture(tmp_path)
+    with open(path) as capture:
+        main_file(Decoder(), TextSink(), capture)
+    expected = capsys.readouterr().out
+    assert "ACTIVATE" in expected
+
+    # every chunk boundary, including ones right after ENABLE DEVICE TYPE
+    for chunk_size in (1, 23, 40, 100):
+        main_parallel(path, 2, Decoder(), TextSink(), chunk_size=chunk_size)
+        assert capsys.readouterr().out == expected
+
+
+@pytest.mark.parametrize(
+    "option", [["--stats"], ["--replies"], ["--timing"], ["--metrics", "0"]]
+)
+def test_jobs_rejected_with_whole_file_options(tmp_path, option):
+    path = write_capture(tmp_path)
+    result = CliRunner().invoke(dali_mon, ["--file", str(path), "--jobs", "2", *option])
+    assert result.exit_code == 2
+    assert "--jobs can not be combined" in result.output
+
+
+def test_jobs_rejected_with_time_range(tmp_path):
+    path = write_capture(tmp_path)
+    arguments = ["--file", str(path), "--jobs", "2", "--from", "0.002"]
+    result = CliRunner().invoke(dali_mon, arguments)
+    assert result.exit_code == 2
+    assert "--jobs can not be combined with --from and --to" in result.output
+
+
+def test_parallel_absolute_time_of_output(tmp_path, capsys):
+    # the local time is added when the main process writes the lines
+    path = write_capture(tmp_path)
+    sink = TextSink(absolute_time=True, colour=False)
+    sink.local_time = lambda: "output | "
+    main_parallel(path, 2, Decoder(), sink, chunk_size=40)
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == len(CAPTURE)
+    assert all(line.startswith("output | 0.0") for line in lines)
+
+
+def test_jobs_need_capture_file():
+    result = CliRunner().invoke(dali_mon, ["--jobs", "2"])
+    assert result.exit_code == 2
+    assert "--jobs needs a capture --file" in result.output
+
+
+def test_jobs_binary_capture_warns(tmp_path, capsys, caplog):
+    path = tmp_path / "capture.dali"
+    capture.convert(io.BytesIO("\n".join(CAPTURE).encode() + b"\n"), path)
+    run(False, False, False, 0, path=str(path), jobs=2)
+    assert "ACTIVATE" in capsys.readouterr().out
+    assert "binary captures are decoded in one process" in caplog.text
+
+
+def test_parallel_cache_counts(tmp_path, capsys):
+    # the lookups of the workers are added to the cache of the main process
+    path = write_capture(tmp_path)
+    cache = DALI.DecodeCache(16)
+    with open(path) as capture_file:
+        main_file(Decoder(cache), TextSink(), capture_file)
+    parallel = DALI.DecodeCache(16)
+    main_parallel(path, 2, Decoder(parallel), TextSink(), chunk_size=40)
+    assert parallel.hits + parallel.misses == cache.hits + cache.misses > 0
+
+
+def test_cache_rejected_with_structured_format(tmp_path):
+    path = write_capture(tmp_path)
+    arguments = ["--file", str(path), "--cache", "16", "--format", "jsonl"]
+    result = CliRunner().invoke(dali_mon, arguments)
+    assert result.exit_code == 2
+    assert "--cache can not be combined with --format" in result.output
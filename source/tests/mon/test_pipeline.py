@@ -0,0 +1,59 @@
+import io
+
+import DALI
+import pipeline
+
+CAPTURE = """{00000001:10 0000FF06}
+{00000002:10 0000C108}
+
+{00000003:10 0000FFE2}
+{00000004:91 00000000}
+{00000005:10 0000FFE2}
+"""
+
+
+def decoded():
+    return pipeline.run(
+        pipeline.read_lines(io.StringIO(CAPTURE)), pipeline.parse, pipeline.Decoder()
+    )
+
+
+def test_decoder_keeps_context():
+    records = list(decoded())
+    assert len(records) == 5
+    assert records[0].delta == 0
+    assert records[1].delta == 0.001
+    assert records[2].device_type == DALI.DeviceType.COLOUR
+    assert "ACTIVATE" in records[2].command_string
+    assert records[3].is_error
+    assert records[3].device_type == DALI.DeviceType.NONE
+    assert "ACTIVATE" not in records[4].command_string
+
+
+def test_batches_match_single_frames():
+    frames = list(pipeline.parse(pipeline.read_lines(io.StringIO(CAPTURE))))
+    batches = list(pipeline.Decoder().batches(pipeline.batched(frames, 2)))
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert [record[1:] for record in pipeline.flatten(batches)] == [
+        record[1:] for record in decoded()
+    ]
+
+
+def test_stages_and_sinks():
+    tally = pipeline.Tally()
+    collected = []
+    pipeline.run(
+        decoded(), tally, pipeline.commands, pipeline.CallbackSink(collected.append)
+    )
+    assert len(collected) == 4
+    assert tally.counts["ERROR: SYSTEM FAILURE"] == 1
+    assert next(pipeline.errors(decoded())).frame.timestamp == 0.004
+
+
+def test_text_sink():
+    output = io.StringIO()
+    pipeline.run(decoded(), pipeline.TextSink(stream=output))
+    lines = output.getvalue().splitlines()
+    assert len(lines) == 5
+    assert lines[0].endswith("RECALL MIN LEVEL")
+    assert lines[3].endswith("ERROR: SYSTEM FAILURE")
@@ -0,0 +1,26 @@
+import DALI
+
+
+def test_known_commands():
+    commands = dict(DALI.REGISTRY.commands())
+    assert commands[(16, DALI.CommandSpace.GEAR, DALI.DeviceType.NONE, 0xA0)] == (
+        "QUERY ACTUAL LEVEL"
+    )
+    assert commands[(24, DALI.CommandSpace.DEVICE, 0, 0x30)] == "QUERY DEVICE STATUS"
+    assert commands[(25, DALI.CommandSpace.EDALI, DALI.DeviceClass.INPUT, 0xB4)] == (
+        "EVENT MESSAGE BUTTON SHORT PRESS"
+    )
+    assert (16, DALI.CommandSpace.GEAR, DALI.DeviceType.NONE, 0x0D) not in commands
+
+
+def test_commands_by_frame_length():
+    commands = DALI.REGISTRY.commands(frame_length=32)
+    assert len(commands) == 9
+    assert all(key[1] == DALI.CommandSpace.FIRMWARE for key, _ in commands)
+
+
+def test_unknown_codes_are_cached():
+    first = DALI.REGISTRY.get(16, DALI.CommandSpace.GEAR, DALI.DeviceType.LED, 0xE1)
+    second = DALI.REGISTRY.get(16, DALI.CommandSpace.GEAR, DALI.DeviceType.LED, 0xE1)
+    assert first == "--- CODE 0xE1 = 225 UNKNOWN LED GEAR COMMAND"
+    assert first is second
@@ -0,0 +1,74 @@
+import random
+
+import pytest
+
+import DALI
+
+
+def random_frames(count=5000, seed=0):
+    generator = random.Random(seed)
+    frames = []
+    for _ in range(count):
+        length = generator.choice((8, 16, 24, 25, 32))
+        frames.append((length, generator.getrandbits(length)))
+    return frames
+
+
+def test_fields_of_dapc():
+    result = DALI.Decode(16, 0x0A80).fields()
+    assert result.frame_class == 16
+    assert result.address_kind == DALI.AddressKind.GEAR
+    assert result.address == 5
+    assert result.name == "DAPC"
+    assert result.parameter == 0x80
+    assert str(result) == "G05".ljust(DALI.Decode.ADDRESS_WIDTH) + "DAPC 128"
+
+
+def test_fields_of_command_without_parameter():
+    result = DALI.Decode(16, 0x81A0).fields()
+    assert result.address_kind == DALI.AddressKind.GEAR_GROUP
+    assert result.address == 0
+    assert result.opcode == 0xA0
+    assert result.name == "QUERY ACTUAL LEVEL"
+    assert result.parameter is None
+
+
+def test_fields_of_event():
+    result = DALI.Decode(24, 0x0A8523).fields()
+    assert result.address_kind == DALI.AddressKind.DEVICE
+    assert result.address == 5
+    assert result.instance_kind == DALI.InstanceKind.NUMBER
+    assert result.instance == 1
+    assert result.name == "EVENT DATA"
+    assert result.parameter == 0x123
+
+
+def test_fields_keep_device_type():
+    result = DALI.Decode(16, 0xFFF1, DALI.DeviceType.LED).fields()
+    assert result.name == "QUERY FAILURE STATUS"
+    assert str(result) == DALI.Decode(16, 0xFFF1, DALI.DeviceType.LED).cmd()
+
+
+def test_lazy_rendering_matches_cmd():
+    for length, data in random_frames():
+        decoded_command = DALI.Decode(length, data)
+        if length == 24 and (data >> 21) == 0b111:
+            # reserved device addresses have no command string
+            continue
+        assert str(decoded_command.fields()) == decoded_command.cmd()
+
+
+def test_fields_match_batch():
+    np = pytest.importorskip("numpy")
+    frames = random_frames()
+    lengths = np.array([length for length, _ in frames])
+    data = np.array([data for _, data in frames])
+    batch = DALI.decode_batch(lengths, data, np.zeros(len(frames)))
+    for index, (length, data) in enumerate(frames):
+        result = DALI.Decode(length, data).fields()
+        assert result.address_kind == batch.address_kind[index]
+        assert result.address == batch.address[index]
+        assert result.instance_kind == batch.instance_kind[index]
+        assert result.instance == batch.instance[index]
+        assert result.opcode == batch.opcode[index]
+        assert result.mnemonic == batch.mnemonic[index]
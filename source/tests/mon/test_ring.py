@@ -0,0 +1,95 @@
+import queue
+import threading
+
+import pytest
+
+from connection.ring import Overflow, RingBuffer
+
+
+def fill(ring, count):
+    for item in range(count):
+        ring.put(item)
+
+
+def drain(ring):
+    items = []
+    while not ring.empty():
+        items.append(ring.get_nowait())
+    return items
+
+
+def test_fifo():
+    ring = RingBuffer(4)
+    fill(ring, 3)
+    assert ring.qsize() == 3
+    assert drain(ring) == [0, 1, 2]
+    fill(ring, 3)
+    assert drain(ring) == [0, 1, 2]
+    assert ring.dropped == 0
+    assert ring.high_water == 3
+
+
+def test_drop_oldest():
+    ring = RingBuffer(4, Overflow.DROP_OLDEST)
+    fill(ring, 10)
+    assert ring.qsize() == 4
+    assert drain(ring) == [6, 7, 8, 9]
+    assert ring.dropped == 6
+    assert ring.high_water == 4
+
+
+def test_drop_newest():
+    ring = RingBuffer(4, Overflow.DROP_NEWEST)
+    fill(ring, 10)
+    assert drain(ring) == [0, 1, 2, 3]
+    assert ring.dropped == 6
+    assert ring.high_water == 4
+
+
+def test_block():
+    ring = RingBuffer(2, Overflow.BLOCK)
+    fill(ring, 2)
+    with pytest.raises(queue.Full):
+        ring.put(2, timeout=0.01)
+    with pytest.raises(queue.Full):
+        ring.put_nowait(2)
+    assert ring.dropped == 0
+    assert drain(ring) == [0, 1]
+
+
+def test_get_timeout():
+    ring = RingBuffer(2)
+    with pytest.raises(queue.Empty):
+        ring.get(timeout=0.01)
+    with pytest.raises(queue.Empty):
+        ring.get_nowait()
+
+
+def test_invalid():
+    with pytest.raises(ValueError):
+        RingBuffer(0)
+    with pytest.raises(ValueError):
+        RingBuffer(4, "drop-all")
+
+
+@pytest.mark.parametrize("policy", [Overflow.DROP_OLDEST, Overflow.BLOCK])
+def test_threaded(policy):
+    # the consumer sees an increasing sequence and every frame is either
+    # received or counted as dropped
+    ring = RingBuffer(16, policy)
+    count = 20000
+
+    def produce():
+        fill(ring, count)
+        ring.put(None)
+
+    thread = threading.Thread(target=produce)
+    thread.start()
+    received = []
+    while (item := ring.get(timeout=5)) is not None:
+        received.append(item)
+    thread.join()
+    assert received == sorted(received)
+    assert len(received) + ring.dropped == count
+    if policy == Overflow.BLOCK:
+        assert ring.dropped == 0
@@ -1,35 +1,111 @@
-from connection.status import DaliStatus
+import random
+
 from connection.serial import DaliSerial
+from connection.status import DaliStatus
 
 
 def test_raw_from_string():
-    input_string = "{00000000:08 000011}".encode("utf-8")
+    input_string = b"{00000000:08 000011}"
     result = DaliSerial.parse(input_string)
     assert result.timestamp == 0
     assert result.length == 0x8
     assert result.data == 0x11
     assert result.status.status == DaliStatus.FRAME
-    input_string = "{00000001:10 0000FF00}".encode("utf-8")
+    input_string = b"{00000001:10 0000FF00}"
     result = DaliSerial.parse(input_string)
     assert result.timestamp == 0.001
     assert result.length == 0x10
     assert result.data == 0xFF00
     assert result.status.status == DaliStatus.FRAME
-    input_string = "{00000002:18 00123456}".encode("utf-8")
+    input_string = b"{00000002:18 00123456}"
     result = DaliSerial.parse(input_string)
     assert result.timestamp == 0.002
     assert result.length == 0x18
     assert result.data == 0x123456
     assert result.status.status == DaliStatus.FRAME
-    input_string = "{00000003:83 00123456}".encode("utf-8")
+    input_string = b"{00000003:83 00123456}"
     result = DaliSerial.parse(input_string)
     assert result.timestamp == 0.003
     assert result.length == 0x83
     assert result.data == 0x123456
     assert result.status.status == DaliStatus.TIMING
-    input_string = "{00000004:20 87654321}".encode("utf-8")
+    input_string = b"{00000004:20 87654321}"
     result = DaliSerial.parse(input_string)
     assert result.timestamp == 0.004
     assert result.length == 0x20
     assert result.data == 0x87654321
     assert result.status.status == DaliStatus.FRAME
+
+
+def test_buffer_matches_lines():
+    lines = [
+        b"{00000000:08 000011}",
+        b"{00000001:10 0000FF00}",
+        b"{00000002>18 00123456}",
+        b"{00000003:83 00123456}",
+        b"{00000004:20 87654321}",
+        b"{00000005:10 FF06}",
+    ]
+    result = DaliSerial.parse_buffer(b"\n".join(lines) + b"\n")
+    assert result.malformed == 0
+    assert result.records == [DaliSerial.parse_raw(line) for line in lines]
+    for frame, line in zip(result.frames(), lines):
+        expected = DaliSerial.parse(line)
+        assert frame[:3] == expected[:3]
+        assert frame.status.status == expected.status.status
+
+
+def test_buffer_counts_malformed_lines():
+    buffer = b"{00000001:10 FF06}\r\n\r\n  \nnoise\n{0000}\n{00000002:10 FF05}"
+    result = DaliSerial.parse_buffer(buffer)
+    assert [record[3] for record in result.records] == [0xFF06, 0xFF05]
+    assert result.malformed == 2
+
+
+def random_line(generator):
+    # frames, damaged frames and noise, as a serial adapter might send them
+    line = bytearray(
+        b"{%08X%c%02X %X}"
+        % (
+            generator.randrange(1 << 32),
+            generator.choice(b":>"),
+            generator.randrange(0x100),
+            generator.randrange(1 << 32),
+        )
+    )
+    for _ in range(generator.choice((0, 0, 1, 2))):
+        position = generator.randrange(len(line) + 1)
+        change = generator.choice(("insert", "delete", "replace"))
+        byte = generator.choice(b"{}:> 0Fx-_\t")
+        if change == "insert":
+            line.insert(position, byte)
+        elif position < len(line):
+            if change == "delete":
+                del line[position]
+            else:
+                line[position] = byte
+    if generator.random() < 0.1:
+        line *= 2
+    return bytes(line) + generator.choice((b"", b"\r", b" "))
+
+
+def test_buffer_is_parse_per_line():
+    generator = random.Random(0)
+    for _ in range(200):
+        lines = [random_line(generator) for _ in range(generator.randrange(1, 20))]
+        if generator.random() < 0.3:
+            lines.insert(generator.randrange(len(lines)), b" ")
+        buffer = b"\n".join(lines) + generator.choice((b"", b"\n"))
+        result = DaliSerial.parse_buffer(buffer)
+        # the lines as read_lines() passes them to parse()
+        lines = [line.strip(b" \r") for line in buffer.split(b"\n")]
+        frames = [DaliSerial.parse(line) for line in lines]
+        expected = [frame for frame in frames if frame is not None]
+        assert [frame[:3] for frame in result.frames()] == [
+            frame[:3] for frame in expected
+        ]
+        assert [frame.status.status for frame in result.frames()] == [
+            frame.status.status for frame in expected
+        ]
+        blank = sum(not line.strip(b" \t") for line in lines)
+        assert result.malformed == len(frames) - len(expected) - blank
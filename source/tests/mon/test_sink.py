@@ -0,0 +1,91 @@
+import io
+
+import pipeline
+from pipeline.sink import BufferedOutput, TextSink
+
+CAPTURE = "{00000001:10 0000FF06}\n{00000002:91 00000000}\n"
+
+
+class CountingStream(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+def records():
+    frames = pipeline.parse(pipeline.read_lines(io.StringIO(CAPTURE)))
+    return list(pipeline.Decoder()(frames))
+
+
+def test_plain_output_without_tty():
+    stream = io.StringIO()
+    sink = TextSink(stream=stream)
+    assert not sink.colour
+    sink(records())
+    assert stream.getvalue() == (
+        "0.001 |    0.000 |     FF06 | BC GEAR       RECALL MIN LEVEL\n"
+        "0.002 |    0.001 | ERROR: SYSTEM FAILURE\n"
+    )
+
+
+def test_colour_output():
+    stream = io.StringIO()
+    TextSink(stream=stream, colour=True)(records())
+    lines = stream.getvalue().splitlines()
+    assert lines[0] == (
+        "\033[32m0.001 |    0.000 |     FF06 | \033[0m"
+        "\033[97mBC GEAR       RECALL MIN LEVEL\033[0m"
+    )
+    assert (
+        lines[1]
+        == "\033[32m0.002 |    0.001 | \033[0m\033[31mERROR: SYSTEM FAILURE\033[0m"
+    )
+
+
+def test_absolute_time_prefix():
+    stream = io.StringIO()
+    TextSink(absolute_time=True, stream=stream)(records())
+    first, _ = stream.getvalue().splitlines()
+    assert first[8:11] == " | "
+    assert first.endswith("RECALL MIN LEVEL")
+
+
+def test_buffered_until_size_or_flush():
+    stream = CountingStream()
+    output = BufferedOutput(stream, size=10, delay=60)
+    output.write("abc")
+    output.write("def")
+    assert stream.writes == 0
+    output.write("ghij")
+    assert stream.writes == 1
+    output.write("k")
+    output.flush()
+    assert stream.writes == 2
+    assert stream.getvalue() == "abcdefghijk"
+
+
+def test_buffered_until_delay():
+    stream = CountingStream()
+    output = BufferedOutput(stream, size=1000, delay=0)
+    output.write("a")
+    assert stream.writes == 0
+    output.write("b")
+    assert stream.getvalue() == "ab"
+
+
+def test_idle_input_flushes():
+    stream = CountingStream()
+    sink = TextSink(stream=stream, delay=60)
+    blocks = pipeline.read_blocks(
+        io.BytesIO(CAPTURE.encode()), size=4096, idle=sink.flush
+    )
+    frames = pipeline.BlockParser()(blocks)
+    for record in pipeline.Decoder()(frames):
+        sink.write(record)
+        assert stream.writes == 0
+    # the short read marks the input as drained, output is flushed before the next read
+    assert stream.writes == 1
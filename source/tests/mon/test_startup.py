@@ -0,0 +1,63 @@
+import subprocess
+import sys
+from pathlib import Path
+
+SOURCE = Path(__file__).resolve().parents[2]
+SAMPLE = SOURCE / "tests" / "sample.txt"
+
+# generous, the point is to catch eager imports of decoders or backends
+BUDGET_US = 1_000_000
+
+
+def imported_modules(*args, stdin=None):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "dali_mon.py", *args],
+        cwd=SOURCE,
+        stdin=stdin,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def test_version_loads_no_decoders():
+    modules = imported_modules("--version")
+    assert "DALI" not in modules
+    assert "monitor" not in modules
+    assert "usb" not in modules
+    assert "serial" not in modules
+    assert "termcolor" not in modules
+
+
+def test_commands_loads_no_backends():
+    modules = imported_modules("--commands")
+    assert "DALI" in modules
+    assert "usb" not in modules
+    assert "serial" not in modules
+    assert "termcolor" not in modules
+    assert modules["DALI"] < BUDGET_US
+
+
+def test_file_mode_loads_no_backends():
+    with open(SAMPLE) as sample:
+        modules = imported_modules(stdin=sample)
+    assert "usb" not in modules
+    assert "serial" not in modules
+    # the event loop is only needed for ports and several adapters
+    assert "asyncio" not in modules
+    assert "ssl" not in modules
+    assert modules["monitor"] < BUDGET_US
+
+
+def test_capture_file_loads_no_event_loop():
+    modules = imported_modules("--file", str(SAMPLE))
+    assert "asyncio" not in modules
+    assert "usb" not in modules
@@ -0,0 +1,84 @@
+import io
+
+import pipeline
+from pipeline import BusState
+
+# G17 is commissioned, put into group 3 and scene 2, then queried
+CAPTURE = [
+    "{00000001:10 0000A3C8}",  # DTR0 200
+    "{00000002:10 0000232A}",  # G17 SET MAX LEVEL (DTR0)
+    "{00000003:10 00002342}",  # G17 SET SCENE 2 (DTR0)
+    "{00000004:10 00002363}",  # G17 ADD TO GROUP 3
+    "{00000005:10 00000363}",  # G01 ADD TO GROUP 3
+    "{00000006:10 00008712}",  # GG03 GO TO SCENE 2
+    "{00000007:10 000023A0}",  # G17 QUERY ACTUAL LEVEL
+    "{00000008:08 000000C8}",
+    "{00000009:10 000023A5}",  # G17 QUERY FADE TIME / FADE RATE
+    "{0000000A:08 00000027}",
+    "{0000000B:10 000023C0}",  # G17 QUERY GROUPS 0-7
+    "{0000000C:84 00000000}",  # collision, no answer
+    "{0000000D:10 000002FE}",  # G01 DAPC 254
+    "{0000000E:10 0000FF05}",  # BC RECALL MAX LEVEL
+]
+
+
+def decoded(lines):
+    frames = pipeline.parse(pipeline.read_lines(io.StringIO("\n".join(lines))))
+    return pipeline.Decoder()(frames)
+
+
+def test_gear_state():
+    state = BusState()
+    assert len(list(state(decoded(CAPTURE)))) == len(CAPTURE)
+    g17 = state["G17"]
+    assert g17.max_level == 200
+    assert g17.scenes[2] == 200
+    assert g17.groups == 1 << 3
+    assert g17.dtr[0] == 200
+    assert (g17.fade_time, g17.fade_rate) == (2, 7)
+    # RECALL MAX LEVEL of the broadcast
+    assert g17.level == 200
+    assert g17.timestamp == 0.014
+    g01 = state["G01"]
+    # GO TO SCENE with an unknown scene level, then DAPC and RECALL MAX LEVEL
+    assert g01.max_level is None
+    assert g01.level is None
+    assert state.gear_dtr == [200, None, None]
+
+
+def test_snapshot_is_point_in_time():
+    state = BusState()
+    for record in decoded(CAPTURE[:8]):
+        state.update(record)
+    snapshot = state.snapshot()
+    assert snapshot["G17"].level == 200
+    for record in decoded(["{00000010:10 00002300}"]):
+        state.update(record)
+    assert state["G17"].level == 0
+    assert snapshot["G17"].level == 200
+
+
+def test_short_address_and_device_groups():
+    state = BusState()
+    lines = [
+        "{00000001:10 0000A3C8}",  # DTR0 200
+        "{00000002:10 00000B2A}",  # G05 SET MAX LEVEL (DTR0)
+        "{00000003:10 00000B62}",  # G05 ADD TO GROUP 2
+        "{00000004:10 00000A80}",  # G05 DAPC 128
+        "{00000005:10 0000A307}",  # DTR0 7 = short address 3
+        "{00000006:10 00000B80}",  # G05 SET SHORT ADDRESS (DTR0)
+        "{00000007:10 00000B80}",
+        "{00000008:18 00C13105}",  # DTR1 5
+        "{00000009:18 00C13200}",  # DTR2 0
+        "{0000000A:18 0009FE19}",  # D04 ADD TO DEVICE GROUPS 0-15
+        "{0000000B:18 0009FE30}",  # D04 QUERY DEVICE STATUS
+        "{0000000C:08 00000002}",
+    ]
+    for record in decoded(lines):
+        state.update(record)
+    assert set(state.gear) == {3}
+    gear = state["G03"]
+    assert gear.address == 3
+    assert (gear.level, gear.groups, gear.max_level) == (128, 0b100, 200)
+    assert state["D04"].groups == 0b101
+    assert state["D04"].status == 2
@@ -0,0 +1,57 @@
+import io
+
+import pipeline
+from pipeline.stats import BusStats, RollingCount, StatsSink
+
+CAPTURE = [
+    "{00000001:10 0000FF06}",
+    "{00000002:10 000001A0}",
+    "{00000003:08 000000FE}",
+    "{00000004:10 00000390}",
+    "{00000005:91 00000000}",
+    "{000007D0:10 00008280}",
+    "{000007D1:18 0001FE32}",
+]
+
+
+def records(lines=CAPTURE):
+    frames = pipeline.parse(pipeline.read_lines(io.StringIO("\n".join(lines))))
+    return pipeline.Decoder()(frames)
+
+
+def test_counters():
+    stats = BusStats()
+    assert len(list(stats(records()))) == len(CAPTURE)
+    snapshot = stats.snapshot()
+    assert snapshot.frames == 7
+    assert snapshot.errors == 1
+    assert snapshot.lengths == {16: 4, 8: 1, 24: 1}
+    assert snapshot.addresses == {"BC GEAR": 1, "G00": 1, "G01": 1, "GG01": 1, "D00": 1}
+    assert snapshot.commands["QUERY ACTUAL LEVEL"] == 1
+    assert snapshot.commands["DAPC"] == 1
+    assert snapshot.statuses == {"FRAME": 6, "FAILURE": 1}
+    # QUERY STATUS of G01 is followed by an error instead of an answer
+    assert (snapshot.queries, snapshot.answered) == (3, 1)
+    assert snapshot.answer_rate == 1 / 3
+
+
+def test_rolling_windows():
+    count = RollingCount((1, 60))
+    for second in range(120):
+        count.add(second + 0.5)
+        count.add(second + 0.7)
+    assert count.rates() == {"1s": 2.0, "1min": 2.0}
+    assert count.rates(149) == {"1s": 0.0, "1min": 1.0}
+    # wrapped timestamps start over
+    count.add(3)
+    assert count.rates() == {"1s": 1.0, "1min": 1 / 60}
+
+
+def test_sink_reports_on_close():
+    stream = io.StringIO()
+    sink = StatsSink(stream)
+    sink(records())
+    sink.close()
+    report = stream.getvalue()
+    assert report.count("---") == 1
+    assert "7 frames, 1 errors, 1/3 queries answered" in report
@@ -0,0 +1,28 @@
+from connection.status import DaliStatus
+
+
+def test_shared_status_matches_constructor():
+    for loopback in (False, True):
+        for length in range(0x100):
+            for data in (0, 0x123456):
+                shared = DaliStatus.from_code(loopback, length, data)
+                expected = DaliStatus(loopback, length, data)
+                assert shared.status == expected.status
+                assert shared.message == expected.message
+
+
+def test_status_is_shared():
+    assert DaliStatus.from_code(False, 0x10) is DaliStatus.from_code(False, 0x10, 1)
+    assert DaliStatus.from_code(True, 0x10) is DaliStatus.from_code(True, 0x08)
+    assert DaliStatus.from_code(True, 0x91) is DaliStatus.from_code(False, 0x91)
+    assert DaliStatus.from_status(DaliStatus.TIMEOUT) is DaliStatus.from_status(
+        DaliStatus.TIMEOUT
+    )
+    assert DaliStatus.from_status(0x42).message == "ERROR: CODE 0x42"
+
+
+def test_timing_message_is_built_on_use():
+    status = DaliStatus.from_code(False, 0x83, 0x001234 << 8 | 7)
+    assert status.status == DaliStatus.TIMING
+    assert "message" not in vars(status)
+    assert status.message == "ERROR: FRAME DATA - BIT: 7 - TIME: 4660 USEC"
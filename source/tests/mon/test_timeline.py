@@ -0,0 +1,93 @@
+import random
+
+from connection.ring import RingBuffer
+from connection.serial import DaliSerial
+from connection.timeline import (
+    NS_PER_MS,
+    NS_PER_SECOND,
+    ClockEstimator,
+    CounterExtender,
+    Timeline,
+)
+from pipeline.metrics import Metrics
+
+
+def test_counter_wrap():
+    counter = CounterExtender(32)
+    assert counter.extend(0xFFFFFFF0) == 0xFFFFFFF0
+    assert counter.extend(0xFFFFFFFF) == 0xFFFFFFFF
+    assert counter.extend(0x00000005) == 0x100000005
+    assert counter.extend(0x00000004) == 0x100000005
+    assert counter.extend(0x00000010) == 0x100000011
+    assert (counter.wraps, counter.restarts) == (1, 1)
+
+
+def test_clock_drift():
+    # adapter 3 s behind the host and 50 ppm slow, the transfer adds 1 to 8 ms
+    generator = random.Random(0)
+    estimator = ClockEstimator()
+    for adapter_ms in range(0, 15 * 60 * 1000, 20):
+        adapter_ns = adapter_ms * NS_PER_MS
+        delay = generator.randrange(1 * NS_PER_MS, 8 * NS_PER_MS)
+        host_ns = 3 * NS_PER_SECOND + adapter_ns + adapter_ns * 50 // 10**6 + delay
+        estimator.add(adapter_ns, host_ns)
+    assert abs(estimator.drift_ppm - 50) < 1
+    adapter_ns = 15 * 60 * NS_PER_SECOND
+    expected = 3 * NS_PER_SECOND + adapter_ns * 50 // 10**6 + NS_PER_MS
+    assert abs(estimator.offset(adapter_ns) - expected) < NS_PER_MS
+
+
+def test_clock_without_drift():
+    estimator = ClockEstimator()
+    assert not estimator.ready
+    estimator.add(1000, 5000)
+    estimator.add(2000, 5500)
+    assert estimator.ready
+    assert estimator.drift_ppm == 0
+    assert estimator.to_host(3000) == 6500
+
+
+class Clock:
+    def __init__(self):
+        self.ns = 0
+
+    def __call__(self):
+        return self.ns
+
+
+def test_serial_timeline():
+    # frames keep increasing over the wrap of the adapter counter
+    clock = Clock()
+    timeline = Timeline(clock=clock)
+    frames = []
+    for counter in (0xFFFFFFFE, 0xFFFFFFFF, 0x00000000, 0x00000001):
+        clock.ns += NS_PER_MS
+        line = f"{{{counter:08X}:10 0000FF06}}".encode()
+        frames.append(DaliSerial.parse_stamped(line, timeline, clock()))
+    assert [frame.timestamp for frame in frames] == [
+        counter / 1000 for counter in range(0xFFFFFFFE, 0x100000002)
+    ]
+    assert [frame.received_ns for frame in frames] == [
+        1 * NS_PER_MS,
+        2 * NS_PER_MS,
+        3 * NS_PER_MS,
+        4 * NS_PER_MS,
+    ]
+    assert DaliSerial.parse_stamped(b"{garbage}", timeline, clock()) is None
+    assert timeline.host_seconds(0) == timeline.epoch_ns / NS_PER_SECOND
+
+
+class Connection:
+    def __init__(self, timeline):
+        self.queue = RingBuffer(4)
+        self.timeline = timeline
+
+
+def test_clock_metrics():
+    timeline = Timeline()
+    timeline.adapter(1000, 1500 * NS_PER_MS)
+    metrics = Metrics()
+    metrics.watch(Connection(timeline))
+    text = metrics.exposition()
+    assert 'dali_clock_offset_seconds{connection="0"} 0.500000' in text
+    assert 'dali_clock_drift_ppm{connection="0"} 0.000' in text
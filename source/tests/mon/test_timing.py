@@ -0,0 +1,66 @@
+import io
+
+import pipeline
+from pipeline.timing import (
+    BACKFRAME_FORWARD,
+    FORWARD_BACKFRAME,
+    FORWARD_FORWARD,
+    SEND_TWICE,
+    frame_duration,
+    priority,
+)
+
+# timestamps in ms at the end of each frame, a 16 bit frame takes 15.8 ms
+CAPTURE = [
+    "{00000064:10 000023A0}",  # G17 QUERY ACTUAL LEVEL
+    "{00000075:08 000000C8}",  # answer after 7.8 ms
+    "{000000A1:10 000002FE}",  # G01 DAPC 254 after 28.2 ms
+    "{000000C0:10 00000405}",  # G02 RECALL MAX LEVEL after 15.2 ms
+    "{000000D0:10 00000320}",  # G01 RESET after 0.2 ms
+    "{000000EF:10 00000320}",  # repeated after 15.2 ms
+    "{00000107:08 00000000}",  # backframe after 14.8 ms, too late
+]
+
+
+def analyze(lines):
+    violations = []
+    analyzer = pipeline.TimingAnalyzer(on_violation=violations.append)
+    frames = pipeline.parse(pipeline.read_lines(io.StringIO("\n".join(lines))))
+    records = list(pipeline.Decoder(annotators=[analyzer])(frames))
+    return analyzer, records, violations
+
+
+def test_frame_duration():
+    assert round(frame_duration(16) * 1000, 2) == 15.83
+    assert round(frame_duration(8) * 1000, 2) == 9.17
+    assert priority(0.0140) == 1
+    assert priority(0.0170) == 3
+    assert priority(0.5) == 0
+
+
+def test_gaps():
+    analyzer, records, violations = analyze(CAPTURE)
+    assert set(analyzer.gaps) == {
+        (FORWARD_BACKFRAME, "G17", 0),
+        (BACKFRAME_FORWARD, "G01", 0),
+        (FORWARD_FORWARD, "G02", 2),
+        (FORWARD_FORWARD, "G01", 1),
+        (SEND_TWICE, "G01", 0),
+        (FORWARD_BACKFRAME, "G01", 0),
+    }
+    assert [(violation.kind, violation.too_short) for violation in violations] == [
+        (FORWARD_FORWARD, True),
+        (FORWARD_BACKFRAME, False),
+    ]
+    assert analyzer.violations == {FORWARD_FORWARD: 1, FORWARD_BACKFRAME: 1}
+    assert records[4].command_string.endswith(
+        "!! TIMING forward-forward 0.2 ms < 13.5 ms"
+    )
+    assert "!!" not in records[5].command_string
+
+
+def test_errors_break_the_sequence():
+    lines = [CAPTURE[0], "{00000065:84 00000000}", CAPTURE[1]]
+    analyzer, _, violations = analyze(lines)
+    assert analyzer.gaps == {}
+    assert violations == []
@@ -0,0 +1,103 @@
+import errno
+import logging
+
+import usb
+
+from connection.hid import DaliUsb
+from connection.ring import RingBuffer
+from connection.status import DaliStatus
+from connection.timeline import Timeline
+
+
+def report(read_type, extension=0, address=0, opcode=0, sequence=0):
+    packet = bytearray(64)
+    packet[1] = read_type
+    packet[3:6] = bytes((extension, address, opcode))
+    packet[8] = sequence
+    return bytes(packet)
+
+
+class Endpoint:
+    # replays reports, stops the read thread once all are read
+    wMaxPacketSize = 64
+
+    def __init__(self, device, reports):
+        self.device = device
+        self.reports = iter(reports)
+
+    def read(self, buffer, timeout=None):
+        packet = next(self.reports, None)
+        if packet is None:
+            self.device.keep_running = False
+            raise usb.core.USBError("timeout", errno=errno.ETIMEDOUT)
+        memoryview(buffer)[: len(packet)] = packet
+        return len(packet)
+
+
+def adapter(reports):
+    # no USB device, only the receive path
+    device = DaliUsb.__new__(DaliUsb)
+    device.timeline = Timeline()
+    device.queue = RingBuffer(len(reports) + 1)
+    device.ep_read = Endpoint(device, reports)
+    device.keep_running = True
+    return device
+
+
+def received(device):
+    frames = []
+    while not device.queue.empty():
+        frames.append(device.queue.get_nowait())
+    return frames
+
+
+def test_report_types():
+    device = adapter([])
+    frame = device.parse_report(report(DaliUsb._USB_READ_TYPE_8BIT, 1, 2, 0x34))
+    assert (frame.length, frame.data) == (8, 0x34)
+    frame = device.parse_report(report(DaliUsb._USB_READ_TYPE_16BIT, 1, 0xFF, 0x06))
+    assert (frame.length, frame.data) == (16, 0xFF06)
+    frame = device.parse_report(report(DaliUsb._USB_READ_TYPE_24BIT, 0x83, 0, 0x9E))
+    assert (frame.length, frame.data) == (24, 0x83009E)
+    assert frame.status.status == DaliStatus.FRAME
+    frame = device.parse_report(report(DaliUsb._USB_READ_TYPE_NO_FRAME))
+    assert frame.status.status == DaliStatus.TIMEOUT
+    info = DaliUsb._USB_READ_TYPE_INFO
+    frame = device.parse_report(report(info, opcode=DaliUsb._USB_STATUS_OK))
+    assert frame.status.status == DaliStatus.OK
+    frame = device.parse_report(report(info, opcode=DaliUsb._USB_STATUS_FRAME_ERROR))
+    assert frame.status.status == DaliStatus.TIMING
+    frame = device.parse_report(report(info, opcode=DaliUsb._USB_STATUS_SHORTED))
+    assert frame.status.status == DaliStatus.GENERAL
+    assert device.parse_report(report(0x99)) is None
+    assert device.parse_report(report(DaliUsb._USB_READ_TYPE_8BIT)[:8]) is None
+
+
+def test_event_storm(caplog):
+    # back to back 24 bit events of all input devices, none is lost
+    events = [
+        (short_address << 17) | 0x8000 | (instance << 10) | event
+        for short_address in range(64)
+        for instance in range(4)
+        for event in range(8)
+    ]
+    reports = [
+        report(DaliUsb._USB_READ_TYPE_24BIT, data >> 16, data >> 8 & 0xFF, data & 0xFF)
+        for data in events
+    ]
+    device = adapter(reports)
+    with caplog.at_level(logging.INFO):
+        device.read_worker_thread()
+    frames = received(device)
+    assert [frame.data for frame in frames] == events
+    assert {frame.length for frame in frames} == {24}
+    assert device.dropped == 0
+    assert not caplog.records
+
+
+def test_debug_log(caplog):
+    device = adapter([report(DaliUsb._USB_READ_TYPE_16BIT, 0, 0xFE, 0x80, 7)])
+    with caplog.at_level(logging.DEBUG, logger="connection.hid"):
+        device.read_worker_thread()
+    assert "DALI[IN]: SN=0x07 TY=0x73 EC=0x00 AD=0xFE OC=0x80" in caplog.text
+    assert received(device)[0].data == 0xFE80